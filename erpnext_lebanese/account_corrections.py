@@ -0,0 +1,125 @@
+"""
+Declarative corrections for accounts created from the Lebanese chart.
+
+Rules are keyed by account number and list the field values the account must
+have, e.g. "401" -> Liability/Balance Sheet. Each rule is applied to every
+Lebanese company with one set-based UPDATE. Root and report type rules cover the
+account's whole lft/rgt subtree, as ERPNext keeps them uniform within a subtree.
+"""
+
+import frappe
+from frappe import _
+from frappe.query_builder import DocType
+from frappe.query_builder.functions import Coalesce
+from frappe.utils import now
+
+ACCOUNT_CORRECTIONS = {
+	# Suppliers are a liability; the chart's class 4 root made them Asset/Profit and Loss
+	"401": {"root_type": "Liability", "report_type": "Balance Sheet"},
+}
+
+SUBTREE_FIELDS = {"root_type", "report_type"}
+ACCOUNT_FIELDS = {"account_type", "account_currency"}
+
+
+def apply_account_corrections(
+	rules: dict | None = None,
+	companies: list[str] | None = None,
+	dry_run: bool = False,
+	commit: bool = True,
+) -> dict[str, list[dict]]:
+	"""Apply correction rules to Lebanese companies and return the changes made per company.
+
+	Each change is a dict with account, account_number, field, old and new. With `dry_run`
+	the changes are only reported.
+	"""
+	rules = ACCOUNT_CORRECTIONS if rules is None else rules
+	companies = get_lebanese_companies() if companies is None else companies
+	report: dict[str, list[dict]] = {company: [] for company in companies}
+	if not companies:
+		return report
+
+	for account_number, values in rules.items():
+		_validate_rule(account_number, values)
+
+		rows = _get_rows_to_correct(account_number, values, companies)
+		if not rows:
+			continue
+
+		for row in rows:
+			for field, value in values.items():
+				if row[field] != value:
+					report[row.company].append(
+						{
+							"account": row.name,
+							"account_number": row.account_number,
+							"field": field,
+							"old": row[field],
+							"new": value,
+						}
+					)
+
+		if not dry_run:
+			account = DocType("Account")
+			query = frappe.qb.update(account).set(account.modified, now())
+			for field, value in values.items():
+				query = query.set(account[field], value)
+			query.where(account.name.isin([row.name for row in rows])).run()
+
+	if not dry_run and commit:
+		frappe.db.commit()
+
+	return report
+
+
+def get_lebanese_companies() -> list[str]:
+	company = DocType("Company")
+	return (
+		frappe.qb.from_(company)
+		.select(company.name)
+		.where(company.country == "Lebanon")
+		.where(company.chart_of_accounts.like("%Lebanese%"))
+	).run(pluck=True)
+
+
+def _get_rows_to_correct(account_number, values, companies):
+	"""Return the accounts a rule changes: the numbered account (and its subtree) where any value differs."""
+	account = DocType("Account")
+	target = DocType("Account").as_("target")
+
+	if SUBTREE_FIELDS.intersection(values):
+		join_condition = (
+			(account.company == target.company) & (account.lft >= target.lft) & (account.rgt <= target.rgt)
+		)
+	else:
+		join_condition = account.name == target.name
+
+	query = (
+		frappe.qb.from_(account)
+		.join(target)
+		.on(join_condition)
+		.select(account.name, account.company, account.account_number, *(account[field] for field in values))
+		.where(target.account_number == account_number)
+		.where(target.company.isin(companies))
+	)
+
+	differs = None
+	for field, value in values.items():
+		condition = Coalesce(account[field], "") != value
+		differs = condition if differs is None else differs | condition
+
+	return query.where(differs).run(as_dict=True)
+
+
+def _validate_rule(account_number, values):
+	fields = set(values)
+	if not fields or not fields <= SUBTREE_FIELDS | ACCOUNT_FIELDS:
+		frappe.throw(
+			_("Account correction {0}: unsupported fields {1}").format(account_number, sorted(fields))
+		)
+	if fields & SUBTREE_FIELDS and fields & ACCOUNT_FIELDS:
+		frappe.throw(
+			_("Account correction {0}: subtree fields cannot be mixed with account fields").format(
+				account_number
+			)
+		)
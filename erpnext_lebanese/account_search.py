@@ -0,0 +1,225 @@
+"""
+Multilingual search over a company's account tree.
+
+Each company gets an in-memory trigram index built from its Account rows and the
+English, Arabic and French names of the Lebanese chart. Arabic (alef/hamza/
+ta-marbuta variants, diacritics) and French (accents) are normalised on both
+sides, so "محاسبه" finds "محاسبة" and "creances" finds "Créances".
+"""
+
+import bisect
+import re
+import unicodedata
+
+import frappe
+from frappe.utils import cint
+
+from erpnext_lebanese.api import (
+	_normalise_language,
+	_resolve_account_number,
+	get_account_label_index,
+	localize_account_label,
+)
+
+NGRAM_SIZE = 3
+INDEX_VERSION_KEY = "erpnext_lebanese_account_search_version"
+
+# Per-process cache: (site, company) -> (version, AccountSearchIndex)
+_INDEXES: dict[tuple, tuple] = {}
+
+ARABIC_DIACRITICS = re.compile("[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]")
+ARABIC_FOLDING = str.maketrans(
+	{
+		"أ": "ا",  # noqa: RUF001
+		"إ": "ا",  # noqa: RUF001
+		"آ": "ا",  # noqa: RUF001
+		"ٱ": "ا",  # noqa: RUF001
+		"ؤ": "و",
+		"ئ": "ي",
+		"ى": "ي",
+		"ة": "ه",  # noqa: RUF001
+	}
+)
+NON_WORD = re.compile(r"[^\w.]+")
+
+
+def normalize_search_text(text: str | None) -> str:
+	"""Fold case, Arabic letter variants/diacritics and Latin accents for matching."""
+	if not text:
+		return ""
+
+	text = ARABIC_DIACRITICS.sub("", text.translate(ARABIC_FOLDING))
+	text = "".join(char for char in unicodedata.normalize("NFKD", text) if not unicodedata.combining(char))
+	return NON_WORD.sub(" ", text.casefold()).strip()
+
+
+class AccountSearchIndex:
+	def __init__(self, accounts: list[dict]):
+		self.entries = accounts
+		self.postings: dict[str, set[int]] = {}
+		self.numbers: list[tuple[str, int]] = []
+
+		for position, entry in enumerate(accounts):
+			if entry["account_number"]:
+				self.numbers.append((entry["account_number"], position))
+			for text in entry["search_texts"]:
+				for gram in _ngrams(text):
+					self.postings.setdefault(gram, set()).add(position)
+
+		self.numbers.sort()
+
+	def search(self, query: str, limit: int = 20) -> list[dict]:
+		normalized = normalize_search_text(query)
+		if not normalized:
+			return []
+
+		scored: dict[int, int] = {}
+
+		if re.fullmatch(r"[\d.]+", normalized):
+			for position in self._number_prefix_matches(normalized):
+				scored[position] = 0 if self.entries[position]["account_number"] == normalized else 1
+
+		for position in self._text_candidates(normalized):
+			rank = _text_rank(self.entries[position]["search_texts"], normalized)
+			if rank is not None:
+				scored[position] = min(scored.get(position, rank + 2), rank + 2)
+
+		ordered = sorted(
+			scored.items(),
+			key=lambda item: (item[1], len(self.entries[item[0]]["account_number"] or ""), item[0]),
+		)
+		return [self.entries[position] for position, _rank in ordered[:limit]]
+
+	def _number_prefix_matches(self, prefix: str):
+		start = bisect.bisect_left(self.numbers, (prefix,))
+		for number, position in self.numbers[start:]:
+			if not number.startswith(prefix):
+				break
+			yield position
+
+	def _text_candidates(self, normalized: str):
+		grams = _ngrams(normalized)
+		if not grams:
+			# Too short for the n-gram index; the index is small enough to scan
+			return range(len(self.entries))
+
+		candidates = None
+		for gram in grams:
+			postings = self.postings.get(gram)
+			if not postings:
+				return ()
+			candidates = set(postings) if candidates is None else candidates & postings
+		return candidates
+
+
+@frappe.whitelist()
+def search_accounts(company, query, language=None, limit=20):
+	"""Return ranked Account matches by number prefix or English/Arabic/French name, with ancestor paths."""
+	frappe.has_permission("Account", "read", throw=True)
+	if not company or not query:
+		return []
+
+	lang_code = _normalise_language(language)
+	index = get_search_index(company)
+
+	results = []
+	for entry in index.search(query, limit=cint(limit) or 20):
+		results.append(
+			{
+				"value": entry["name"],
+				"account_number": entry["account_number"],
+				"is_group": entry["is_group"],
+				"label": entry["labels"][lang_code],
+				"english": entry["labels"]["en"],
+				"path": entry["path"],
+				"path_labels": [index.entries[p]["labels"][lang_code] for p in entry["path_positions"]],
+			}
+		)
+	return results
+
+
+def get_search_index(company: str) -> AccountSearchIndex:
+	version = frappe.cache().hget(INDEX_VERSION_KEY, company)
+	key = (frappe.local.site, company)
+
+	cached = _INDEXES.get(key)
+	if cached and cached[0] == version:
+		return cached[1]
+
+	index = AccountSearchIndex(_load_accounts(company))
+	_INDEXES[key] = (version, index)
+	return index
+
+
+def _load_accounts(company: str) -> list[dict]:
+	rows = frappe.get_all(
+		"Account",
+		filters={"company": company},
+		fields=["name", "account_number", "account_name", "parent_account", "is_group"],
+		order_by="lft asc",
+	)
+	number_to_labels = get_account_label_index(
+		frappe.get_cached_value("Company", company, "chart_of_accounts")
+	)
+	positions = {row.name: position for position, row in enumerate(rows)}
+
+	accounts = []
+	for row in rows:
+		account_number = _resolve_account_number(row)
+		translations = number_to_labels.get(account_number) or {}
+		labels = {
+			lang: localize_account_label(row, number_to_labels, lang)["label"] for lang in ("en", "ar", "fr")
+		}
+
+		# Rows are in lft order, so the parent entry is always built already
+		parent_position = positions.get(row.parent_account)
+		path_positions = []
+		if parent_position is not None and parent_position < len(accounts):
+			parent = accounts[parent_position]
+			path_positions = [*parent["path_positions"], parent_position]
+
+		texts = {row.account_name, translations.get("en"), translations.get("ar"), translations.get("fr")}
+		accounts.append(
+			{
+				"name": row.name,
+				"account_number": account_number,
+				"is_group": row.is_group,
+				"labels": labels,
+				"path_positions": path_positions,
+				"path": [rows[p].name for p in path_positions],
+				"search_texts": [normalize_search_text(t) for t in texts if t],
+			}
+		)
+
+	return accounts
+
+
+def invalidate_search_index(doc, method=None, *args, **kwargs):
+	"""Account doc event: rebuild the company's index in every worker on next search."""
+	if doc.company:
+		frappe.cache().hset(INDEX_VERSION_KEY, doc.company, frappe.generate_hash(length=10))
+
+
+def _ngrams(text: str) -> set[str]:
+	grams = set()
+	for word in text.split():
+		grams.update(word[i : i + NGRAM_SIZE] for i in range(len(word) - NGRAM_SIZE + 1))
+	return grams
+
+
+def _text_rank(texts: list[str], normalized: str) -> int | None:
+	"""0: exact name, 1: name prefix, 2: word prefix, 3: substring."""
+	best = None
+	for text in texts:
+		if text == normalized:
+			return 0
+		if text.startswith(normalized):
+			rank = 1
+		elif f" {normalized}" in f" {text}":
+			rank = 2
+		elif normalized in text:
+			rank = 3
+		else:
+			continue
+		best = rank if best is None else min(best, rank)
+	return best
@@ -1,6 +1,4 @@
-import json
 import re
-from pathlib import Path
 from typing import Dict, Optional
 
 import frappe
@@ -19,6 +17,7 @@ METADATA_KEYS = {
 }
 
 SUPPORTED_LANGUAGES = {"en", "ar", "fr"}
+LABEL_INDEX_CACHE_KEY = "lebanese_standard_chart_labels"
 
 
 @frappe.whitelist()
@@ -39,12 +38,10 @@ def get_account_language_labels(company: str, language: Optional[str] = "en") ->
 	if not company_row:
 		return {"enabled": False, "labels": {}}
 
-	chart_name = (company_row.chart_of_accounts or "").strip()
-	if not chart_name or "lebanese" not in chart_name.lower():
+	if not is_lebanese_chart(company_row.chart_of_accounts):
 		return {"enabled": False, "labels": {}}
 
-	chart_tree = _get_cached_chart_tree()
-	number_to_labels = _build_label_map(chart_tree)
+	number_to_labels = get_account_label_index(company_row.chart_of_accounts)
 
 	accounts = frappe.get_all(
 		"Account",
@@ -52,42 +49,73 @@ def get_account_language_labels(company: str, language: Optional[str] = "en") ->
 		fields=["name", "account_number", "account_name"],
 	)
 
-	labels: Dict[str, Dict[str, str]] = {}
+	labels: Dict[str, Dict[str, str]] = {
+		account.name: localize_account_label(account, number_to_labels, lang_code) for account in accounts
+	}
+
+	return {
+		"enabled": True,
+		"language": lang_code,
+		"labels": labels,
+	}
+
+
+def is_lebanese_chart(chart_name: Optional[str]) -> bool:
+	chart_name = (chart_name or "").strip()
+	return bool(chart_name) and "lebanese" in chart_name.lower()
+
+
+def get_account_label_index(chart_of_accounts: Optional[str] = None) -> Dict[str, Dict[str, Optional[str]]]:
+	"""Return the cached account number -> {en, ar, fr} label index of a Lebanese chart.
+
+	Defaults to the standard chart.
+	"""
+	from erpnext_lebanese.chart_variants import BASE_CHART_NAME, get_chart_store
+
+	store = get_chart_store()
+	charts = store["charts"]
+	chart_name = chart_of_accounts if chart_of_accounts in charts else BASE_CHART_NAME
+
+	# Keyed by the chart store version, so edited chart sources are picked up
+	cache = frappe.cache()
+	cached = cache.hget(LABEL_INDEX_CACHE_KEY, chart_name)
+	if cached and cached.get("version") == store["version"]:
+		return cached["labels"]
+
+	number_to_labels = _build_label_map(charts[chart_name]["tree"])
+	cache.hset(LABEL_INDEX_CACHE_KEY, chart_name, {"version": store["version"], "labels": number_to_labels})
+	return number_to_labels
 
-	for account in accounts:
-		account_number = _resolve_account_number(account)
-		default_label = account.account_name or account.name
 
-		translations = number_to_labels.get(account_number) if account_number else None
+def localize_account_label(account, number_to_labels: Dict, lang_code: str) -> Dict[str, str]:
+	"""Return the `label` in `lang_code` and the `english` fallback for an Account row."""
+	account_number = _resolve_account_number(account)
+	default_label = account.account_name or account.name
 
-		selected_label = None
-		english_label = None
+	translations = number_to_labels.get(account_number) if account_number else None
 
-		if translations:
-			selected_label = translations.get(lang_code) or translations.get("en")
-			english_label = translations.get("en")
+	selected_label = None
+	english_label = None
 
-		selected_label = selected_label or default_label
-		english_label = english_label or default_label
+	if translations:
+		selected_label = translations.get(lang_code) or translations.get("en")
+		english_label = translations.get("en")
 
-		display_text = selected_label or ""
-		if account_number and display_text:
-			if not display_text.startswith(account_number):
-				display_text = f"{account_number} - {display_text}"
+	selected_label = selected_label or default_label
+	english_label = english_label or default_label
 
-		if account_number and english_label:
-			if not english_label.startswith(account_number):
-				english_label = f"{account_number} - {english_label}"
+	display_text = selected_label or ""
+	if account_number and display_text:
+		if not display_text.startswith(account_number):
+			display_text = f"{account_number} - {display_text}"
 
-		labels[account.name] = {
-			"label": display_text or english_label or "",
-			"english": english_label or default_label or "",
-		}
+	if account_number and english_label:
+		if not english_label.startswith(account_number):
+			english_label = f"{account_number} - {english_label}"
 
 	return {
-		"enabled": True,
-		"language": lang_code,
-		"labels": labels,
+		"label": display_text or english_label or "",
+		"english": english_label or default_label or "",
 	}
 
 
@@ -104,27 +132,6 @@ def _normalise_language(language: Optional[str]) -> str:
 	return "en"
 
 
-def _get_cached_chart_tree() -> Dict:
-	cache = frappe.cache()
-	cached = cache.get_value("lebanese_standard_chart_tree")
-	if cached:
-		return cached
-
-	chart_path = (
-		Path(frappe.get_app_path("erpnext_lebanese")).resolve()
-		/ "data"
-		/ "chart_of_accounts"
-		/ "lebanese_standard.json"
-	)
-
-	with chart_path.open(encoding="utf-8") as handle:
-		data = json.load(handle)
-
-	tree = data.get("tree") or {}
-	cache.set_value("lebanese_standard_chart_tree", tree)
-	return tree
-
-
 def _build_label_map(tree: Dict) -> Dict[str, Dict[str, Optional[str]]]:
 	number_to_labels: Dict[str, Dict[str, Optional[str]]] = {}
 
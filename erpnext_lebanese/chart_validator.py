@@ -0,0 +1,133 @@
+"""
+Single-pass validation of the Lebanese chart of accounts JSON.
+
+ERPNext only reads `root_type` from the root accounts of a chart. In the Lebanese
+chart, class 4 (Receivables & Payables) has none and its 40 Suppliers (Liability)
+and 41 Debtors (Asset) set it for their own subtrees, so an account below 40 that
+declares Asset is silently created as a Liability. This module walks a chart once
+and reports such conflicts together with duplicate account numbers, missing
+Arabic/French names and account numbers that do not extend their parent's.
+"""
+
+import json
+import time
+
+from frappe.utils import cstr
+
+from erpnext_lebanese.api import METADATA_KEYS
+
+ROOT_TYPES = {"Asset", "Liability", "Equity", "Income", "Expense"}
+TRANSLATION_KEYS = ("arabic_name", "french_name")
+
+ERROR_CHECKS = {"invalid_root_type", "duplicate_number", "root_type_conflict"}
+WARNING_CHECKS = {"missing_translation", "number_prefix"}
+
+
+def validate_chart(chart_data: dict, checks=None) -> list[dict]:
+	"""Return the issues found in a chart as dicts with check, severity, path, account_number and message.
+
+	Pass `checks` to limit the result to some of ERROR_CHECKS/WARNING_CHECKS.
+	"""
+	tree = chart_data.get("tree", chart_data)
+	enabled = set(checks) if checks else ERROR_CHECKS | WARNING_CHECKS
+	issues = []
+	seen_numbers: dict[str, str] = {}
+
+	def report(check, path, account_number, message):
+		if check in enabled:
+			issues.append(
+				{
+					"check": check,
+					"severity": "error" if check in ERROR_CHECKS else "warning",
+					"path": path,
+					"account_number": account_number,
+					"message": message,
+				}
+			)
+
+	# (node, path, root_type inherited from the root account, parent account number)
+	stack = [(tree, "", None, "")]
+	while stack:
+		node, path, root_type, parent_number = stack.pop()
+		for key, child in node.items():
+			if key in METADATA_KEYS or not isinstance(child, dict):
+				continue
+
+			child_path = f"{path}/{key}"
+			account_number = cstr(child.get("account_number")).strip()
+			child_root_type = child.get("root_type")
+
+			if child_root_type and child_root_type not in ROOT_TYPES:
+				report(
+					"invalid_root_type", child_path, account_number, f"Invalid root_type {child_root_type!r}"
+				)
+			elif child_root_type and root_type and child_root_type != root_type:
+				report(
+					"root_type_conflict",
+					child_path,
+					account_number,
+					f"root_type {child_root_type} differs from its root's {root_type}; ERPNext will use {root_type}",
+				)
+
+			if account_number:
+				if account_number in seen_numbers:
+					report(
+						"duplicate_number",
+						child_path,
+						account_number,
+						f"Account number {account_number} is also used by {seen_numbers[account_number]}",
+					)
+				else:
+					seen_numbers[account_number] = child_path
+
+				if parent_number and not account_number.startswith(parent_number):
+					report(
+						"number_prefix",
+						child_path,
+						account_number,
+						f"Account number {account_number} does not start with its parent's {parent_number}",
+					)
+
+			missing = [field for field in TRANSLATION_KEYS if not cstr(child.get(field)).strip()]
+			if missing:
+				report("missing_translation", child_path, account_number, f"Missing {', '.join(missing)}")
+
+			stack.append((child, child_path, root_type or child_root_type, account_number or parent_number))
+
+	issues.sort(key=lambda issue: issue["path"])
+	return issues
+
+
+def assert_valid_chart(chart_data: dict, checks=None, strict: bool = False) -> None:
+	"""Test helper: fail with every issue listed when the chart has errors (or warnings if `strict`)."""
+	issues = [issue for issue in validate_chart(chart_data, checks) if strict or issue["severity"] == "error"]
+	if issues:
+		raise AssertionError(
+			f"{len(issues)} chart issue(s):\n" + "\n".join(format_issue(issue) for issue in issues)
+		)
+
+
+def validate_chart_file(path: str, checks=None) -> tuple[list[dict], float]:
+	"""Validate a chart JSON file, returning its issues and the validation time in milliseconds."""
+	with open(path, encoding="utf-8") as handle:
+		chart_data = json.load(handle)
+
+	start = time.perf_counter()
+	issues = validate_chart(chart_data, checks)
+	return issues, (time.perf_counter() - start) * 1000
+
+
+def get_chart_sources() -> dict[str, dict]:
+	"""Return every shipped Lebanese chart (standard and legal-type variants) keyed by chart name."""
+	from erpnext_lebanese.chart_variants import compile_chart_store
+
+	return compile_chart_store()["charts"]
+
+
+def format_issue(issue: dict) -> str:
+	number = f" [{issue['account_number']}]" if issue["account_number"] else ""
+	return f"{issue['severity'].upper()} {issue['check']}: {issue['path']}{number}: {issue['message']}"
+
+
+def has_errors(issues: list[dict], strict: bool = False) -> bool:
+	return any(strict or issue["severity"] == "error" for issue in issues)
@@ -0,0 +1,180 @@
+"""
+Lebanese chart of accounts variants by company legal type.
+
+Each variant in `data/chart_of_accounts/variants/` is an overlay on the shared
+`lebanese_standard.json` base: account numbers to `remove`, accounts to `add`
+under a parent number and metadata to `update`. All variants are compiled into
+one store in which identical subtrees are interned, so every variant shares the
+untouched parts of the base chart and caching all of them costs about as much
+as caching one.
+"""
+
+import copy
+import hashlib
+import json
+import os
+
+import frappe
+from frappe.utils import cstr
+
+from erpnext_lebanese.api import METADATA_KEYS
+
+BASE_CHART_NAME = "Lebanese Standard Chart of Accounts"
+BASE_COMPANY_TYPES = ["S.A.L Corporat'n"]
+CHART_STORE_CACHE_KEY = "lebanese_chart_store"
+
+
+def get_chart_store() -> dict:
+	"""Return the compiled chart store, rebuilt when a chart or overlay file changes.
+
+	Its trees share interned subtrees and must be treated as read-only.
+	"""
+	version = get_sources_version()
+	cached = frappe.cache().get_value(CHART_STORE_CACHE_KEY)
+	if cached and cached.get("version") == version:
+		return cached
+
+	store = compile_chart_store()
+	store["version"] = version
+	frappe.cache().set_value(CHART_STORE_CACHE_KEY, store)
+	return store
+
+
+def get_lebanese_chart(chart_name: str | None) -> dict | None:
+	"""Return the full chart (name, slug, country_code, disabled, tree) for a Lebanese chart name.
+
+	The store shares subtrees between variants, so callers get their own copy to mutate.
+	"""
+	if not chart_name:
+		return None
+	chart = get_chart_store()["charts"].get(chart_name)
+	return copy.deepcopy(chart) if chart else None
+
+
+def get_chart_for_company_type(company_type: str | None) -> str:
+	"""Return the chart name to use for a company legal type (see utils.get_company_types)."""
+	return get_chart_store()["company_types"].get(company_type or "", BASE_CHART_NAME)
+
+
+def compile_chart_store() -> dict:
+	base = _load_json(_get_base_path())
+	base_tree = base.get("tree") or {}
+
+	interned: dict[str, dict] = {}
+	charts = {
+		BASE_CHART_NAME: _chart(BASE_CHART_NAME, "standard", base, _intern(base_tree, interned)),
+	}
+	company_types = dict.fromkeys(BASE_COMPANY_TYPES, BASE_CHART_NAME)
+
+	for path in _get_overlay_paths():
+		overlay = _load_json(path)
+		tree = apply_overlay(base_tree, overlay)
+		slug = os.path.splitext(os.path.basename(path))[0]
+		charts[overlay["name"]] = _chart(overlay["name"], slug, base, _intern(tree, interned))
+		for company_type in overlay.get("company_types") or []:
+			company_types[company_type] = overlay["name"]
+
+	return {"charts": charts, "company_types": company_types, "shared_nodes": len(interned)}
+
+
+def apply_overlay(base_tree: dict, overlay: dict) -> dict:
+	"""Return a new tree with the overlay's remove/add/update operations applied to the base."""
+	tree = copy.deepcopy(base_tree)
+	index = _index_by_number(tree)
+
+	for account_number in overlay.get("remove") or []:
+		parent, key = _locate(index, account_number, overlay)
+		parent.pop(key, None)
+
+	for account_number, values in (overlay.get("update") or {}).items():
+		parent, key = _locate(index, account_number, overlay)
+		parent[key].update(values)
+
+	for account in overlay.get("add") or []:
+		parent, key = _locate(index, account["parent"], overlay)
+		node = {k: v for k, v in account.items() if k in METADATA_KEYS and k != "account_name"}
+		parent[key][account["account_name"]] = node
+		if node.get("account_number"):
+			index[cstr(node["account_number"])] = (parent[key], account["account_name"])
+
+	return tree
+
+
+def _chart(name: str, slug: str, base: dict, tree: dict) -> dict:
+	return {
+		"name": name,
+		"slug": slug,
+		"country_code": base.get("country_code") or "lb",
+		"disabled": base.get("disabled") or "No",
+		"tree": tree,
+	}
+
+
+def _intern(node: dict, interned: dict[str, dict]) -> dict:
+	"""Rebuild `node` bottom-up, reusing one shared object for every structurally equal subtree."""
+	return _intern_with_digest(node, interned)[0]
+
+
+def _intern_with_digest(node: dict, interned: dict[str, dict]) -> tuple[dict, str]:
+	items = []
+	signature = []
+	for key, value in node.items():
+		if isinstance(value, dict):
+			value, child_digest = _intern_with_digest(value, interned)
+			signature.append((key, {"subtree": child_digest}))
+		else:
+			signature.append((key, value))
+		items.append((key, value))
+
+	digest = hashlib.sha1(json.dumps(signature, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+	shared = interned.get(digest)
+	if shared is None:
+		shared = interned[digest] = dict(items)
+	return shared, digest
+
+
+def _index_by_number(tree: dict) -> dict[str, tuple[dict, str]]:
+	index = {}
+
+	def walk(children):
+		for key, child in children.items():
+			if key in METADATA_KEYS or not isinstance(child, dict):
+				continue
+			account_number = cstr(child.get("account_number")).strip()
+			if account_number:
+				index[account_number] = (children, key)
+			walk(child)
+
+	walk(tree)
+	return index
+
+
+def _locate(index: dict, account_number, overlay: dict) -> tuple[dict, str]:
+	location = index.get(cstr(account_number).strip())
+	if not location:
+		frappe.throw(f"Chart variant {overlay.get('name')}: account {account_number} not found in base chart")
+	return location
+
+
+def _get_base_path() -> str:
+	return os.path.join(
+		frappe.get_app_path("erpnext_lebanese"), "data", "chart_of_accounts", "lebanese_standard.json"
+	)
+
+
+def _get_overlay_paths() -> list[str]:
+	directory = os.path.join(frappe.get_app_path("erpnext_lebanese"), "data", "chart_of_accounts", "variants")
+	if not os.path.isdir(directory):
+		return []
+	return [os.path.join(directory, f) for f in sorted(os.listdir(directory)) if f.endswith(".json")]
+
+
+def get_sources_version() -> tuple:
+	"""mtimes of the base chart and every overlay; changes whenever a chart source is edited."""
+	return tuple(os.stat(path).st_mtime_ns for path in [_get_base_path(), *_get_overlay_paths()])
+
+
+def _load_json(path: str) -> dict:
+	with open(path, encoding="utf-8") as handle:
+		return json.load(handle)
@@ -0,0 +1,284 @@
+import sys
+import time
+
+import click
+import frappe
+from frappe.commands import pass_context
+from frappe.exceptions import SiteNotSpecifiedError
+
+
+@click.command("delete-lebanese-company")
+@click.argument("company")
+@pass_context
+def delete_lebanese_company(context, company):
+	"""Bulk delete a Lebanese company and all rows it owns"""
+	from erpnext_lebanese.teardown import delete_lebanese_company as teardown
+
+	for site in _sites(context):
+		frappe.init(site=site)
+		frappe.connect()
+		try:
+			deleted = teardown(company)
+			for doctype, count in deleted.items():
+				if count:
+					click.echo(f"{site}: deleted {count} {doctype}")
+		finally:
+			frappe.destroy()
+
+
+@click.command("validate-lebanese-chart")
+@click.argument("path", required=False)
+@click.option("--strict", is_flag=True, default=False, help="Fail on warnings as well as errors")
+def validate_lebanese_chart(path=None, strict=False):
+	"""Validate the Lebanese chart JSON (or every shipped chart when no path is given)"""
+	from erpnext_lebanese.chart_validator import (
+		format_issue,
+		get_chart_sources,
+		has_errors,
+		validate_chart,
+		validate_chart_file,
+	)
+
+	if path:
+		results = {path: validate_chart_file(path)}
+	else:
+		results = {}
+		for name, chart in get_chart_sources().items():
+			start = time.perf_counter()
+			issues = validate_chart(chart)
+			results[name] = (issues, (time.perf_counter() - start) * 1000)
+
+	failed = False
+	for name, (issues, elapsed) in results.items():
+		for issue in issues:
+			click.echo(f"{name}: {format_issue(issue)}")
+		errors = sum(1 for issue in issues if issue["severity"] == "error")
+		click.echo(f"{name}: {errors} error(s), {len(issues) - errors} warning(s) in {elapsed:.1f} ms")
+		failed = failed or has_errors(issues, strict)
+
+	if failed:
+		sys.exit(1)
+
+
+@click.command("correct-lebanese-accounts")
+@click.option(
+	"--company", "companies", multiple=True, help="Limit to these companies (default: all Lebanese)"
+)
+@click.option("--dry-run", is_flag=True, default=False, help="Report the changes without applying them")
+@pass_context
+def correct_lebanese_accounts(context, companies=None, dry_run=False):
+	"""Apply the Lebanese account correction rules to every Lebanese company"""
+	from erpnext_lebanese.account_corrections import apply_account_corrections
+
+	for site in _sites(context):
+		frappe.init(site=site)
+		frappe.connect()
+		try:
+			report = apply_account_corrections(companies=list(companies) or None, dry_run=dry_run)
+			for company, changes in report.items():
+				for change in changes:
+					click.echo(
+						f"{site}: {company}: {change['account']} {change['field']} "
+						f"{change['old']!r} -> {change['new']!r}"
+					)
+				verb = "would change" if dry_run else "changed"
+				click.echo(f"{site}: {company}: {verb} {len(changes)} value(s)")
+		finally:
+			frappe.destroy()
+
+
+@click.command("capture-lebanese-snapshot")
+@click.argument("path")
+@pass_context
+def capture_lebanese_snapshot(context, path):
+	"""Save the site's template company, chart and setup records to a snapshot file"""
+	from erpnext_lebanese.site_snapshot import capture_site_snapshot
+
+	site = _sites(context)[0]
+	frappe.init(site=site)
+	frappe.connect()
+	try:
+		counts = capture_site_snapshot(path)
+		click.echo(f"{site}: captured {sum(counts.values())} rows from {len(counts)} tables to {path}")
+	finally:
+		frappe.destroy()
+
+
+@click.command("restore-lebanese-snapshot")
+@click.argument("path")
+@click.option("--company", help="Name of the restored company (default: the template company's)")
+@click.option("--abbr", help="Abbreviation of the restored company")
+@pass_context
+def restore_lebanese_snapshot(context, path, company=None, abbr=None):
+	"""Bootstrap a fresh site from a Lebanese snapshot instead of running the setup wizard"""
+	from erpnext_lebanese.site_snapshot import restore_site_snapshot
+
+	for site in _sites(context):
+		frappe.init(site=site)
+		frappe.connect()
+		try:
+			start = time.perf_counter()
+			counts = restore_site_snapshot(path, company=company, abbr=abbr)
+			click.echo(
+				f"{site}: restored {sum(counts.values())} rows from {len(counts)} tables "
+				f"in {time.perf_counter() - start:.1f}s"
+			)
+		finally:
+			frappe.destroy()
+
+
+@click.command("lebanese-provisioning-load")
+@click.option("--companies", default=10, type=int, help="Number of companies to create")
+@click.option("--workers", default=4, type=int, help="Number of concurrent worker processes")
+@click.option("--keep", is_flag=True, default=False, help="Keep the created companies")
+@pass_context
+def lebanese_provisioning_load(context, companies=10, workers=4, keep=False):
+	"""Create Lebanese companies concurrently and report throughput, latency and lock contention"""
+	from erpnext_lebanese.load_harness import run_provisioning_load
+
+	site = _sites(context)[0]
+	summary = run_provisioning_load(site, companies=companies, workers=workers, sites_path=".", keep=keep)
+
+	for error in summary.pop("errors"):
+		click.echo(error)
+	for error in summary.pop("cleanup_errors"):
+		click.echo(f"Could not delete {error}", err=True)
+	server = summary.pop("server")
+	for key, value in {**summary, **server}.items():
+		click.echo(f"{key}: {value}")
+
+
+@click.command("generate-lebanese-gl")
+@click.argument("company")
+@click.option("--entries", default=1_000_000, type=int, help="Number of GL Entries to generate")
+@click.option("--seed", default=0, type=int, help="Random seed; the same seed gives the same ledger")
+@click.option("--from-date", default="2024-01-01", help="First posting date")
+@click.option("--to-date", default="2024-12-31", help="Last posting date")
+@click.option("--usd-share", default=0.6, type=float, help="Share of vouchers transacted in USD")
+@click.option("--usd-rate", default=89500, type=float, help="LBP per USD")
+@click.option("--delete", is_flag=True, default=False, help="Delete previously generated entries instead")
+@pass_context
+def generate_lebanese_gl(
+	context, company, entries, seed, from_date=None, to_date=None, usd_share=0.6, usd_rate=89500, delete=False
+):
+	"""Fill a Lebanese company with synthetic GL Entries for benchmarks"""
+	from erpnext_lebanese.gl_generator import delete_synthetic_gl_entries, generate_gl_entries
+
+	for site in _sites(context):
+		frappe.init(site=site)
+		frappe.connect()
+		try:
+			if delete:
+				delete_synthetic_gl_entries(company, seed)
+				click.echo(f"{site}: deleted synthetic GL Entries of seed {seed}")
+				continue
+
+			start = time.perf_counter()
+			generated = generate_gl_entries(
+				company,
+				entries=entries,
+				seed=seed,
+				from_date=from_date,
+				to_date=to_date,
+				usd_share=usd_share,
+				usd_rate=usd_rate,
+			)
+			click.echo(f"{site}: generated {generated} GL Entries in {time.perf_counter() - start:.1f}s")
+		finally:
+			frappe.destroy()
+
+
+@click.command("revalue-lebanese-companies")
+@click.option("--date", "posting_date", help="Revaluation date (default: today)")
+@click.option("--rate-type", help="Official, Platform or Market (default: the site's default rate type)")
+@click.option("--company", help="Only revalue this company")
+@click.option("--submit", is_flag=True, default=False, help="Submit the journal entries (default: drafts)")
+@click.option(
+	"--no-reverse", is_flag=True, default=False, help="Do not reverse submitted revaluations on the next day"
+)
+@pass_context
+def revalue_lebanese_companies(
+	context, posting_date=None, rate_type=None, company=None, submit=False, no_reverse=False
+):
+	"""Post one unrealized exchange revaluation journal per Lebanese company"""
+	from erpnext_lebanese import revaluation
+
+	for site in _sites(context):
+		frappe.init(site=site)
+		frappe.connect()
+		try:
+			if company:
+				results = [
+					revaluation.revalue_company(company, posting_date, rate_type, submit, not no_reverse)
+				]
+			else:
+				results = revaluation.revalue_lebanese_companies(
+					posting_date, rate_type, submit, not no_reverse
+				)
+			frappe.db.commit()
+			for result in results:
+				if result.get("error"):
+					click.echo(f"{site}: {result['company']}: {result['error']}", err=True)
+				elif result.get("skipped"):
+					click.echo(f"{site}: {result['company']}: already revalued by {result['journal_entry']}")
+				else:
+					click.echo(
+						f"{site}: {result['company']}: {result['balances']} balance(s) at {result['rate']}, "
+						f"journal entry {result['journal_entry'] or '-'}, reversal {result.get('reversal') or '-'}"
+					)
+		finally:
+			frappe.destroy()
+
+
+@click.command("rebuild-lebanese-vat-summary")
+@click.option("--company", help="Only rebuild this company")
+@pass_context
+def rebuild_lebanese_vat_summary(context, company=None):
+	"""Recompute the monthly Lebanese VAT summary from GL Entry"""
+	from erpnext_lebanese.vat_summary import rebuild_vat_summary
+
+	for site in _sites(context):
+		frappe.init(site=site)
+		frappe.connect()
+		try:
+			written = rebuild_vat_summary(company)
+			click.echo(f"{site}: rebuilt {written} VAT summary period(s)")
+		finally:
+			frappe.destroy()
+
+
+@click.command("rebuild-lebanese-period-balances")
+@click.option("--company", help="Only rebuild this company")
+@pass_context
+def rebuild_lebanese_period_balances(context, company=None):
+	"""Recompute the per-account monthly balances and their roll-ups from GL Entry"""
+	from erpnext_lebanese.period_balances import rebuild_period_balances
+
+	for site in _sites(context):
+		frappe.init(site=site)
+		frappe.connect()
+		try:
+			written = rebuild_period_balances(company)
+			click.echo(f"{site}: rebuilt {written} period balance row(s)")
+		finally:
+			frappe.destroy()
+
+
+def _sites(context):
+	if not context.sites:
+		raise SiteNotSpecifiedError
+	return context.sites
+
+
+commands = [
+	delete_lebanese_company,
+	validate_lebanese_chart,
+	correct_lebanese_accounts,
+	capture_lebanese_snapshot,
+	restore_lebanese_snapshot,
+	lebanese_provisioning_load,
+	generate_lebanese_gl,
+	revalue_lebanese_companies,
+	rebuild_lebanese_vat_summary,
+	rebuild_lebanese_period_balances,
+]
@@ -0,0 +1,23 @@
+# Copyright (c) 2026, Samuael Ketema and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+from frappe.utils import flt
+
+from erpnext_lebanese.exchange_rates import invalidate_rate_cache
+
+
+class LebaneseExchangeRate(Document):
+	def validate(self):
+		if self.from_currency == self.to_currency:
+			frappe.throw(_("From Currency and To Currency cannot be the same"))
+		if flt(self.exchange_rate) <= 0:
+			frappe.throw(_("Exchange Rate must be greater than 0"))
+
+	def on_update(self):
+		invalidate_rate_cache(self.rate_type, self.from_currency, self.to_currency)
+
+	def on_trash(self):
+		invalidate_rate_cache(self.rate_type, self.from_currency, self.to_currency)
@@ -0,0 +1,14 @@
+# Copyright (c) 2026, Samuael Ketema and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class LebanesePeriodBalance(Document):
+	pass
+
+
+def on_doctype_update():
+	# Statements read one company's accounts over a period range
+	frappe.db.add_index("Lebanese Period Balance", ["company", "account", "period"])
@@ -0,0 +1,21 @@
+# Copyright (c) 2026, Samuael Ketema and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import add_days, now_datetime
+
+
+class LebaneseProvisioningLog(Document):
+	@staticmethod
+	def clear_old_logs(days=90):
+		names = frappe.get_all(
+			"Lebanese Provisioning Log",
+			filters={"creation": ["<", add_days(now_datetime(), -days)]},
+			pluck="name",
+		)
+		if not names:
+			return
+
+		frappe.db.delete("Lebanese Provisioning Step", {"parent": ["in", names]})
+		frappe.db.delete("Lebanese Provisioning Log", {"name": ["in", names]})
@@ -0,0 +1,41 @@
+# Copyright (c) 2026, Samuael Ketema and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+from frappe.utils import get_first_day, getdate
+
+from erpnext_lebanese.vat_summary import SUMMARY_DOCTYPE
+
+
+def execute(filters=None):
+	filters = frappe._dict(filters or {})
+	if not filters.company:
+		return get_columns(), []
+
+	summary = frappe.qb.DocType(SUMMARY_DOCTYPE)
+	query = (
+		frappe.qb.from_(summary)
+		.select(summary.period, summary.output_vat, summary.input_vat, summary.net_vat)
+		.where(summary.company == filters.company)
+		.orderby(summary.period)
+	)
+	if filters.from_date:
+		query = query.where(summary.period >= get_first_day(getdate(filters.from_date)))
+	if filters.to_date:
+		query = query.where(summary.period <= getdate(filters.to_date))
+
+	data = query.run(as_dict=True)
+	for row in data:
+		row["month"] = getdate(row.period).strftime("%B %Y")
+
+	return get_columns(), data
+
+
+def get_columns():
+	return [
+		{"fieldname": "month", "label": _("Month"), "fieldtype": "Data", "width": 160},
+		{"fieldname": "output_vat", "label": _("Output VAT (4427)"), "fieldtype": "Currency", "width": 180},
+		{"fieldname": "input_vat", "label": _("Input VAT (4426.6)"), "fieldtype": "Currency", "width": 180},
+		{"fieldname": "net_vat", "label": _("Net VAT Payable"), "fieldtype": "Currency", "width": 180},
+	]
@@ -0,0 +1,162 @@
+"""
+Multi-rate LBP/USD exchange rates.
+
+Lebanese companies trade at several coexisting rates (official, platform,
+market), kept in `Lebanese Exchange Rate`. Each (rate type, currency pair)
+series is loaded once into Redis and into a per-process, date-sorted array, so a
+lookup is a bisect instead of a query. Saving or deleting a rate bumps the
+series version after commit and every worker reloads it on its next lookup.
+Series are stored with the version they were loaded under, so a load that raced
+with a rate edit is never served.
+
+The `get_exchange_rate` override is registered in `override_whitelisted_methods`
+and so only applies to HTTP calls (forms, the desk). Server-side Python callers
+of erpnext.setup.utils.get_exchange_rate, e.g. ERPNext's exchange rate
+revaluation, still get ERPNext's rate; call `get_rate` for a Lebanese rate there.
+"""
+
+import bisect
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, date_diff, flt, getdate
+
+RATE_TYPES = ("Official", "Platform", "Market")
+DEFAULT_RATE_TYPE = "Official"
+LEBANESE_PAIR = {"USD", "LBP"}
+
+RATE_SERIES_KEY = "lebanese_exchange_rate_series"
+RATE_VERSION_KEY = "lebanese_exchange_rate_version"
+
+# Per-process cache: (site, series key) -> (version, (dates, rates))
+_SERIES: dict[tuple, tuple] = {}
+
+
+def get_rate(rate_type: str, date=None, from_currency: str = "USD", to_currency: str = "LBP") -> float | None:
+	"""Return the `rate_type` rate in effect on `date` (the latest one on or before it)."""
+	if from_currency == to_currency:
+		return 1.0
+
+	date = getdate(date)
+	for source, target, inverse in ((from_currency, to_currency, False), (to_currency, from_currency, True)):
+		dates, rates = _get_series(rate_type, source, target)
+		position = bisect.bisect_right(dates, date) - 1
+		if position >= 0:
+			return 1 / rates[position] if inverse else rates[position]
+
+	return None
+
+
+def get_rates(
+	rate_type: str, from_date, to_date, from_currency: str = "USD", to_currency: str = "LBP"
+) -> dict[str, float | None]:
+	"""Return the rate in effect on every day from `from_date` to `to_date`, keyed by ISO date."""
+	from_date, to_date = getdate(from_date), getdate(to_date)
+	if from_currency == to_currency:
+		return {str(add_days(from_date, day)): 1.0 for day in range(date_diff(to_date, from_date) + 1)}
+
+	dates, rates = _get_series(rate_type, from_currency, to_currency)
+	inverse = False
+	if not dates:
+		dates, rates = _get_series(rate_type, to_currency, from_currency)
+		inverse = True
+
+	result = {}
+	position = bisect.bisect_right(dates, from_date) - 1
+	for day in range(date_diff(to_date, from_date) + 1):
+		current = add_days(from_date, day)
+		while position + 1 < len(dates) and dates[position + 1] <= current:
+			position += 1
+		rate = rates[position] if position >= 0 else None
+		result[str(current)] = (1 / rate if inverse else rate) if rate else None
+
+	return result
+
+
+@frappe.whitelist()
+def get_lebanese_exchange_rate(rate_type=None, date=None, from_currency="USD", to_currency="LBP"):
+	frappe.has_permission("Lebanese Exchange Rate", "read", throw=True)
+	return get_rate(_validate_rate_type(rate_type), date, from_currency, to_currency)
+
+
+@frappe.whitelist()
+def get_lebanese_exchange_rates(
+	rate_type=None, from_date=None, to_date=None, from_currency="USD", to_currency="LBP"
+):
+	frappe.has_permission("Lebanese Exchange Rate", "read", throw=True)
+	return get_rates(
+		_validate_rate_type(rate_type), from_date, to_date or from_date, from_currency, to_currency
+	)
+
+
+@frappe.whitelist()
+def get_exchange_rate(from_currency, to_currency, transaction_date=None, args=None):
+	"""
+	Override of erpnext.setup.utils.get_exchange_rate: LBP/USD conversions use the site's
+	default Lebanese rate type (`lebanese_default_rate_type` in site config) from the cache.
+	"""
+	if {from_currency, to_currency} == LEBANESE_PAIR:
+		rate = get_rate(_get_default_rate_type(), transaction_date, from_currency, to_currency)
+		if rate:
+			return flt(rate, 9)
+
+	from erpnext.setup.utils import get_exchange_rate as erpnext_get_exchange_rate
+
+	return erpnext_get_exchange_rate(from_currency, to_currency, transaction_date, args)
+
+
+def invalidate_rate_cache(rate_type: str, from_currency: str, to_currency: str) -> None:
+	"""Drop a series in Redis and in every worker once the current transaction commits."""
+	series_key = _get_series_key(rate_type, from_currency, to_currency)
+
+	def invalidate():
+		frappe.cache().hdel(RATE_SERIES_KEY, series_key)
+		frappe.cache().hset(RATE_VERSION_KEY, series_key, frappe.generate_hash(length=10))
+
+	frappe.db.after_commit.add(invalidate)
+
+
+def _get_series(rate_type, from_currency, to_currency):
+	series_key = _get_series_key(rate_type, from_currency, to_currency)
+	version = frappe.cache().hget(RATE_VERSION_KEY, series_key)
+	key = (frappe.local.site, series_key)
+
+	cached = _SERIES.get(key)
+	if cached and cached[0] == version:
+		return cached[1]
+
+	# A series loaded before a concurrent invalidation is written back under the old version
+	stored = frappe.cache().hget(RATE_SERIES_KEY, series_key)
+	if stored and stored.get("version") == version:
+		series = stored["series"]
+	else:
+		series = _load_series(rate_type, from_currency, to_currency)
+		frappe.cache().hset(RATE_SERIES_KEY, series_key, {"version": version, "series": series})
+
+	_SERIES[key] = (version, series)
+	return series
+
+
+def _load_series(rate_type, from_currency, to_currency):
+	rows = frappe.get_all(
+		"Lebanese Exchange Rate",
+		filters={"rate_type": rate_type, "from_currency": from_currency, "to_currency": to_currency},
+		fields=["date", "exchange_rate"],
+		order_by="date asc",
+	)
+	return [getdate(row.date) for row in rows], [flt(row.exchange_rate) for row in rows]
+
+
+def _get_series_key(rate_type, from_currency, to_currency):
+	return f"{rate_type}:{from_currency}:{to_currency}"
+
+
+def _get_default_rate_type():
+	return frappe.conf.get("lebanese_default_rate_type") or DEFAULT_RATE_TYPE
+
+
+def _validate_rate_type(rate_type):
+	rate_type = rate_type or _get_default_rate_type()
+	if rate_type not in RATE_TYPES:
+		frappe.throw(_("Unknown rate type {0}").format(rate_type))
+	return rate_type
@@ -0,0 +1,269 @@
+"""
+Synthetic GL Entry generator for benchmarking reports on the Lebanese chart.
+
+Fills a company with balanced two-line vouchers posted to the leaf accounts of
+its Lebanese chart: sales, purchases, payments, receipts and expenses, a share
+of them transacted in USD and converted to LBP. Receivable and payable lines
+carry one of a fixed set of synthetic customers or suppliers. Rows are bulk
+inserted in batches, and the same seed and dates always produce the same ledger
+(entry names derive from the seed, so a re-run with the same seed adds nothing).
+"""
+
+import math
+import random
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, date_diff, flt, getdate, now
+
+from erpnext_lebanese.api import METADATA_KEYS
+from erpnext_lebanese.chart_variants import get_lebanese_chart
+
+VOUCHER_PREFIX = "SYN-GL"
+BATCH_SIZE = 10000
+DEFAULT_USD_RATE = 89500
+# Fixed so that a seed alone reproduces a ledger
+DEFAULT_FROM_DATE = "2024-01-01"
+DEFAULT_TO_DATE = "2024-12-31"
+
+# Receivable/payable lines are posted against one of PARTY_COUNT synthetic parties
+PARTY_TYPES = {"Receivable": "Customer", "Payable": "Supplier"}
+PARTY_COUNT = 50
+
+# (debit root type, credit root type, weight, median amount in USD)
+VOUCHER_PATTERNS = [
+	("Asset", "Income", 40, 250),  # sales
+	("Expense", "Liability", 25, 400),  # purchases and charges
+	("Liability", "Asset", 15, 900),  # supplier payments
+	("Asset", "Asset", 12, 1200),  # customer receipts, bank transfers
+	("Expense", "Asset", 8, 60),  # petty cash expenses
+]
+
+
+def generate_gl_entries(
+	company: str,
+	entries: int = 1_000_000,
+	seed: int = 0,
+	from_date=DEFAULT_FROM_DATE,
+	to_date=DEFAULT_TO_DATE,
+	usd_share: float = 0.6,
+	usd_rate: float = DEFAULT_USD_RATE,
+) -> int:
+	"""Insert about `entries` synthetic GL Entries for `company` and return the number generated."""
+	company_row = frappe.db.get_value(
+		"Company", company, ["chart_of_accounts", "default_currency", "abbr"], as_dict=True
+	)
+	if not company_row:
+		frappe.throw(_("Company {0} not found").format(company))
+
+	accounts_by_root = _get_leaf_accounts(company, company_row.chart_of_accounts)
+	from_date = getdate(from_date or DEFAULT_FROM_DATE)
+	to_date = getdate(to_date or DEFAULT_TO_DATE)
+	parties = _get_synthetic_parties()
+	fiscal_years = frappe.get_all(
+		"Fiscal Year", fields=["name", "year_start_date", "year_end_date"], order_by="year_start_date"
+	)
+	cost_center = frappe.get_cached_value("Company", company, "cost_center")
+
+	fields = [
+		"name",
+		"owner",
+		"modified_by",
+		"creation",
+		"modified",
+		"docstatus",
+		"posting_date",
+		"account",
+		"party_type",
+		"party",
+		"cost_center",
+		"debit",
+		"credit",
+		"account_currency",
+		"debit_in_account_currency",
+		"credit_in_account_currency",
+		"voucher_type",
+		"voucher_no",
+		"company",
+		"fiscal_year",
+		"is_opening",
+		"is_cancelled",
+		"remarks",
+	]
+	has_transaction_currency = frappe.db.has_column("GL Entry", "transaction_currency")
+	if has_transaction_currency:
+		fields += [
+			"transaction_currency",
+			"transaction_exchange_rate",
+			"debit_in_transaction_currency",
+			"credit_in_transaction_currency",
+		]
+
+	rng = random.Random(seed)
+	patterns = [
+		pattern
+		for pattern in VOUCHER_PATTERNS
+		if pattern[0] in accounts_by_root
+		and pattern[1] in accounts_by_root
+		# Same-root vouchers need two distinct accounts
+		and (pattern[0] != pattern[1] or len(accounts_by_root[pattern[0]]) > 1)
+	]
+	if not patterns:
+		frappe.throw(_("{0} has no leaf accounts to post synthetic entries to").format(company))
+	weights = [pattern[2] for pattern in patterns]
+	days = max(date_diff(to_date, from_date), 0)
+	timestamp = now()
+	user = frappe.session.user
+
+	batch = []
+	generated = 0
+	for voucher in range(math.ceil(entries / 2)):
+		debit_root, credit_root, _weight, median = rng.choices(patterns, weights)[0]
+		in_usd = rng.random() < usd_share
+		usd_amount = round(rng.lognormvariate(math.log(median), 1.0), 2)
+		# LBP transactions are rounded to the nearest thousand, as cash is in practice
+		amount = flt(usd_amount * usd_rate, 2) if in_usd else round(usd_amount * usd_rate, -3)
+		if not amount:
+			continue
+		posting_date = add_days(from_date, rng.randint(0, days))
+		voucher_no = f"{VOUCHER_PREFIX}-{seed}-{voucher:08d}"
+
+		for line, account in enumerate(
+			_pick_accounts(rng, accounts_by_root[debit_root], accounts_by_root[credit_root])
+		):
+			debit, credit = (amount, 0) if line == 0 else (0, amount)
+			in_account_currency = usd_rate if account.account_currency == "USD" else 1
+			party_type = PARTY_TYPES.get(account.account_type)
+			party = rng.choice(parties[party_type]) if party_type else None
+			row = [
+				f"{voucher_no}-{line}",
+				user,
+				user,
+				timestamp,
+				timestamp,
+				1,
+				posting_date,
+				account.name,
+				party_type,
+				party,
+				cost_center if account.report_type == "Profit and Loss" else None,
+				debit,
+				credit,
+				account.account_currency or company_row.default_currency,
+				flt(debit / in_account_currency, 2),
+				flt(credit / in_account_currency, 2),
+				"Journal Entry",
+				voucher_no,
+				company,
+				_get_fiscal_year(fiscal_years, posting_date),
+				"No",
+				0,
+				"Synthetic benchmark entry",
+			]
+			if has_transaction_currency:
+				rate = usd_rate if in_usd else 1
+				row += ["USD" if in_usd else "LBP", rate, flt(debit / rate, 2), flt(credit / rate, 2)]
+			batch.append(tuple(row))
+
+		generated += 2
+		if len(batch) >= BATCH_SIZE:
+			_flush(fields, batch)
+
+	_flush(fields, batch)
+	return generated
+
+
+def delete_synthetic_gl_entries(company: str, seed: int | None = None) -> None:
+	"""Remove the entries generated for `company` (only those of `seed` when given)."""
+	prefix = f"{VOUCHER_PREFIX}-{seed}-" if seed is not None else f"{VOUCHER_PREFIX}-"
+	gle = frappe.qb.DocType("GL Entry")
+	frappe.qb.from_(gle).delete().where(gle.company == company).where(gle.voucher_no.like(f"{prefix}%")).run()
+
+	# Parties are shared by every seed and company, so they go only once no synthetic entry is left
+	if not frappe.db.exists("GL Entry", {"voucher_no": ("like", f"{VOUCHER_PREFIX}-%")}):
+		for party_type in PARTY_TYPES.values():
+			frappe.db.delete(party_type, {"name": ("like", f"{VOUCHER_PREFIX} {party_type} %")})
+	frappe.db.commit()
+
+
+def _get_leaf_accounts(company: str, chart_of_accounts: str) -> dict[str, list]:
+	"""Return the company's accounts that are leaves of its Lebanese chart, grouped by root type."""
+	chart = get_lebanese_chart(chart_of_accounts)
+	if not chart:
+		frappe.throw(_("{0} does not use a Lebanese chart of accounts").format(company))
+
+	leaf_numbers = _get_leaf_numbers(chart["tree"])
+	accounts = frappe.get_all(
+		"Account",
+		filters={"company": company, "is_group": 0, "disabled": 0},
+		fields=["name", "account_number", "root_type", "report_type", "account_type", "account_currency"],
+		# A stable order, so that a seed picks the same accounts on every run
+		order_by="lft",
+	)
+
+	by_root: dict[str, list] = {}
+	for account in accounts:
+		if account.account_number in leaf_numbers:
+			by_root.setdefault(account.root_type, []).append(account)
+	return by_root
+
+
+def _pick_accounts(rng, debit_accounts, credit_accounts):
+	"""Draw the debit and the credit account of a voucher, never the same account twice."""
+	debit_index = rng.randrange(len(debit_accounts))
+	if credit_accounts is not debit_accounts:
+		return debit_accounts[debit_index], rng.choice(credit_accounts)
+
+	credit_index = rng.randrange(len(credit_accounts) - 1)
+	if credit_index >= debit_index:
+		credit_index += 1
+	return debit_accounts[debit_index], credit_accounts[credit_index]
+
+
+def _get_leaf_numbers(tree: dict) -> set[str]:
+	leaves = set()
+	stack = [tree]
+	while stack:
+		node = stack.pop()
+		for key, child in node.items():
+			if key in METADATA_KEYS or not isinstance(child, dict):
+				continue
+			has_children = any(k not in METADATA_KEYS and isinstance(v, dict) for k, v in child.items())
+			if has_children:
+				stack.append(child)
+			elif child.get("account_number"):
+				leaves.add(str(child["account_number"]))
+	return leaves
+
+
+def _get_synthetic_parties() -> dict[str, list[str]]:
+	"""Return the synthetic customers and suppliers, creating the missing ones."""
+	parties = {}
+	for party_type in PARTY_TYPES.values():
+		name_field = f"{frappe.scrub(party_type)}_name"
+		names = [f"{VOUCHER_PREFIX} {party_type} {number:03d}" for number in range(1, PARTY_COUNT + 1)]
+		existing = set(frappe.get_all(party_type, filters={"name": ("in", names)}, pluck="name"))
+
+		for name in names:
+			if name not in existing:
+				party = frappe.get_doc({"doctype": party_type, "name": name, name_field: name})
+				party.flags.ignore_mandatory = True
+				party.flags.ignore_permissions = True
+				party.insert(set_name=name)
+		parties[party_type] = names
+	return parties
+
+
+def _get_fiscal_year(fiscal_years, posting_date):
+	for fiscal_year in fiscal_years:
+		if fiscal_year.year_start_date <= posting_date <= fiscal_year.year_end_date:
+			return fiscal_year.name
+	return None
+
+
+def _flush(fields, batch):
+	if not batch:
+		return
+	frappe.db.bulk_insert("GL Entry", fields, batch, ignore_duplicates=True)
+	frappe.db.commit()
+	batch.clear()
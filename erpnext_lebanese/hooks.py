@@ -87,6 +87,10 @@ app_include_css = "/assets/erpnext_lebanese/css/account_tree_rtl.css"
 # before_install = "erpnext_lebanese.install.before_install"
 after_install = "erpnext_lebanese.install.after_install"
 after_uninstall = "erpnext_lebanese.install.after_uninstall"
+after_migrate = [
+	"erpnext_lebanese.install.after_migrate",
+	"erpnext_lebanese.overrides.treeview_override.clear_tree_query_cache",
+]
 
 # Uninstallation
 # ------------
@@ -141,6 +145,37 @@ override_doctype_class = {
 # Hook on document methods and events
 # Note: We use override_doctype_class instead of doc_events for Company
 
+doc_events = {
+	"Account": {
+		"after_insert": [
+			"erpnext_lebanese.account_search.invalidate_search_index",
+			"erpnext_lebanese.vat_summary.clear_vat_accounts_cache",
+			"erpnext_lebanese.period_balances.on_account_change",
+		],
+		"on_update": [
+			"erpnext_lebanese.account_search.invalidate_search_index",
+			"erpnext_lebanese.vat_summary.clear_vat_accounts_cache",
+			"erpnext_lebanese.period_balances.on_account_change",
+		],
+		"after_rename": [
+			"erpnext_lebanese.account_search.invalidate_search_index",
+			"erpnext_lebanese.vat_summary.clear_vat_accounts_cache",
+			"erpnext_lebanese.period_balances.on_account_change",
+		],
+		"on_trash": [
+			"erpnext_lebanese.account_search.invalidate_search_index",
+			"erpnext_lebanese.vat_summary.clear_vat_accounts_cache",
+			"erpnext_lebanese.period_balances.on_account_change",
+		],
+	},
+	"GL Entry": {
+		"on_submit": [
+			"erpnext_lebanese.vat_summary.update_vat_summary",
+			"erpnext_lebanese.period_balances.update_period_balance",
+		],
+	},
+}
+
 # Scheduled Tasks
 # ---------------
 
@@ -174,6 +209,10 @@ override_whitelisted_methods = {
 	"erpnext.setup.setup_wizard.setup_wizard.get_setup_stages": "erpnext_lebanese.overrides.setup_wizard_override.get_setup_stages",
 	"erpnext.setup.setup_wizard.setup_wizard.setup_complete": "erpnext_lebanese.overrides.setup_wizard_override.setup_complete",
 	"erpnext.accounts.utils.get_children": "erpnext_lebanese.overrides.treeview_override.get_children",
+	"frappe.desk.treeview.get_all_nodes": "erpnext_lebanese.overrides.treeview_override.get_all_nodes",
+	"erpnext.accounts.utils.get_account_balances": "erpnext_lebanese.overrides.treeview_override.get_account_balances",
+	"erpnext.accounts.doctype.account.chart_of_accounts.chart_of_accounts.get_charts_for_country": "erpnext_lebanese.overrides.chart_of_accounts_override.get_cached_charts_for_country",
+	"erpnext.setup.utils.get_exchange_rate": "erpnext_lebanese.exchange_rates.get_exchange_rate",
 }
 #
 # each overriding function accepts a `data` argument;
@@ -236,9 +275,9 @@ override_whitelisted_methods = {
 # Automatically update python controller files with type annotations for this app.
 # export_python_type_annotations = True
 
-# default_log_clearing_doctypes = {
-# 	"Logging DocType Name": 30  # days to retain logs
-# }
+default_log_clearing_doctypes = {
+	"Lebanese Provisioning Log": 90  # days to retain logs
+}
 
 
 
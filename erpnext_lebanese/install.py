@@ -1,7 +1,16 @@
 # erpnext_lebanese/install.py
 import frappe
+import hashlib
 import os
 import json
+import tempfile
+
+ROOT_TYPES = {"Asset", "Liability", "Equity", "Income", "Expense"}
+
+# Caches derived from the chart that must be dropped when a new chart is written
+CHART_CACHE_KEYS = ["lebanese_chart_store", "lebanese_standard_chart_labels"]
+
+COMPANY_TYPE_FIELD = "lebanese_company_type"
 
 
 def _get_chart_paths():
@@ -33,32 +42,150 @@ def after_install():
 	Copy Lebanese chart of accounts JSON to ERPNext's unverified folder
 	This allows ERPNext to automatically discover and use it
 	"""
+	sync_custom_fields()
+	sync_chart_of_accounts()
+
+
+def after_migrate():
+	"""Push chart and tax data updates to ERPNext without a full reinstall."""
+	from erpnext_lebanese.tax_templates import TAX_DATA_CACHE_KEY
+
+	frappe.cache().delete_value(TAX_DATA_CACHE_KEY)
+	sync_custom_fields()
+	sync_chart_of_accounts()
+
+
+def sync_custom_fields():
+	"""Add the Lebanese legal type to Company; it picks the chart variant when no chart is chosen."""
+	from frappe.custom.doctype.custom_field.custom_field import create_custom_fields
+
+	from erpnext_lebanese.utils import get_company_types
+
+	create_custom_fields(
+		{
+			"Company": [
+				{
+					"fieldname": COMPANY_TYPE_FIELD,
+					"label": "Lebanese Company Type",
+					"fieldtype": "Select",
+					"options": "\n".join(["", *get_company_types()]),
+					"insert_after": "country",
+					"depends_on": "eval:doc.country=='Lebanon'",
+					"description": "Selects the Lebanese chart variant when no Chart of Accounts is chosen",
+				}
+			]
+		},
+		update=True,
+	)
+
+
+def sync_chart_of_accounts():
+	"""
+	Validate the Lebanese charts (the standard chart and every legal-type variant) and
+	install them into ERPNext's unverified folder. A write is skipped when the installed
+	file already has the same content hash, and otherwise goes through a temporary file
+	and an atomic rename so workers never read a half-written chart.
+	Returns True when at least one chart file was written.
+	"""
+	from erpnext_lebanese.chart_variants import compile_chart_store
+
+	_, target_dir, target_file = _get_chart_paths()
+
+	written = False
+	for chart in compile_chart_store()["charts"].values():
+		chart_data = {key: chart[key] for key in ("name", "country_code", "disabled", "tree")}
+		validate_chart_schema(chart_data)
+
+		path = target_file if chart["slug"] == "standard" else _get_variant_path(target_dir, chart["slug"])
+		written |= _install_chart_file(path, chart_data)
+
+	if written:
+		frappe.cache().delete_value(CHART_CACHE_KEYS)
+	return written
+
+
+def _get_variant_path(target_dir, slug):
+	return os.path.join(target_dir, f"lb_lebanese_{slug}.json")
+
+
+def _install_chart_file(path, chart_data):
+	content = json.dumps(chart_data, indent=4, ensure_ascii=False).encode("utf-8")
+	content_hash = hashlib.sha256(content).hexdigest()
+
+	if _file_hash(path) == content_hash:
+		return False
+
 	try:
-		source_file, target_dir, target_file = _get_chart_paths()
-
-		# Ensure target directory exists
-		if not os.path.exists(target_dir):
-			os.makedirs(target_dir)
-		
-		# Read and validate the source JSON
-		with open(source_file, 'r') as f:
-			chart_data = json.load(f)
-		
-		# Ensure it has the required fields
-		if not chart_data.get("name"):
-			chart_data["name"] = "Lebanese Standard Chart of Accounts"
-		if not chart_data.get("country_code"):
-			chart_data["country_code"] = "lb"
-		if chart_data.get("disabled") is None:
-			chart_data["disabled"] = "No"
-		
-		# Write to target location
-		with open(target_file, 'w', encoding='utf-8') as f:
-			json.dump(chart_data, f, indent=4, ensure_ascii=False)
-		
-	except Exception as e:
-		# Don't fail installation if this fails
-		pass
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+		_atomic_write(path, content)
+	except OSError:
+		# Don't fail install/migrate when ERPNext's folder is not writable, but say so in the Error Log
+		frappe.log_error(
+			f"Could not install Lebanese chart of accounts to {path}\n\n{frappe.get_traceback()}",
+			"Lebanese Chart Installation",
+		)
+		return False
+
+	return True
+
+
+def validate_chart_schema(chart_data):
+	"""Raise frappe.ValidationError when the chart JSON does not have the shape ERPNext expects."""
+	errors = []
+
+	if not isinstance(chart_data.get("name"), str) or not chart_data["name"].strip():
+		errors.append("Chart 'name' must be a non-empty string")
+
+	tree = chart_data.get("tree")
+	if not isinstance(tree, dict) or not tree:
+		errors.append("Chart 'tree' must be a non-empty object")
+		tree = {}
+
+	from erpnext_lebanese.api import METADATA_KEYS
+
+	def walk(children, path):
+		for key, child in children.items():
+			if key in METADATA_KEYS:
+				continue
+			node_path = f"{path}/{key}"
+			if not isinstance(child, dict):
+				errors.append(f"{node_path}: account must be an object")
+				continue
+			if child.get("root_type") and child["root_type"] not in ROOT_TYPES:
+				errors.append(f"{node_path}: invalid root_type {child['root_type']!r}")
+			if child.get("is_group") not in (None, 0, 1):
+				errors.append(f"{node_path}: is_group must be 0 or 1")
+			if not isinstance(child.get("account_number", ""), (str, int)):
+				errors.append(f"{node_path}: account_number must be a string")
+			walk(child, node_path)
+
+	walk(tree, "")
+
+	if errors:
+		raise frappe.ValidationError("Invalid Lebanese chart of accounts:\n" + "\n".join(errors[:20]))
+
+
+def _file_hash(path):
+	try:
+		with open(path, "rb") as f:
+			return hashlib.sha256(f.read()).hexdigest()
+	except OSError:
+		return None
+
+
+def _atomic_write(path, content):
+	fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".lb_chart_", suffix=".tmp")
+	try:
+		with os.fdopen(fd, "wb") as f:
+			f.write(content)
+			f.flush()
+			os.fsync(f.fileno())
+		os.chmod(tmp_path, 0o644)
+		os.replace(tmp_path, path)
+	except BaseException:
+		if os.path.exists(tmp_path):
+			os.remove(tmp_path)
+		raise
 
 
 def after_uninstall():
@@ -66,10 +193,13 @@ def after_uninstall():
 	Remove Lebanese chart JSON from ERPNext when the app is uninstalled
 	"""
 	try:
-		_, _, target_file = _get_chart_paths()
+		_, target_dir, target_file = _get_chart_paths()
 		if os.path.exists(target_file):
 			os.remove(target_file)
+		# Legal-type variants installed next to the standard chart
+		for fname in os.listdir(target_dir):
+			if fname.startswith("lb_lebanese_") and fname.endswith(".json"):
+				os.remove(os.path.join(target_dir, fname))
 	except Exception:
 		# Avoid uninstall failure
 		pass
-
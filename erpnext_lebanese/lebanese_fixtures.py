@@ -0,0 +1,237 @@
+"""
+Lebanon-minimal setup wizard fixtures.
+
+ERPNext's `install_fixtures.install(country)` creates hundreds of generic records
+(every UOM with its conversion factors, industries, sales stages, ...). The
+"lebanon-minimal" profile installs only what a Lebanese company needs to be
+provisioned and to trade: LBP/USD currencies, the common UOMs, the root groups
+and Lebanese territory, price lists, payment modes and the Lebanese address
+template, each doctype with one bulk INSERT.
+"""
+
+import frappe
+from frappe import _
+from frappe.utils import now
+
+FULL_PROFILE = "full"
+LEBANON_MINIMAL_PROFILE = "lebanon-minimal"
+FIXTURE_PROFILES = (FULL_PROFILE, LEBANON_MINIMAL_PROFILE)
+
+LEBANESE_CURRENCIES = ("LBP", "USD")
+
+UOMS = [
+	("Nos", 1),
+	("Unit", 1),
+	("Box", 1),
+	("Pair", 1),
+	("Set", 1),
+	("Kg", 0),
+	("Gram", 0),
+	("Litre", 0),
+	("Meter", 0),
+	("Square Meter", 0),
+	("Hour", 0),
+	("Day", 0),
+	("Month", 0),
+]
+
+# Nested set trees as (name, parent, is_group), parents listed before children
+TREES = {
+	"Item Group": (
+		"item_group_name",
+		"parent_item_group",
+		[
+			("All Item Groups", "", 1),
+			("Products", "All Item Groups", 0),
+			("Raw Material", "All Item Groups", 0),
+			("Services", "All Item Groups", 0),
+			("Consumable", "All Item Groups", 0),
+		],
+	),
+	"Territory": (
+		"territory_name",
+		"parent_territory",
+		[
+			("All Territories", "", 1),
+			("Lebanon", "All Territories", 0),
+			("Rest Of The World", "All Territories", 0),
+		],
+	),
+	"Customer Group": (
+		"customer_group_name",
+		"parent_customer_group",
+		[
+			("All Customer Groups", "", 1),
+			("Individual", "All Customer Groups", 0),
+			("Commercial", "All Customer Groups", 0),
+			("Government", "All Customer Groups", 0),
+		],
+	),
+	"Supplier Group": (
+		"supplier_group_name",
+		"parent_supplier_group",
+		[
+			("All Supplier Groups", "", 1),
+			("Local", "All Supplier Groups", 0),
+			("Services", "All Supplier Groups", 0),
+			("Raw Material", "All Supplier Groups", 0),
+		],
+	),
+	"Sales Person": ("sales_person_name", "parent_sales_person", [("Sales Team", "", 1)]),
+	"Department": ("department_name", "parent_department", [("All Departments", "", 1)]),
+}
+
+LEBANESE_ADDRESS_TEMPLATE = """{{ address_line1 }}<br>
+{% if address_line2 %}{{ address_line2 }}<br>{% endif -%}
+{% if city %}{{ city }}{% endif %}{% if state %}, {{ state }}{% endif %}{% if pincode %} {{ pincode }}{% endif %}<br>
+{{ country }}<br>
+{% if phone %}{{ _("Phone") }}: {{ phone }}<br>{% endif -%}
+{% if email_id %}{{ _("Email") }}: {{ email_id }}<br>{% endif -%}
+"""
+
+
+def install_fixture_profile(profile: str | None, country: str) -> None:
+	"""Install the setup wizard fixtures of the given profile (ERPNext's full set by default)."""
+	if (profile or FULL_PROFILE) == FULL_PROFILE:
+		from erpnext.setup.setup_wizard.operations import install_fixtures
+
+		install_fixtures.install(country)
+		return
+
+	if profile != LEBANON_MINIMAL_PROFILE:
+		frappe.throw(_("Unknown fixture profile {0}").format(profile))
+
+	install_lebanon_minimal_fixtures()
+
+
+def install_lebanon_minimal_fixtures() -> None:
+	currency = frappe.qb.DocType("Currency")
+	frappe.qb.update(currency).set(currency.enabled, 1).where(currency.name.isin(LEBANESE_CURRENCIES)).run()
+
+	_bulk_insert(
+		"UOM", [{"name": uom, "uom_name": uom, "must_be_whole_number": whole} for uom, whole in UOMS]
+	)
+
+	for doctype, (name_field, parent_field, nodes) in TREES.items():
+		_insert_tree(doctype, name_field, parent_field, nodes)
+
+	_bulk_insert(
+		"Price List",
+		[
+			# Both flags on every row: a missing key would insert NULL into their non-null columns
+			{
+				"name": name,
+				"price_list_name": name,
+				"currency": currency,
+				"enabled": 1,
+				"buying": buying,
+				"selling": selling,
+			}
+			for name, currency, buying, selling in (
+				("Standard Buying", "LBP", 1, 0),
+				("Standard Selling", "LBP", 0, 1),
+				("Standard Selling USD", "USD", 0, 1),
+			)
+		],
+	)
+	_bulk_insert(
+		"Mode of Payment",
+		[
+			{"name": name, "mode_of_payment": name, "type": payment_type, "enabled": 1}
+			for name, payment_type in (
+				("Cash", "Cash"),
+				("Cheque", "Bank"),
+				("Wire Transfer", "Bank"),
+				("Credit Card", "Bank"),
+			)
+		],
+	)
+	_bulk_insert(
+		"Stock Entry Type",
+		[
+			{"name": purpose, "purpose": purpose}
+			for purpose in (
+				"Material Issue",
+				"Material Receipt",
+				"Material Transfer",
+				"Manufacture",
+				"Repack",
+				"Material Transfer for Manufacture",
+			)
+		],
+	)
+	_bulk_insert("Warehouse Type", [{"name": "Transit"}])
+	_bulk_insert(
+		"Address Template",
+		[{"name": "Lebanon", "country": "Lebanon", "is_default": 1, "template": LEBANESE_ADDRESS_TEMPLATE}],
+	)
+
+	# What ERPNext's set_more_defaults would have pointed at
+	frappe.db.set_single_value(
+		"Selling Settings",
+		{"customer_group": "All Customer Groups", "territory": "All Territories"},
+	)
+	frappe.db.set_single_value("Buying Settings", "supplier_group", "All Supplier Groups")
+
+
+def _insert_tree(doctype, name_field, parent_field, nodes):
+	"""Bulk insert a tree with precomputed lft/rgt on a fresh site, else insert the missing nodes."""
+	if frappe.db.count(doctype):
+		for name, parent, is_group in nodes:
+			if not frappe.db.exists(doctype, name):
+				frappe.get_doc(
+					{"doctype": doctype, name_field: name, parent_field: parent, "is_group": is_group}
+				).insert(ignore_permissions=True)
+		return
+
+	children = {}
+	for name, parent, _is_group in nodes:
+		children.setdefault(parent, []).append(name)
+
+	bounds = {}
+	counter = 0
+
+	def number(name):
+		nonlocal counter
+		counter += 1
+		lft = counter
+		for child in children.get(name, []):
+			number(child)
+		counter += 1
+		bounds[name] = (lft, counter)
+
+	for root in children.get("", []):
+		number(root)
+
+	_bulk_insert(
+		doctype,
+		[
+			{
+				"name": name,
+				name_field: name,
+				parent_field: parent,
+				"is_group": is_group,
+				"lft": bounds[name][0],
+				"rgt": bounds[name][1],
+			}
+			for name, parent, is_group in nodes
+		],
+	)
+
+
+def _bulk_insert(doctype, rows):
+	timestamp = now()
+	fields = ["owner", "modified_by", "creation", "modified", "docstatus", "idx"]
+	for row in rows:
+		fields.extend(key for key in row if key not in fields)
+
+	standard = {
+		"owner": frappe.session.user,
+		"modified_by": frappe.session.user,
+		"creation": timestamp,
+		"modified": timestamp,
+		"docstatus": 0,
+		"idx": 0,
+	}
+	values = [tuple({**standard, **row}.get(field) for field in fields) for row in rows]
+	frappe.db.bulk_insert(doctype, fields, values, ignore_duplicates=True)
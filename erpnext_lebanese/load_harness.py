@@ -0,0 +1,145 @@
+"""
+Concurrent company provisioning load harness.
+
+Creates N Lebanese companies from W worker processes against the local site's
+database and reports throughput, latency percentiles and how many inserts hit
+deadlocks or lock wait timeouts, so provisioning concurrency (the global Account
+tree rebuild, the commits between steps) can be measured before and after changes.
+Only meant for development sites: every company it tries to create, whether or
+not provisioning succeeded, is deleted afterwards unless asked to keep them.
+"""
+
+import multiprocessing
+import time
+
+import frappe
+from frappe.utils import random_string
+
+from erpnext_lebanese.provisioning import _percentile
+
+# MariaDB counters sampled before and after a run
+SERVER_LOCK_COUNTERS = ("Innodb_deadlocks", "Innodb_row_lock_waits", "Innodb_row_lock_time")
+
+
+def run_provisioning_load(
+	site: str, companies: int = 10, workers: int = 4, sites_path: str = ".", keep: bool = False
+) -> dict:
+	"""Create `companies` companies concurrently from `workers` processes and return the measurements."""
+	run_id = random_string(4).upper()
+	jobs = [(run_id, index) for index in range(companies)]
+
+	frappe.init(site=site, sites_path=sites_path)
+	frappe.connect()
+	try:
+		counters_before = _get_server_lock_counters()
+	finally:
+		frappe.destroy()
+
+	context = multiprocessing.get_context("spawn")
+	start = time.perf_counter()
+	with context.Pool(workers, initializer=_init_worker, initargs=(site, sites_path)) as pool:
+		results = list(pool.imap_unordered(_create_company, jobs))
+	wall_time = time.perf_counter() - start
+
+	frappe.init(site=site, sites_path=sites_path)
+	frappe.connect()
+	try:
+		counters_after = _get_server_lock_counters()
+		# Failed runs can leave a half-provisioned company behind, as provisioning commits between steps
+		cleanup_errors = [] if keep else _delete_companies([result["company"] for result in results])
+	finally:
+		frappe.destroy()
+
+	summary = _summarize(results, wall_time, workers, counters_before, counters_after)
+	summary["cleanup_errors"] = cleanup_errors
+	return summary
+
+
+def _init_worker(site, sites_path):
+	frappe.init(site=site, sites_path=sites_path)
+	frappe.connect()
+	frappe.set_user("Administrator")
+
+
+def _create_company(job) -> dict:
+	run_id, index = job
+	company = f"Load Test {run_id} {index:04d}"
+	result = {"company": company, "status": "Success", "duration": 0.0, "error": None}
+
+	start = time.perf_counter()
+	try:
+		frappe.get_doc(
+			{
+				"doctype": "Company",
+				"company_name": company,
+				"abbr": f"L{run_id}{index:04d}",
+				"country": "Lebanon",
+				"default_currency": "LBP",
+			}
+		).insert()
+		frappe.db.commit()
+	except Exception as exc:
+		frappe.db.rollback()
+		result["status"] = _classify_error(exc)
+		result["error"] = str(exc)[:200]
+	finally:
+		result["duration"] = time.perf_counter() - start
+
+	return result
+
+
+def _classify_error(exc) -> str:
+	if isinstance(exc, frappe.QueryDeadlockError) or frappe.db.is_deadlocked(exc):
+		return "Deadlock"
+	if isinstance(exc, frappe.QueryTimeoutError) or frappe.db.is_timedout(exc):
+		return "Lock Wait Timeout"
+	return "Failed"
+
+
+def _get_server_lock_counters() -> dict[str, int]:
+	if frappe.db.db_type != "mariadb":
+		return {}
+
+	rows = frappe.db.sql(
+		"show global status where Variable_name in %(names)s", {"names": SERVER_LOCK_COUNTERS}
+	)
+	return {name: int(value) for name, value in rows}
+
+
+def _delete_companies(companies: list[str]) -> list[str]:
+	"""Tear down every company the run attempted; returns the ones that could not be deleted."""
+	from erpnext_lebanese.teardown import delete_lebanese_company
+
+	errors = []
+	for company in companies:
+		try:
+			delete_lebanese_company(company)
+		except Exception as exc:
+			frappe.db.rollback()
+			errors.append(f"{company}: {str(exc)[:200]}")
+	return errors
+
+
+def _summarize(results, wall_time, workers, counters_before, counters_after) -> dict:
+	durations = sorted(result["duration"] for result in results if result["status"] == "Success")
+	statuses = [result["status"] for result in results]
+
+	return {
+		"companies": len(results),
+		"workers": workers,
+		"succeeded": len(durations),
+		"deadlocks": statuses.count("Deadlock"),
+		"lock_wait_timeouts": statuses.count("Lock Wait Timeout"),
+		"failed": statuses.count("Failed"),
+		"wall_time": round(wall_time, 2),
+		"throughput_per_minute": round(len(durations) / wall_time * 60, 2) if wall_time else 0.0,
+		"latency_p50": _percentile(durations, 50),
+		"latency_p95": _percentile(durations, 95),
+		"latency_max": round(durations[-1], 4) if durations else 0.0,
+		"server": {name: counters_after[name] - counters_before.get(name, 0) for name in counters_after},
+		"errors": [
+			f"{result['company']}: {result['status']}: {result['error']}"
+			for result in results
+			if result["status"] != "Success"
+		],
+	}
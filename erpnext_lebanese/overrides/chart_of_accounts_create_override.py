@@ -10,6 +10,8 @@ from erpnext.accounts.doctype.account.chart_of_accounts.chart_of_accounts import
 	get_chart
 )
 
+from erpnext_lebanese.chart_variants import get_lebanese_chart
+
 
 def create_charts(
 	company, chart_template=None, existing_company=None, custom_chart=None, from_coa_importer=None
@@ -18,7 +20,12 @@ def create_charts(
 	Override create_charts to handle arabic_name and french_name metadata fields
 	These fields should be ignored when processing the chart structure
 	"""
-	chart = custom_chart or get_chart(chart_template, existing_company)
+	chart = custom_chart
+	if not chart and not existing_company:
+		# Lebanese charts and their variants come from the compiled chart store
+		lebanese_chart = get_lebanese_chart(chart_template)
+		chart = lebanese_chart and lebanese_chart["tree"]
+	chart = chart or get_chart(chart_template, existing_company)
 	if chart:
 		accounts = []
 		metadata_keys = {
@@ -1,7 +1,7 @@
 # erpnext_lebanese/overrides/chart_of_accounts_override.py
 import frappe, json, os
 from frappe import _
-from frappe.utils import cstr
+from frappe.utils import cint, cstr, sbool
 
 @frappe.whitelist()
 def get_lebanese_charts(country=None, with_standard=False):
@@ -12,17 +12,64 @@ def get_lebanese_charts(country=None, with_standard=False):
     # Enable unverified charts so ERPNext can find our chart
     frappe.local.flags.allow_unverified_charts = True
     
-    # Use ERPNext's standard method to get charts for Lebanon
-    from erpnext.accounts.doctype.account.chart_of_accounts.chart_of_accounts import get_charts_for_country
-    
     country = country or "Lebanon"
-    charts = get_charts_for_country(country, with_standard=with_standard)
+    charts = get_cached_charts_for_country(country, with_standard=with_standard)
     
     # Filter to only return Lebanese charts, or return all if none found
     lebanese_charts = [c for c in charts if "Lebanese" in c or "lebanese" in c.lower()]
     
     return lebanese_charts if lebanese_charts else charts
 
+@frappe.whitelist()
+def get_chart_for_company_type(company_type=None):
+    """Return the Lebanese chart variant of a company legal type, for the setup wizard."""
+    from erpnext_lebanese.chart_variants import get_chart_for_company_type
+
+    return get_chart_for_company_type(company_type)
+
+@frappe.whitelist()
+def get_cached_charts_for_country(country, with_standard=False):
+    """
+    Cached drop-in for ERPNext's get_charts_for_country, which lists and parses every chart
+    JSON on each call. Results are cached per site and invalidated when the verified or
+    unverified chart directory changes (install.py writes our chart into unverified).
+    """
+    from erpnext.accounts.doctype.account.chart_of_accounts.chart_of_accounts import get_charts_for_country
+
+    # The Lebanese chart lives in the unverified folder
+    if country == "Lebanon":
+        frappe.local.flags.allow_unverified_charts = True
+
+    with_standard = sbool(with_standard)
+    allow_unverified = bool(frappe.local.flags.allow_unverified_charts)
+    cache_key = f"lebanese_charts_for_country::{country}::{cint(with_standard)}::{cint(allow_unverified)}"
+    version = _get_chart_directories_version()
+
+    cached = frappe.cache().get_value(cache_key)
+    if cached and cached.get("version") == version:
+        return list(cached["charts"])
+
+    charts = get_charts_for_country(country, with_standard=with_standard)
+    frappe.cache().set_value(cache_key, {"version": version, "charts": charts})
+    return charts
+
+
+def _get_chart_directories_version():
+    """mtimes of ERPNext's verified and unverified chart directories."""
+    from erpnext_lebanese.install import _get_chart_paths
+
+    unverified_dir = _get_chart_paths()[1]
+    verified_dir = os.path.join(os.path.dirname(unverified_dir), "verified")
+
+    version = []
+    for directory in (verified_dir, unverified_dir):
+        try:
+            version.append(os.stat(directory).st_mtime_ns)
+        except OSError:
+            version.append(None)
+    return tuple(version)
+
+
 @frappe.whitelist()
 def get_lebanese_coa(doctype, parent, is_root=None, chart=None):
     """
@@ -32,38 +79,84 @@ def get_lebanese_coa(doctype, parent, is_root=None, chart=None):
     # Enable unverified charts so ERPNext can find our chart
     frappe.local.flags.allow_unverified_charts = True
     
-    # Use ERPNext's standard method
-    from erpnext.accounts.doctype.account.chart_of_accounts.chart_of_accounts import get_chart
-    
     chart = chart if chart else frappe.flags.chart
     frappe.flags.chart = chart
     
     parent = None if parent == _("All Accounts") else parent
     
-    # Get chart tree from ERPNext's standard method
-    chart_tree = get_chart(chart)
-    
+    # Each call for an expanded node is a lookup in the cached parent -> children index
+    children_index = get_chart_children_index(chart)
+    return [dict(account) for account in children_index.get(parent or "", [])]
+
+
+# Per-process cache: (site, chart) -> (chart version, parent -> children index)
+_CHART_CHILDREN_INDEXES = {}
+
+METADATA_KEYS = {
+    "account_name",
+    "account_number",
+    "account_type",
+    "root_type",
+    "is_group",
+    "tax_rate",
+    "account_currency",
+    "arabic_name",
+    "french_name",
+}
+
+
+def get_chart_children_index(chart):
+    """Return the parent_account -> child nodes index of a chart, built once per chart version."""
+    key = (frappe.local.site, chart)
+    version = _get_chart_version()
+
+    cached = _CHART_CHILDREN_INDEXES.get(key)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    index = _build_children_index(chart)
+    _CHART_CHILDREN_INDEXES[key] = (version, index)
+    return index
+
+
+def _get_chart_version():
+    """
+    Chart sources (base chart and variant overlays) plus every installed lb_lebanese_*.json;
+    changes whenever a source is edited or install.py writes a chart.
+    """
+    from erpnext_lebanese.chart_variants import get_sources_version
+    from erpnext_lebanese.install import _get_chart_paths
+
+    target_dir = _get_chart_paths()[1]
+    try:
+        installed = tuple(
+            (fname, os.stat(os.path.join(target_dir, fname)).st_mtime_ns)
+            for fname in sorted(os.listdir(target_dir))
+            if fname.startswith("lb_lebanese_") and fname.endswith(".json")
+        )
+    except OSError:
+        installed = None
+
+    return get_sources_version(), installed
+
+
+def _build_children_index(chart):
+    # Use ERPNext's standard method
+    from erpnext.accounts.doctype.account.chart_of_accounts.chart_of_accounts import get_chart
+
+    from erpnext_lebanese.chart_variants import get_lebanese_chart
+
+    # Lebanese charts come from the compiled chart store, others from ERPNext's standard method
+    lebanese_chart = get_lebanese_chart(chart)
+    chart_tree = lebanese_chart["tree"] if lebanese_chart else get_chart(chart)
+    index = {}
+
     if not chart_tree:
-        return []
-    
-    # Build account list from tree
-    accounts = []
-    
-    metadata_keys = {
-        "account_name",
-        "account_number",
-        "account_type",
-        "root_type",
-        "is_group",
-        "tax_rate",
-        "account_currency",
-        "arabic_name",
-        "french_name",
-    }
+        return index
 
     def _build_accounts(children, parent_account):
         for account_name, child in children.items():
-            if account_name in metadata_keys:
+            if account_name in METADATA_KEYS:
                 continue
             if not isinstance(child, dict):
                 continue
@@ -79,17 +172,13 @@ def get_lebanese_coa(doctype, parent, is_root=None, chart=None):
                 "expandable": identify_is_group(child),
                 "value": account_value,
             }
-            accounts.append(account)
+            index.setdefault(parent_account or "", []).append(account)
 
             if account["expandable"]:
                 _build_accounts(child, account_value)
-    
-    _build_accounts(chart_tree, parent)
-    
-    # Filter to show data for the selected node only
-    filtered_accounts = [d for d in accounts if d["parent_account"] == parent]
-    
-    return filtered_accounts
+
+    _build_accounts(chart_tree, None)
+    return index
 
 # Removed - now using ERPNext's standard get_chart method
 
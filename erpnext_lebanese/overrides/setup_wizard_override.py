@@ -7,9 +7,14 @@ from erpnext.setup.setup_wizard.operations.install_fixtures import (
 	install_defaults as install_defaults_op,
 )
 
+from erpnext_lebanese.install import COMPANY_TYPE_FIELD
+from erpnext_lebanese.lebanese_fixtures import install_fixture_profile
+from erpnext_lebanese.provisioning import finish_timeline, provisioning_step, start_timeline
+
 LEBANESE_CHART_NAME = "Lebanese Standard Chart of Accounts"
 LEBANESE_COUNTRY = "Lebanon"
 LEBANESE_CURRENCY = "LBP"
+SETUP_PROGRESS_EVENT = "lebanese_setup_progress"
 
 
 def after_install():
@@ -34,7 +39,14 @@ def _coerce_args(args):
 
 def _ensure_lebanese_defaults(args_dict):
 	if not args_dict.get("chart_of_accounts"):
-		args_dict.chart_of_accounts = LEBANESE_CHART_NAME
+		# Pick the chart variant matching the company's legal type, if one was given
+		from erpnext_lebanese.chart_variants import get_chart_for_company_type
+
+		args_dict.chart_of_accounts = (
+			get_chart_for_company_type(args_dict.get("company_type"))
+			if args_dict.get("company_type")
+			else LEBANESE_CHART_NAME
+		)
 
 	chart = (args_dict.get("chart_of_accounts") or "").lower()
 	if "lebanese" in chart:
@@ -95,10 +107,14 @@ def get_setup_stages(args=None):
 
 
 def stage_fixtures(args):
-	"""Install fixtures using ERPNext helpers while forcing Lebanese defaults."""
+	"""
+	Install fixtures while forcing Lebanese defaults. Pass `fixture_profile`
+	("full" or "lebanon-minimal") to choose between ERPNext's full fixture set
+	and the Lebanon-only records.
+	"""
 	args = _normalized_args(args)
 	country = args.get("country") or LEBANESE_COUNTRY
-	fixtures.install(country)
+	install_fixture_profile(args.get("fixture_profile"), country)
 
 
 def setup_company(args):
@@ -120,6 +136,9 @@ def setup_company(args):
 	if company_name and not frappe.db.exists("Company", company_name):
 		raise frappe.ValidationError(_("Company {0} was not created").format(company_name))
 
+	if company_name and args_dict.get("company_type"):
+		frappe.db.set_value("Company", company_name, COMPANY_TYPE_FIELD, args_dict.company_type)
+
 
 def setup_defaults(args):
 	"""Setup defaults after company creation."""
@@ -153,23 +172,55 @@ def setup_complete(args=None):
 	"""
 	Programmatic setup complete - override ERPNext's method.
 	This is called via API, so args might be a JSON string.
+
+	Every stage (and each company provisioning step inside it) is timed and published
+	over the `lebanese_setup_progress` realtime event; the response carries the timings.
 	"""
 	args_dict = _normalized_args(args)
+	stages = [
+		(_("Installing presets"), stage_fixtures),
+		(_("Setting up company"), setup_company),
+		(_("Setting defaults"), setup_defaults),
+		(_("Wrapping up"), fin),
+	]
 
-	try:
-		stage_fixtures(args_dict)
-		setup_company(args_dict)
-		setup_defaults(args_dict)
-		fin(args_dict)
+	timeline = start_timeline(args_dict.get("company_name"), progress_event=SETUP_PROGRESS_EVENT)
+	error = None
 
-		return {
+	try:
+		for idx, (stage_status, stage) in enumerate(stages):
+			frappe.publish_realtime(
+				"setup_task",
+				{"progress": [idx, len(stages)], "stage_status": stage_status},
+				user=frappe.session.user,
+			)
+			with provisioning_step(stage_status):
+				stage(args_dict)
+
+		response = {
 			"status": "success",
 			"message": "Setup Completed",
 			"home_page": "/desk",
 		}
 	except Exception as exc:
 		frappe.db.rollback()
-		return {
+		error = str(exc)
+		frappe.log_error(frappe.get_traceback(), "Lebanese Setup Wizard")
+		response = {
 			"status": "error",
-			"message": str(exc),
-		}
\ No newline at end of file
+			"message": error,
+		}
+
+	if timeline:
+		finish_timeline(timeline, error=error)
+		response["timings"] = _format_timings(timeline)
+	return response
+
+
+def _format_timings(timeline):
+	summary = timeline.as_dict()
+	return {
+		"total_duration": summary["total_duration"],
+		"total_queries": summary["total_queries"],
+		"steps": summary["steps"],
+	}
@@ -1,19 +1,286 @@
+from collections import defaultdict
+
 import frappe
-from frappe.query_builder import DocType
-from erpnext.accounts.report.financial_statements import sort_accounts
+from frappe import _
+from frappe.query_builder import Case, DocType
+from frappe.query_builder.functions import Sum
+from frappe.utils import cint, flt, getdate, nowdate
+from pypika.terms import LiteralValue
+
+from erpnext_lebanese.api import (
+	_normalise_language,
+	get_account_label_index,
+	is_lebanese_chart,
+	localize_account_label,
+)
+
+# Per-process cache of prepared tree query shapes, keyed by site/doctype/mode.
+# Invalidated on migrate through a schema version token stored in Redis.
+_QUERY_SHAPES: dict[tuple, tuple] = {}
+SCHEMA_VERSION_KEY = "erpnext_lebanese_tree_schema_version"
 
 
 @frappe.whitelist()
-def get_children(doctype, parent, company, is_root=False, include_disabled=False):
+def get_children(doctype, parent, company, is_root=False, include_disabled=False, depth=None, language=None):
 	"""
 	Drop-in replacement for erpnext.accounts.utils.get_children that avoids raw SQL expressions
 	in filters (unsupported by the current frappe.qb query engine).
+
+	Pass `depth` (or "all") to receive a nested subtree below `parent` in one query;
+	each expandable node within the depth then carries its own `children` list.
+
+	Pass `language` (en/ar/fr) to have every Account node of a Lebanese company carry its
+	localized `label` and `english` fallback.
 	"""
 	if isinstance(include_disabled, str):
 		include_disabled = frappe.parse_json(include_disabled)
 	if isinstance(is_root, str):
 		is_root = frappe.parse_json(is_root)
 
+	depth = _parse_depth(depth)
+	if not is_root and depth != 1:
+		records = _get_subtree_records(doctype, parent, bool(include_disabled), depth)
+		_apply_account_labels(doctype, records, company, language)
+		return _nest_subtree(doctype, records, parent, depth)
+
+	shape = _get_query_shape(doctype, bool(is_root), bool(include_disabled))
+	query = shape["query"]
+	doc = shape["table"]
+	parent_field = shape["parent_field"]
+
+	if is_root:
+		if shape["has_company"] and company:
+			query = query.where(doc.company == company)
+	else:
+		query = query.where(parent_field == parent)
+
+	# Rows arrive in final order (see _account_order_terms), so nothing is re-sorted here. They are
+	# still materialized: _apply_account_labels rewrites them in place before they are returned.
+	records = query.run(as_dict=True)
+
+	_apply_account_labels(doctype, records, company, language)
+	return records
+
+
+@frappe.whitelist()
+def get_all_nodes(doctype, label, parent, tree_method, **filters):
+	"""
+	Override of frappe.desk.treeview.get_all_nodes ("Expand All"). Account trees served by
+	get_children are answered from one lft/rgt range query instead of one query per node.
+	"""
+	from frappe.desk.treeview import get_all_nodes as frappe_get_all_nodes
+
+	method = frappe.get_attr(tree_method)
+	if doctype != "Account" or method is not get_children or frappe.parse_json(filters.get("is_root") or 0):
+		return frappe_get_all_nodes(doctype, label, parent, tree_method, **filters)
+
+	if method not in frappe.whitelisted:
+		frappe.throw(_("Not Permitted"), frappe.PermissionError)
+
+	records = _get_subtree_records(
+		doctype, parent, bool(frappe.parse_json(filters.get("include_disabled") or 0))
+	)
+	_apply_account_labels(doctype, records, filters.get("company"), filters.get("language"))
+	by_parent = _group_by_parent(doctype, records)
+
+	# Breadth-first so every parent is rendered before its children
+	out = [{"parent": label, "data": by_parent.get(parent, [])}]
+	for entry in out:
+		for node in entry["data"]:
+			if node.expandable and node.value in by_parent:
+				out.append({"parent": node.value, "data": by_parent[node.value]})
+	return out
+
+
+@frappe.whitelist()
+def get_account_balances(accounts, company, currency=None, date=None):
+	"""
+	Override of erpnext.accounts.utils.get_account_balances. Balances for every node of an
+	expanded level are aggregated over each node's lft/rgt range in one grouped GL Entry query,
+	with the same rules as get_balance_on (P&L accounts from the current fiscal year start).
+	Pass `currency` (e.g. USD or LBP) to also receive balances converted at `date`'s rate;
+	without a rate `converted_balance` is None and `conversion_rate_missing` is set.
+	"""
+	from erpnext.accounts.utils import get_fiscal_year
+	from erpnext.setup.utils import get_exchange_rate
+
+	frappe.has_permission("GL Entry", "read", throw=True)
+
+	if isinstance(accounts, str):
+		accounts = frappe.parse_json(accounts)
+	if not accounts:
+		return []
+
+	date = getdate(date or nowdate())
+	company_currency = frappe.get_cached_value("Company", company, "default_currency")
+
+	try:
+		fy_start = get_fiscal_year(date, company=company)[1]
+	except Exception:
+		fy_start = None
+
+	balances = _get_range_balances([d["value"] for d in accounts], company, date, fy_start)
+
+	conversion_rate = None
+	if currency and currency != company_currency:
+		conversion_rate = flt(get_exchange_rate(company_currency, currency, date)) or None
+
+	for account in accounts:
+		row = balances.get(account["value"]) or {}
+		account["company_currency"] = company_currency
+		account["balance"] = flt(row.get("balance"))
+		if account.get("account_currency") and account["account_currency"] != company_currency:
+			account["balance_in_account_currency"] = flt(row.get("balance_in_account_currency"))
+		if currency:
+			account["converted_currency"] = currency
+			if currency == company_currency:
+				account["converted_balance"] = account["balance"]
+			elif conversion_rate:
+				account["converted_balance"] = flt(account["balance"] * conversion_rate)
+			else:
+				# No rate on `date`: a 0 would read as a real balance
+				account["converted_balance"] = None
+				account["conversion_rate_missing"] = 1
+
+	return accounts
+
+
+def _get_range_balances(account_names, company, date, fy_start):
+	"""Sum GL Entry over each account's lft/rgt range, grouped by account, in a single query."""
+	account = DocType("Account")
+	leaf = DocType("Account").as_("leaf")
+	gle = DocType("GL Entry")
+
+	def amount(debit, credit):
+		if not fy_start:
+			return debit - credit
+		# Profit and Loss balances only run from the current fiscal year start
+		return (
+			Case()
+			.when((account.report_type == "Profit and Loss") & (gle.posting_date < fy_start), 0)
+			.else_(debit - credit)
+		)
+
+	rows = (
+		frappe.qb.from_(account)
+		.join(leaf)
+		.on((leaf.lft >= account.lft) & (leaf.rgt <= account.rgt))
+		.join(gle)
+		.on(gle.account == leaf.name)
+		.select(
+			account.name,
+			Sum(amount(gle.debit, gle.credit)).as_("balance"),
+			Sum(amount(gle.debit_in_account_currency, gle.credit_in_account_currency)).as_(
+				"balance_in_account_currency"
+			),
+		)
+		.where(account.name.isin(account_names))
+		.where(gle.company == company)
+		.where(gle.is_cancelled == 0)
+		.where(gle.posting_date <= date)
+		.groupby(account.name)
+	).run(as_dict=True)
+
+	return {row.name: row for row in rows}
+
+
+def _apply_account_labels(doctype, records, company, language):
+	"""Inline localized labels from the cached chart label index into Account tree rows."""
+	if doctype != "Account" or not language or not company or not records:
+		return
+
+	chart_of_accounts = frappe.get_cached_value("Company", company, "chart_of_accounts")
+	if not is_lebanese_chart(chart_of_accounts):
+		return
+
+	lang_code = _normalise_language(language)
+	number_to_labels = get_account_label_index(chart_of_accounts)
+
+	for record in records:
+		account = frappe._dict(
+			name=record.value, account_number=record.account_number, account_name=record.account_name
+		)
+		record.update(localize_account_label(account, number_to_labels, lang_code))
+
+
+def _parse_depth(depth):
+	"""Return the requested depth: 1 for a single level, None for the whole subtree."""
+	if depth in (None, ""):
+		return 1
+	if isinstance(depth, str) and depth.lower() == "all":
+		return None
+
+	depth = cint(depth)
+	return None if depth < 0 else max(depth, 1)
+
+
+def _get_subtree_records(doctype, parent, include_disabled, depth=None):
+	"""
+	Fetch the nodes below `parent`: the whole lft/rgt range in a single query, or with a
+	`depth`, one query per level so deeper nodes are never read.
+	"""
+	shape = _get_query_shape(doctype, False, include_disabled)
+
+	if depth is not None:
+		records = []
+		parents = [parent]
+		for _level in range(depth):
+			if not parents:
+				break
+			level = shape["query"].where(shape["parent_field"].isin(parents)).run(as_dict=True)
+			records.extend(level)
+			parents = [record.value for record in level if record.expandable]
+		return records
+
+	doc = shape["table"]
+	ancestor = DocType(doctype).as_("ancestor")
+
+	query = (
+		shape["query"]
+		.join(ancestor)
+		.on((doc.lft > ancestor.lft) & (doc.rgt < ancestor.rgt))
+		.where(ancestor.name == parent)
+	)
+	return query.run(as_dict=True)
+
+
+def _group_by_parent(doctype, records):
+	# Records are already ordered by the query, grouping keeps that order per parent
+	by_parent = defaultdict(list)
+	for record in records:
+		by_parent[record.parent].append(record)
+
+	return by_parent
+
+
+def _nest_subtree(doctype, records, parent, depth):
+	by_parent = _group_by_parent(doctype, records)
+
+	def attach(node, level):
+		children = by_parent.get(node, [])
+		for child in children:
+			if child.expandable and (depth is None or level < depth):
+				child["children"] = attach(child.value, level + 1)
+		return children
+
+	return attach(parent, 1)
+
+
+def _get_query_shape(doctype, is_root, include_disabled):
+	"""Return the prepared query for a tree level, without the parent/company condition."""
+	version = frappe.cache().get_value(SCHEMA_VERSION_KEY)
+	key = (frappe.local.site, doctype, is_root, include_disabled)
+
+	cached = _QUERY_SHAPES.get(key)
+	if cached and cached[0] == version:
+		return cached[1]
+
+	shape = _build_query_shape(doctype, is_root, include_disabled)
+	_QUERY_SHAPES[key] = (version, shape)
+	return shape
+
+
+def _build_query_shape(doctype, is_root, include_disabled):
 	parent_fieldname = f"parent_{frappe.scrub(doctype)}"
 	doc = DocType(doctype)
 	parent_field = getattr(doc, parent_fieldname)
@@ -22,7 +289,7 @@ def get_children(doctype, parent, company, is_root=False, include_disabled=False
 
 	# Additional fields required for Account tree view, mirroring upstream behaviour
 	if doctype == "Account":
-		select_fields.append(doc.root_type)
+		select_fields.extend([doc.root_type, doc.account_number, doc.account_name])
 
 	query = frappe.qb.from_(doc).select(*select_fields)
 
@@ -39,20 +306,56 @@ def get_children(doctype, parent, company, is_root=False, include_disabled=False
 
 		if doctype == "Account":
 			query = query.select(doc.report_type, doc.account_currency)
-
-		if frappe.db.has_column(doctype, "company") and company:
-			query = query.where(doc.company == company)
 	else:
-		query = query.where(parent_field == parent)
 		query = query.select(parent_field.as_("parent"))
 
 		if doctype == "Account":
 			query = query.select(doc.account_currency)
 
-	records = query.run(as_dict=True)
-
 	if doctype == "Account":
-		sort_accounts(records, is_root, key="value")
+		query = query.orderby(*_account_order_terms(doctype, is_root))
+
+	return {
+		"query": query,
+		"table": doc,
+		"parent_field": parent_field,
+		"has_company": frappe.db.has_column(doctype, "company"),
+	}
+
+
+def _account_order_terms(doctype, is_root):
+	"""
+	SQL equivalent of erpnext's sort_accounts(records, is_root, key="value"): numbered accounts
+	sort by name, non-numbered roots by Asset, Liability, Equity, Income, Expense. The name is
+	compared with a binary collation so the order matches Python string comparison.
+	"""
+	if frappe.db.db_type == "postgres":
+		name = f'"tab{doctype}"."name"'
+		binary_name = LiteralValue(f'{name} COLLATE "C"')
+		numbered = LiteralValue(f"{name} ~ '^[0-9]+([^0-9A-Za-z_]|$)'")
+	else:
+		name = f"`tab{doctype}`.`name`"
+		binary_name = LiteralValue(f"{name} COLLATE utf8mb4_bin")
+		numbered = LiteralValue(f"{name} REGEXP '^[0-9]+([^0-9A-Za-z_]|$)'")
+
+	if not is_root:
+		return [binary_name]
+
+	doc = DocType(doctype)
+	root_rank = (
+		Case()
+		.when(numbered, 0)
+		.when(doc.root_type == "Asset", 1)
+		.when(doc.root_type == "Liability", 2)
+		.when(doc.root_type == "Equity", 3)
+		.when(doc.root_type == "Income", 4)
+		.when(doc.root_type == "Expense", 5)
+		.else_(6)
+	)
+	return [root_rank, binary_name]
 
-	return records
 
+def clear_tree_query_cache():
+	"""Drop prepared tree queries in every worker; runs after migrate."""
+	_QUERY_SHAPES.clear()
+	frappe.cache().set_value(SCHEMA_VERSION_KEY, frappe.generate_hash(length=10))
@@ -0,0 +1,5 @@
+from erpnext_lebanese.account_corrections import apply_account_corrections
+
+
+def execute():
+	apply_account_corrections(commit=False)
@@ -0,0 +1,244 @@
+"""
+Incremental per-account, per-month balances for the Lebanese account hierarchy.
+
+`Lebanese Period Balance` holds the debit and credit posted in a month for every
+account, group accounts included. Before a transaction that submitted GL Entries
+commits, the net change of each account and month it touched (GL Entry minus the
+account's row, see summary_tables) is added to the account and to every ancestor
+along the lft/rgt hierarchy in one multi-row upsert. A trial balance or balance sheet at any level of the tree then
+reads precomputed rows from one indexed table instead of aggregating GL Entry
+and rolling the hierarchy up in Python.
+"""
+
+import frappe
+from frappe.query_builder import Case, DocType
+from frappe.query_builder.functions import Extract, Sum
+from frappe.utils import flt, get_first_day, get_last_day, getdate
+
+from erpnext_lebanese.summary_tables import (
+	get_summary_name,
+	lock_company,
+	refresh_before_commit,
+	upsert_increments,
+)
+
+BALANCE_DOCTYPE = "Lebanese Period Balance"
+ANCESTORS_CACHE_KEY = "lebanese_account_ancestors"
+INCREMENT_FIELDS = ["debit", "credit", "balance"]
+
+
+def update_period_balance(doc, method=None):
+	"""GL Entry on_submit: bring the entry's account and month up to date before the transaction commits."""
+	if doc.account in get_account_ancestors(doc.company):
+		refresh_before_commit(
+			refresh_account_period, doc.company, doc.account, get_first_day(getdate(doc.posting_date))
+		)
+
+
+def refresh_account_period(company: str, account: str, period) -> None:
+	"""Add the difference between the account's month in GL Entry and in its row to it and its ancestors."""
+	# Before both reads, see lock_company
+	lock_company(company)
+	ancestors = get_account_ancestors(company).get(account)
+	if not ancestors:
+		return
+
+	gle = DocType("GL Entry")
+	ledger = (
+		frappe.qb.from_(gle)
+		.select(Sum(gle.debit).as_("debit"), Sum(gle.credit).as_("credit"))
+		.where(gle.company == company)
+		.where(gle.account == account)
+		.where(gle.is_cancelled == 0)
+		.where(gle.posting_date[period : get_last_day(period)])
+	).run(as_dict=True)[0]
+	current = (
+		frappe.db.get_value(
+			BALANCE_DOCTYPE, get_summary_name(account, period), ["debit", "credit"], as_dict=True
+		)
+		or {}
+	)
+
+	debit = flt(ledger.debit) - flt(current.get("debit"))
+	credit = flt(ledger.credit) - flt(current.get("credit"))
+	if flt(debit, 9) or flt(credit, 9):
+		upsert_increments(
+			BALANCE_DOCTYPE,
+			[_balance_row(company, ancestor, period, debit, credit) for ancestor in ancestors],
+			INCREMENT_FIELDS,
+		)
+
+
+def get_period_balances(
+	company: str, from_date, to_date, accounts: list[str] | None = None
+) -> dict[str, dict]:
+	"""Return opening, debit, credit and closing per account (group accounts rolled up) in one read.
+
+	Balance sheet accounts carry every period before `from_date` into the opening. Profit and
+	Loss accounts, as in get_balance_on, only carry the months since the start of the fiscal
+	year of `from_date` (opening) and of `to_date` (closing).
+	"""
+	from_period = get_first_day(getdate(from_date))
+	to_period = get_first_day(getdate(to_date))
+	balance = DocType(BALANCE_DOCTYPE)
+	account = DocType("Account")
+
+	in_range = balance.period >= from_period
+	profit_and_loss = account.report_type == "Profit and Loss"
+	opening_excluded = in_range
+	closing_excluded = None
+
+	from_year_start = _get_year_start(company, from_date)
+	if from_year_start:
+		opening_excluded = in_range | (profit_and_loss & (balance.period < from_year_start))
+	to_year_start = _get_year_start(company, to_date)
+	if to_year_start:
+		closing_excluded = profit_and_loss & (balance.period < to_year_start)
+
+	closing = balance.balance
+	if closing_excluded is not None:
+		closing = Case().when(closing_excluded, 0).else_(balance.balance)
+
+	query = (
+		frappe.qb.from_(balance)
+		.join(account)
+		.on(account.name == balance.account)
+		.select(
+			balance.account,
+			Sum(Case().when(opening_excluded, 0).else_(balance.balance)).as_("opening"),
+			Sum(Case().when(in_range, balance.debit).else_(0)).as_("debit"),
+			Sum(Case().when(in_range, balance.credit).else_(0)).as_("credit"),
+			Sum(closing).as_("closing"),
+		)
+		.where(balance.company == company)
+		.where(balance.period <= to_period)
+		.groupby(balance.account)
+	)
+	if accounts:
+		query = query.where(balance.account.isin(accounts))
+
+	return {row.account: row for row in query.run(as_dict=True)}
+
+
+def get_account_ancestors(company: str) -> dict[str, list[str]]:
+	"""Return {account: [account, parent, ..., root]} for the company, cached in Redis."""
+	ancestors = frappe.cache().hget(ANCESTORS_CACHE_KEY, company)
+	if ancestors is None:
+		ancestors = _load_account_ancestors(company)
+		frappe.cache().hset(ANCESTORS_CACHE_KEY, company, ancestors)
+	return ancestors
+
+
+def on_account_change(doc, method=None, *args, **kwargs):
+	"""Account doc event: drop cached ancestors, and rebuild the roll-ups when an account moved.
+
+	Renames (merges included) rebuild too: balance rows are named after the account name, so
+	the renamed account would otherwise take its whole ledger as new on its next posting.
+	"""
+	if not doc.company:
+		return
+
+	frappe.cache().hdel(ANCESTORS_CACHE_KEY, doc.company)
+	moved = method == "on_update" and not doc.flags.in_insert and doc.has_value_changed("parent_account")
+	if moved or method == "after_rename":
+		frappe.enqueue(
+			rebuild_period_balances,
+			queue="long",
+			company=doc.company,
+			enqueue_after_commit=True,
+			job_id=f"lebanese_period_balances::{doc.company}",
+			deduplicate=True,
+		)
+
+
+def rebuild_period_balances(company: str | None = None, commit: bool = True) -> int:
+	"""Recompute the balances of `company` (or every company) from GL Entry; returns rows written."""
+	companies = [company] if company else frappe.get_all("Company", pluck="name")
+	written = 0
+
+	for company_name in companies:
+		# Postings of this company wait until the rebuilt balances are committed
+		lock_company(company_name, exclusive=True)
+		frappe.db.delete(BALANCE_DOCTYPE, {"company": company_name})
+		ancestors = _load_account_ancestors(company_name)
+		frappe.cache().hset(ANCESTORS_CACHE_KEY, company_name, ancestors)
+
+		gle = DocType("GL Entry")
+		year = Extract("year", gle.posting_date)
+		month = Extract("month", gle.posting_date)
+		movements = (
+			frappe.qb.from_(gle)
+			.select(
+				gle.account,
+				year.as_("year"),
+				month.as_("month"),
+				Sum(gle.debit).as_("debit"),
+				Sum(gle.credit).as_("credit"),
+			)
+			.where(gle.company == company_name)
+			.where(gle.is_cancelled == 0)
+			.groupby(gle.account, year, month)
+		).run(as_dict=True)
+
+		rows = []
+		for movement in movements:
+			period = getdate(f"{int(movement.year)}-{int(movement.month):02d}-01")
+			for account in ancestors.get(movement.account) or []:
+				rows.append(_balance_row(company_name, account, period, movement.debit, movement.credit))
+
+		# upsert_increments merges the rows that roll up into the same account and month
+		upsert_increments(BALANCE_DOCTYPE, rows, INCREMENT_FIELDS)
+		written += len({row["name"] for row in rows})
+
+		if commit:
+			frappe.db.commit()
+
+	return written
+
+
+def _get_year_start(company, date):
+	"""First month of the fiscal year holding `date`, or None without a fiscal year."""
+	from erpnext.accounts.utils import get_fiscal_year
+
+	try:
+		return get_first_day(get_fiscal_year(date, company=company)[1])
+	except Exception:
+		return None
+
+
+def _load_account_ancestors(company):
+	account = DocType("Account")
+	ancestor = DocType("Account").as_("ancestor")
+
+	rows = (
+		frappe.qb.from_(account)
+		.join(ancestor)
+		.on(
+			(ancestor.company == account.company)
+			& (ancestor.lft <= account.lft)
+			& (ancestor.rgt >= account.rgt)
+		)
+		.select(account.name, ancestor.name.as_("ancestor"))
+		.where(account.company == company)
+		# Nearest ancestor (the account itself) first
+		.orderby(account.name)
+		.orderby(ancestor.lft, order=frappe.qb.desc)
+	).run(as_dict=True)
+
+	ancestors: dict[str, list[str]] = {}
+	for row in rows:
+		ancestors.setdefault(row.name, []).append(row.ancestor)
+	return ancestors
+
+
+def _balance_row(company, account, period, debit, credit):
+	debit, credit = flt(debit), flt(credit)
+	return {
+		"name": get_summary_name(account, period),
+		"company": company,
+		"account": account,
+		"period": period,
+		"debit": debit,
+		"credit": credit,
+		"balance": debit - credit,
+	}
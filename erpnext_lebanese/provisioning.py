@@ -0,0 +1,243 @@
+"""
+Provisioning timeline for Lebanese companies.
+
+Each provisioning run records per-step durations, query counts and outcome in a
+`Lebanese Provisioning Log` so slow or failing company setups can be diagnosed.
+Timelines with a `progress_event` also publish every step start and finish over
+realtime, which the setup wizard uses to stream its progress.
+"""
+
+import time
+from contextlib import contextmanager
+
+import frappe
+from frappe.utils import now_datetime
+
+LOG_DOCTYPE = "Lebanese Provisioning Log"
+
+
+class QueryCounter:
+	"""Count the SQL statements issued through `frappe.db.sql` while active."""
+
+	def __init__(self):
+		self.queries: list[str] = []
+
+	@property
+	def count(self) -> int:
+		return len(self.queries)
+
+	def __enter__(self):
+		db = frappe.db
+		self._db = db
+		self._previous = vars(db).get("sql")
+		original_sql = db.sql
+
+		def counted_sql(query, *args, **kwargs):
+			self.queries.append(str(query))
+			return original_sql(query, *args, **kwargs)
+
+		db.sql = counted_sql
+		return self
+
+	def __exit__(self, exc_type, exc, tb):
+		if self._previous is None:
+			vars(self._db).pop("sql", None)
+		else:
+			self._db.sql = self._previous
+		return False
+
+
+class ProvisioningTimeline:
+	def __init__(self, company: str, progress_event: str | None = None):
+		self.company = company
+		self.progress_event = progress_event
+		self.steps: list[dict] = []
+		self._running: list[dict] = []
+		self.started_at = now_datetime()
+		self._start = time.perf_counter()
+
+	@property
+	def failed(self) -> bool:
+		return any(step["status"] == "Failed" for step in self.steps)
+
+	@contextmanager
+	def step(self, name: str):
+		parent = self._running[-1] if self._running else None
+		entry = {
+			"step": name,
+			"parent_step": parent["step"] if parent else None,
+			"depth": len(self._running),
+			"status": "Running",
+			"duration": 0.0,
+			"queries": 0,
+			"error": None,
+		}
+		start = time.perf_counter()
+		counter = QueryCounter()
+
+		# Appended on start so nested steps are listed after the step that contains them.
+		# A step's duration and queries include those of its nested steps.
+		self.steps.append(entry)
+		self._running.append(entry)
+		self._publish(entry)
+
+		try:
+			with counter:
+				yield entry
+			entry["status"] = "Success"
+		except Exception as exc:
+			entry["status"] = "Failed"
+			entry["error"] = str(exc)[:500]
+			raise
+		finally:
+			self._running.pop()
+			entry["duration"] = round(time.perf_counter() - start, 4)
+			entry["queries"] = counter.count
+			self._publish(entry)
+
+	def _publish(self, entry: dict) -> None:
+		if not self.progress_event:
+			return
+
+		frappe.publish_realtime(
+			self.progress_event,
+			{"company": self.company, "elapsed": round(time.perf_counter() - self._start, 4), **entry},
+			user=frappe.session.user,
+		)
+
+	def as_dict(self) -> dict:
+		return {
+			"company": self.company,
+			"status": "Failed" if self.failed else "Success",
+			"started_at": self.started_at,
+			"total_duration": round(time.perf_counter() - self._start, 4),
+			# Top-level steps only, nested steps are already counted in their parent
+			"total_queries": sum(step["queries"] for step in self.steps if not step["depth"]),
+			"steps": [dict(step) for step in self.steps],
+		}
+
+	def save(self, error: str | None = None) -> None:
+		"""Persist the run. Failed runs are re-inserted if the transaction rolls back."""
+		payload = self.as_dict()
+		if error:
+			payload["status"] = "Failed"
+			payload["error"] = error
+
+		try:
+			_insert_log(payload)
+		except Exception:
+			frappe.log_error(frappe.get_traceback(), "Lebanese Provisioning Log")
+			return
+
+		if payload["status"] == "Failed":
+			frappe.db.after_rollback.add(lambda: _insert_log(payload, commit=True))
+
+
+def _insert_log(payload: dict, commit: bool = False) -> None:
+	doc = frappe.get_doc({"doctype": LOG_DOCTYPE, **payload})
+	doc.flags.ignore_permissions = True
+	# The company may not exist when the run that was meant to create it failed
+	doc.flags.ignore_links = True
+	doc.insert()
+	if commit:
+		frappe.db.commit()
+
+
+def start_timeline(company: str, progress_event: str | None = None) -> ProvisioningTimeline | None:
+	"""Start a timeline for `company` unless one is already running in this request."""
+	if get_current_timeline():
+		return None
+
+	timeline = ProvisioningTimeline(company, progress_event=progress_event)
+	frappe.local.lebanese_provisioning_timeline = timeline
+	return timeline
+
+
+def finish_timeline(timeline: ProvisioningTimeline | None, error: str | None = None) -> None:
+	if not timeline:
+		return
+
+	frappe.local.lebanese_provisioning_timeline = None
+	timeline.save(error=error)
+
+
+def get_current_timeline() -> ProvisioningTimeline | None:
+	return getattr(frappe.local, "lebanese_provisioning_timeline", None)
+
+
+@contextmanager
+def provisioning_step(name: str):
+	"""Record `name` on the running timeline; a no-op when no timeline is active."""
+	timeline = get_current_timeline()
+	if not timeline:
+		yield None
+		return
+
+	with timeline.step(name) as entry:
+		yield entry
+
+
+@frappe.whitelist()
+def get_provisioning_step_report(company=None, from_date=None, to_date=None):
+	"""Aggregate p50/p95 duration and query counts per provisioning step across runs.
+
+	Steps are grouped by name and parent step, so a nested step is never mixed with a top-level one.
+	"""
+	frappe.has_permission(LOG_DOCTYPE, "read", throw=True)
+
+	log = frappe.qb.DocType(LOG_DOCTYPE)
+	step = frappe.qb.DocType("Lebanese Provisioning Step")
+
+	query = (
+		frappe.qb.from_(step)
+		.join(log)
+		.on(step.parent == log.name)
+		.select(step.step, step.parent_step, step.depth, step.status, step.duration, step.queries)
+		.where(step.parenttype == LOG_DOCTYPE)
+	)
+	if company:
+		query = query.where(log.company == company)
+	if from_date:
+		query = query.where(log.started_at >= from_date)
+	if to_date:
+		query = query.where(log.started_at <= to_date)
+
+	grouped: dict[tuple, dict] = {}
+	for row in query.run(as_dict=True):
+		bucket = grouped.setdefault(
+			(row.step, row.parent_step or None),
+			{"depth": row.depth or 0, "durations": [], "queries": [], "failures": 0},
+		)
+		bucket["durations"].append(row.duration or 0.0)
+		bucket["queries"].append(row.queries or 0)
+		if row.status == "Failed":
+			bucket["failures"] += 1
+
+	report = []
+	for (step_name, parent_step), bucket in grouped.items():
+		durations = sorted(bucket["durations"])
+		report.append(
+			{
+				"step": step_name,
+				"parent_step": parent_step,
+				"depth": bucket["depth"],
+				"runs": len(durations),
+				"failures": bucket["failures"],
+				"p50": _percentile(durations, 50),
+				"p95": _percentile(durations, 95),
+				"max": durations[-1],
+				"avg_queries": round(sum(bucket["queries"]) / len(bucket["queries"]), 1),
+			}
+		)
+
+	report.sort(key=lambda d: d["p95"], reverse=True)
+	return report
+
+
+def _percentile(sorted_values: list[float], percentile: float) -> float:
+	"""Nearest-rank percentile of an already sorted list."""
+	if not sorted_values:
+		return 0.0
+
+	rank = max(1, -(-len(sorted_values) * percentile // 100))
+	return round(sorted_values[int(rank) - 1], 4)
@@ -47,15 +47,22 @@ console.log("[erpnext_lebanese] account_tree.js loading...");
 		initializeLanguage(treeview);
 	};
 
-	// Override on_get_node to handle RTL for balance areas
+	// Override on_get_node to track localized labels and handle RTL for balance areas
 	settings.on_get_node = function (nodes, deep = false) {
 		if (originalOnGetNode) {
 			originalOnGetNode(nodes, deep);
 		}
 		
-		// Apply RTL to balance areas after they're created
 		const treeview = frappe.treeview_settings?.Account?.treeview;
 		if (treeview) {
+			// Labels are inlined by get_children only for Lebanese companies
+			const rows = deep ? (nodes || []).flatMap((d) => d.data || []) : nodes || [];
+			if (rows.length) {
+				treeview.__lebanese_enabled = rows.some((row) => row.label);
+				updateLanguageSelector(treeview, treeview.__lebanese_enabled);
+			}
+
+			// Apply RTL to balance areas after they're created
 			const currentLang = treeview.__lebanese_language || "en";
 			if (currentLang === "ar") {
 				setTimeout(() => {
@@ -68,26 +75,10 @@ console.log("[erpnext_lebanese] account_tree.js loading...");
 
 	settings.get_label = function (node) {
 		const treeview = frappe.treeview_settings?.Account?.treeview;
-		const labels = treeview?.__lebanese_labels;
-
-		const docname = node?.data?.value;
-		const info = docname ? labels?.[docname] : null;
+		const info = node?.data;
 
 		if (treeview && info && info.label) {
-			const currentLang = treeview.__lebanese_language || "en";
-			const labelText = info.label;
-			const english = info.english || "";
-			const showHint =
-				treeview.__lebanese_enabled &&
-				currentLang !== "en" &&
-				english &&
-				english !== labelText;
-
-			if (settings._lebanese_state?.debug) {
-				console.log("[erpnext_lebanese] get_label", docname, treeview.__lebanese_language, labelText);
-			}
-
-			return frappe.utils.escape_html(labelText);
+			return frappe.utils.escape_html(info.label);
 		}
 
 		if (originalGetLabel) {
@@ -102,13 +93,6 @@ console.log("[erpnext_lebanese] account_tree.js loading...");
 		return frappe.utils.escape_html(title || label || "");
 	};
 
-	function getState() {
-		if (!settings._lebanese_state) {
-			settings._lebanese_state = { cache: {}, debug: true };
-		}
-		return settings._lebanese_state;
-	}
-
 	function setupLanguageSelector(treeview) {
 		console.log("[erpnext_lebanese] Setting up language selector.");
 		if (treeview.page.account_language_select) {
@@ -121,24 +105,24 @@ console.log("[erpnext_lebanese] account_tree.js loading...");
 
 		const defaultLang = resolveDefaultLanguage();
 		select.val(defaultLang);
+		setTreeLanguage(treeview, defaultLang);
 
 		select.on("change", () => {
 			const lang = select.val() || "en";
-			treeview.__lebanese_language = lang;
+			setTreeLanguage(treeview, lang);
 			applyRTLDirection(treeview, lang);
-			fetchLabels(treeview, lang, { force: true });
+			refreshTree(treeview);
 		});
+	}
 
-		const companyField = treeview.page.fields_dict?.company;
-		if (companyField && !companyField.$input.data("lebanese-language-bound")) {
-			companyField.$input.data("lebanese-language-bound", true);
-			companyField.$input.on("change", () => {
-				const lang = select.val() || "en";
-				const state = getState();
-				state.cache = {};
-				fetchLabels(treeview, lang, { force: true });
-			});
+	// get_children inlines localized labels for the language passed in the tree args
+	function setTreeLanguage(treeview, lang) {
+		treeview.args = treeview.args || {};
+		treeview.args.language = lang;
+		if (treeview.tree?.args) {
+			treeview.tree.args.language = lang;
 		}
+		treeview.__lebanese_language = lang;
 	}
 
 	function resolveDefaultLanguage() {
@@ -153,59 +137,15 @@ console.log("[erpnext_lebanese] account_tree.js loading...");
 		if (!select) return;
 
 		const lang = select.val() || resolveDefaultLanguage();
-		treeview.__lebanese_language = lang;
-		applyRTLDirection(treeview, lang);
-		fetchLabels(treeview, lang);
-	}
-
-	function fetchLabels(treeview, lang, opts = {}) {
-		console.log("[erpnext_lebanese] Fetching labels for language:", lang);
-		const state = getState();
-
-		const companyField = treeview.page.fields_dict?.company;
-		const company = companyField ? companyField.get_value() : null;
-		if (!company) {
-			return;
-		}
-
-		const cacheKey = `${company}::${lang}`;
-		if (!opts.force && state.cache[cacheKey]) {
-			const payload = state.cache[cacheKey];
-			applyLanguagePayload(treeview, payload, lang);
-			return;
-		}
-
-		frappe.call({
-			method: "erpnext_lebanese.api.get_account_language_labels",
-			args: { company, language: lang },
-		}).then((r) => {
-			const payload = r.message || { enabled: false, labels: {} };
-			state.cache[cacheKey] = payload;
-			applyLanguagePayload(treeview, payload, lang);
-		});
-	}
-
-	function applyLanguagePayload(treeview, payload, lang) {
-		console.log("[erpnext_lebanese] Applying language payload:", payload.enabled, lang);
-		treeview.__lebanese_labels = payload.labels || {};
-		treeview.__lebanese_enabled = Boolean(payload.enabled);
-		treeview.__lebanese_language = lang || payload.language || "en";
-
-		const shared = frappe.treeview_settings?.Account?.treeview;
-		if (shared && shared !== treeview) {
-			shared.__lebanese_labels = treeview.__lebanese_labels;
-			shared.__lebanese_enabled = treeview.__lebanese_enabled;
-			shared.__lebanese_language = treeview.__lebanese_language;
-		}
-
+		const reload = treeview.tree?.args?.language !== lang;
+		setTreeLanguage(treeview, lang);
 		if (treeview.tree) {
 			treeview.tree.get_label = (node) => settings.get_label(node);
-			// Apply RTL for Arabic
-			applyRTLDirection(treeview, lang || payload.language || "en");
 		}
-
-		updateLanguageSelector(treeview, payload.enabled);
-		refreshTree(treeview);
+		applyRTLDirection(treeview, lang);
+		if (reload) {
+			refreshTree(treeview);
+		}
 	}
 
 	function applyRTLDirection(treeview, lang) {
@@ -28,6 +28,13 @@ frappe.provide("erpnext.setup");
 				reqd: 1,
 			},
 			{ fieldtype: "Section Break", label: __("Account Settings") },
+			{
+				fieldname: "company_type",
+				label: __("Company Type"),
+				options: "",
+				fieldtype: "Select",
+				description: __("Selects the chart of accounts for this legal type"),
+			},
 			{
 				fieldname: "chart_of_accounts",
 				label: __("Chart of Accounts"),
@@ -63,6 +70,7 @@ frappe.provide("erpnext.setup");
 				frappe.wizard.values.country = "Lebanon";
 			}
 
+			this.load_company_types(this);
 			this.load_chart_of_accounts(this);
 			this.set_fy_dates(this);
 		},
@@ -120,6 +128,17 @@ frappe.provide("erpnext.setup");
 			}
 		},
 
+		load_company_types(slide) {
+			frappe.call({
+				method: "erpnext_lebanese.utils.get_company_types",
+				callback(r) {
+					if (r.message) {
+						slide.get_input("company_type").empty().add_options(["", ...r.message]);
+					}
+				},
+			});
+		},
+
 		load_chart_of_accounts(slide) {
 			const country = "Lebanon";
 			frappe.wizard.values.country = country;
@@ -150,6 +169,23 @@ frappe.provide("erpnext.setup");
 				slide.form.fields_dict.fy_end_date.set_value(year_end_date);
 			});
 
+			slide.get_input("company_type").on("change", function () {
+				const company_type = slide.get_field("company_type").get_value();
+				if (!company_type) {
+					return;
+				}
+
+				frappe.call({
+					method: "erpnext_lebanese.overrides.chart_of_accounts_override.get_chart_for_company_type",
+					args: { company_type },
+					callback(r) {
+						if (r.message) {
+							slide.get_field("chart_of_accounts").set_value(r.message);
+						}
+					},
+				});
+			});
+
 			slide.get_input("view_coa").on("click", function () {
 				const chart_template = slide.form.fields_dict.chart_of_accounts.get_value();
 				if (!chart_template) {
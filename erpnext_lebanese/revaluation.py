@@ -0,0 +1,227 @@
+"""
+Month-end unrealized exchange revaluation for Lebanese companies.
+
+Open USD receivable and payable balances are loaded per account and party with
+one grouped GL Entry query that also computes each balance's revalued LBP amount
+and difference at the new rate, so no per-invoice work happens in Python. The
+differences are posted in one consolidated "Exchange Gain Or Loss" Journal Entry
+per company: to the unrealized exchange gain/loss account (476) for balances
+still open in USD, and to the exchange gain/loss account (6751) for balances
+settled in USD that still carry an LBP residue.
+"""
+
+import frappe
+from frappe import _
+from frappe.query_builder import DocType
+from frappe.query_builder.functions import Sum
+from frappe.utils import add_days, flt, getdate, nowdate
+
+from erpnext_lebanese.account_corrections import get_lebanese_companies
+from erpnext_lebanese.exchange_rates import _validate_rate_type, get_rate
+
+REVALUED_CURRENCY = "USD"
+# Untranslated so that earlier revaluations of a date can be found again
+REVALUATION_REMARK = "Lebanese unrealized exchange revaluation"
+REVALUED_ACCOUNT_TYPES = ("Receivable", "Payable")
+
+# Company default field -> Lebanese account number used when the default is not set
+GAIN_LOSS_ACCOUNTS = {
+	"unrealized": ("unrealized_exchange_gain_loss_account", "476"),
+	"realized": ("exchange_gain_loss_account", "6751"),
+}
+
+
+def revalue_company(
+	company: str, posting_date=None, rate_type: str | None = None, submit: bool = False, reverse: bool = True
+) -> dict:
+	"""Create the revaluation Journal Entry of `company` at `rate_type`'s rate on `posting_date`.
+
+	A draft revaluation of the same company and date is replaced, a submitted one is left alone.
+	With `submit` and `reverse`, the unrealized part is reversed on the next day so the next
+	period is revalued from the original balances; realized residues stay booked.
+	"""
+	posting_date = getdate(posting_date or nowdate())
+	rate_type = _validate_rate_type(rate_type)
+	company_currency = frappe.get_cached_value("Company", company, "default_currency")
+
+	existing = _get_existing_revaluations(company, posting_date)
+	submitted = [row.name for row in existing if row.docstatus == 1]
+	if submitted:
+		return {"company": company, "rate": None, "balances": 0, "journal_entry": submitted[0], "skipped": 1}
+	for row in existing:
+		frappe.delete_doc("Journal Entry", row.name)
+
+	rate = get_rate(rate_type, posting_date, REVALUED_CURRENCY, company_currency)
+	if not rate:
+		frappe.throw(
+			_("No {0} {1}/{2} rate on or before {3}").format(
+				rate_type, REVALUED_CURRENCY, company_currency, posting_date
+			)
+		)
+
+	precision = frappe.get_precision("Journal Entry Account", "debit") or 2
+	balances = [
+		row for row in get_open_balances(company, posting_date, rate) if flt(row.difference, precision)
+	]
+	summary = {"company": company, "rate": rate, "balances": len(balances), "journal_entry": None}
+	if not balances:
+		return summary
+
+	journal_entry = _make_journal_entry(company, posting_date, rate, balances, precision)
+	journal_entry.insert()
+	if submit:
+		journal_entry.submit()
+		if reverse:
+			summary["reversal"] = _reverse(
+				journal_entry.name, company, add_days(posting_date, 1), rate, balances, precision
+			)
+
+	summary["journal_entry"] = journal_entry.name
+	summary["difference"] = flt(sum(row.difference for row in balances), precision)
+	return summary
+
+
+def revalue_lebanese_companies(
+	posting_date=None, rate_type: str | None = None, submit: bool = False, reverse: bool = True
+) -> list:
+	"""Revalue every Lebanese company; a company that fails is reported with its `error`."""
+	results = []
+	for company in get_lebanese_companies():
+		frappe.db.savepoint("lebanese_revaluation")
+		try:
+			results.append(revalue_company(company, posting_date, rate_type, submit, reverse))
+		except Exception as exc:
+			frappe.db.rollback(save_point="lebanese_revaluation")
+			frappe.clear_messages()
+			results.append({"company": company, "error": str(exc)})
+	return results
+
+
+def get_open_balances(company: str, posting_date, rate: float) -> list[dict]:
+	"""Return USD receivable/payable balances per account and party with their revaluation difference."""
+	gle = DocType("GL Entry")
+	account = DocType("Account")
+
+	balance = Sum(gle.debit - gle.credit)
+	balance_in_account_currency = Sum(gle.debit_in_account_currency - gle.credit_in_account_currency)
+
+	return (
+		frappe.qb.from_(gle)
+		.join(account)
+		.on(gle.account == account.name)
+		.select(
+			gle.account,
+			gle.party_type,
+			gle.party,
+			balance.as_("balance"),
+			balance_in_account_currency.as_("balance_in_account_currency"),
+			(balance_in_account_currency * rate - balance).as_("difference"),
+		)
+		.where(gle.company == company)
+		.where(gle.is_cancelled == 0)
+		.where(gle.posting_date <= posting_date)
+		.where(account.account_currency == REVALUED_CURRENCY)
+		.where(account.account_type.isin(REVALUED_ACCOUNT_TYPES))
+		# Receivable/payable rows without a party cannot be adjusted per party
+		.where(gle.party.isnotnull() & (gle.party != ""))
+		.groupby(gle.account, gle.party_type, gle.party)
+		.having((balance != 0) | (balance_in_account_currency != 0))
+	).run(as_dict=True)
+
+
+def _get_existing_revaluations(company, posting_date):
+	return frappe.get_all(
+		"Journal Entry",
+		filters={
+			"company": company,
+			"posting_date": posting_date,
+			"voucher_type": "Exchange Gain Or Loss",
+			"user_remark": ("like", f"{REVALUATION_REMARK}%"),
+			"docstatus": ("<", 2),
+		},
+		fields=["name", "docstatus"],
+	)
+
+
+def _reverse(journal_entry, company, posting_date, rate, balances, precision):
+	unrealized = [
+		frappe._dict(row, difference=-flt(row.difference))
+		for row in balances
+		if flt(row.balance_in_account_currency, precision)
+	]
+	if not unrealized:
+		return None
+
+	reversal = _make_journal_entry(company, posting_date, rate, unrealized, precision)
+	# Not prefixed with REVALUATION_REMARK, so a revaluation on the next day is not mistaken for done
+	reversal.user_remark = _("Reversal of unrealized exchange revaluation {0}").format(journal_entry)
+	reversal.insert()
+	reversal.submit()
+	return reversal.name
+
+
+def _make_journal_entry(company, posting_date, rate, balances, precision):
+	gain_loss_accounts = {
+		kind: _get_gain_loss_account(company, *source) for kind, source in GAIN_LOSS_ACCOUNTS.items()
+	}
+	totals = dict.fromkeys(GAIN_LOSS_ACCOUNTS, 0.0)
+
+	rows = []
+	for row in balances:
+		difference = flt(row.difference, precision)
+		kind = "unrealized" if flt(row.balance_in_account_currency, precision) else "realized"
+		totals[kind] += difference
+		rows.append(
+			{
+				"account": row.account,
+				"party_type": row.party_type,
+				"party": row.party,
+				"account_currency": REVALUED_CURRENCY,
+				"exchange_rate": rate,
+				"debit_in_account_currency": 0,
+				"credit_in_account_currency": 0,
+				"debit": max(difference, 0),
+				"credit": max(-difference, 0),
+			}
+		)
+
+	cost_center = frappe.get_cached_value("Company", company, "cost_center")
+	for kind, total in totals.items():
+		total = flt(total, precision)
+		if not total:
+			continue
+		# A higher LBP value of the open balances is a gain, credited to the gain/loss account
+		rows.append(
+			{
+				"account": gain_loss_accounts[kind],
+				"cost_center": cost_center,
+				"exchange_rate": 1,
+				"debit_in_account_currency": max(-total, 0),
+				"credit_in_account_currency": max(total, 0),
+				"debit": max(-total, 0),
+				"credit": max(total, 0),
+			}
+		)
+
+	return frappe.get_doc(
+		{
+			"doctype": "Journal Entry",
+			"voucher_type": "Exchange Gain Or Loss",
+			"company": company,
+			"posting_date": posting_date,
+			"multi_currency": 1,
+			"user_remark": f"{REVALUATION_REMARK}: "
+			+ _("open {0} balances at {1}").format(REVALUED_CURRENCY, rate),
+			"accounts": rows,
+		}
+	)
+
+
+def _get_gain_loss_account(company, fieldname, account_number):
+	account = frappe.get_cached_value("Company", company, fieldname) or frappe.db.get_value(
+		"Account", {"company": company, "account_number": account_number, "is_group": 0}, "name"
+	)
+	if not account:
+		label = _(frappe.unscrub(fieldname))
+		frappe.throw(_("Set {0} for {1} or create account {2}").format(label, company, account_number))
+	return account
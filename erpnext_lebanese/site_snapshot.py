@@ -0,0 +1,183 @@
+"""
+Post-wizard snapshots for bootstrapping short-lived Lebanese sites.
+
+`capture_site_snapshot` dumps a finished site's setup fixtures, its template
+company with the chart, cost centers, warehouses, tax templates and fiscal year,
+and the settings singles into one gzipped JSON file. `restore_site_snapshot`
+loads it into a fresh site with one bulk INSERT per table, re-keying the company
+name and abbreviation on the way, instead of running the setup wizard again.
+Tree tables are renumbered afterwards, as the fresh site may already have rows.
+"""
+
+import gzip
+import json
+
+import frappe
+from frappe import _
+from frappe.utils import now
+from frappe.utils.nestedset import rebuild_tree
+
+from erpnext_lebanese.lebanese_fixtures import TREES
+
+SNAPSHOT_VERSION = 1
+
+# Setup fixtures, copied table by table
+FIXTURE_DOCTYPES = [
+	"UOM",
+	*TREES,
+	"Price List",
+	"Mode of Payment",
+	"Stock Entry Type",
+	"Warehouse Type",
+	"Address Template",
+]
+
+# Company and everything provisioned for it; the template site holds only this company,
+# so whole tables (with their lft/rgt) are copied
+COMPANY_DOCTYPES = [
+	"Company",
+	"Account",
+	"Cost Center",
+	"Warehouse",
+	"Sales Taxes and Charges Template",
+	"Sales Taxes and Charges",
+	"Purchase Taxes and Charges Template",
+	"Purchase Taxes and Charges",
+	"Mode of Payment Account",
+	"Fiscal Year",
+	"Fiscal Year Company",
+]
+
+SETTINGS_DOCTYPES = [
+	"System Settings",
+	"Global Defaults",
+	"Accounts Settings",
+	"Selling Settings",
+	"Buying Settings",
+	"Stock Settings",
+]
+
+# Site wide defaults written by the wizard (default company, currency, fiscal year, ...)
+DEFAULT_PARENTS = ("__default", "__global")
+
+
+def capture_site_snapshot(path: str) -> dict[str, int]:
+	"""Write a snapshot of the site's only company and setup records to `path`; returns row counts."""
+	companies = frappe.get_all("Company", fields=["name", "abbr"])
+	if len(companies) != 1:
+		frappe.throw(
+			_("A snapshot needs a template site with exactly one company, found {0}").format(len(companies))
+		)
+
+	tables = {}
+	for doctype in FIXTURE_DOCTYPES + COMPANY_DOCTYPES:
+		if frappe.db.table_exists(doctype):
+			tables[doctype] = frappe.get_all(doctype, fields=["*"], order_by="creation asc")
+
+	tables["DefaultValue"] = frappe.get_all(
+		"DefaultValue", filters={"parent": ("in", DEFAULT_PARENTS)}, fields=["*"]
+	)
+
+	snapshot = {
+		"version": SNAPSHOT_VERSION,
+		"company": companies[0].name,
+		"abbr": companies[0].abbr,
+		"tables": tables,
+		"singles": {doctype: frappe.db.get_singles_dict(doctype) for doctype in SETTINGS_DOCTYPES},
+	}
+
+	with gzip.open(path, "wt", encoding="utf-8") as handle:
+		handle.write(frappe.as_json(snapshot, indent=None))
+
+	return {doctype: len(rows) for doctype, rows in tables.items()}
+
+
+def restore_site_snapshot(
+	path: str, company: str | None = None, abbr: str | None = None, commit: bool = True
+) -> dict[str, int]:
+	"""Load a snapshot into a site without companies, renaming its company to `company`/`abbr`."""
+	if frappe.db.exists("Company"):
+		frappe.throw(_("Snapshots can only be restored on a site without companies"))
+
+	with gzip.open(path, "rt", encoding="utf-8") as handle:
+		snapshot = json.load(handle)
+
+	if snapshot.get("version") != SNAPSHOT_VERSION:
+		frappe.throw(_("Unsupported snapshot version {0}").format(snapshot.get("version")))
+
+	rekey = _get_rekey(snapshot["company"], snapshot["abbr"], company, abbr)
+	restored = {}
+
+	# The wizard defaults replace whatever the fresh site had for the same keys
+	defaults = snapshot["tables"].get("DefaultValue") or []
+	if defaults:
+		frappe.db.delete(
+			"DefaultValue",
+			{"parent": ("in", DEFAULT_PARENTS), "defkey": ("in", list({row["defkey"] for row in defaults}))},
+		)
+
+	for doctype, rows in snapshot["tables"].items():
+		if not rows or not frappe.db.table_exists(doctype):
+			continue
+		fields = list(rows[0])
+		frappe.db.bulk_insert(
+			doctype,
+			fields,
+			[tuple(rekey(field, row.get(field)) for field in fields) for row in rows],
+			ignore_duplicates=True,
+		)
+		restored[doctype] = len(rows)
+
+	for doctype, values in snapshot["singles"].items():
+		values = {
+			field: rekey(field, value) for field, value in values.items() if field not in ("name", "doctype")
+		}
+		if values:
+			frappe.db.set_single_value(doctype, values)
+
+	# Copied lft/rgt only fit the template site; renumber against the rows this site already had
+	for doctype in restored:
+		if frappe.db.has_column(doctype, "lft"):
+			rebuild_tree(doctype)
+
+	_mark_setup_complete()
+	frappe.clear_cache()
+
+	if commit:
+		frappe.db.commit()
+
+	return restored
+
+
+def _get_rekey(old_company, old_abbr, new_company, new_abbr):
+	"""Return a function mapping values of the template company to the new company."""
+	new_company = new_company or old_company
+	new_abbr = new_abbr or old_abbr
+	if (new_company, new_abbr) == (old_company, old_abbr):
+		return lambda field, value: value
+
+	old_suffix = f" - {old_abbr}"
+	new_suffix = f" - {new_abbr}"
+
+	def rekey(field, value):
+		if not isinstance(value, str):
+			return value
+		if value == old_company:
+			return new_company
+		if field == "abbr" and value == old_abbr:
+			return new_abbr
+		if value.endswith(old_suffix):
+			return value[: -len(old_suffix)] + new_suffix
+		return value
+
+	return rekey
+
+
+def _mark_setup_complete():
+	# Frappe v15 tracks the wizard per app, older versions in System Settings
+	if frappe.db.has_column("Installed Application", "is_setup_complete"):
+		installed = frappe.qb.DocType("Installed Application")
+		frappe.qb.update(installed).set(installed.is_setup_complete, 1).set(installed.modified, now()).where(
+			installed.app_name.isin(["frappe", "erpnext"])
+		).run()
+	frappe.db.set_single_value("System Settings", "setup_complete", 1)
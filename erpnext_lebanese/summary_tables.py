@@ -0,0 +1,114 @@
+"""
+Helpers for the materialized summary tables fed by GL Entry postings.
+
+Summary rows have deterministic names (a hash of their key), so concurrent
+postings meet on the same row and each increment is a single upsert instead of
+a read followed by a write.
+
+GL Entry postings do not add their own amounts. They mark the summary keys they touch,
+and just before the transaction commits each key is brought up to date with the net
+change of the ledger in this transaction: what GL Entry now holds for it minus what the
+summary row holds. That includes GL Entries that ERPNext's reposting deleted with raw
+SQL and posted again, so reposted vouchers are not counted twice. Rebuilds take an
+exclusive lock on the company row and postings take a shared one, so the two never
+interleave. The two reads of a posting must see the same commits: MariaDB's REPEATABLE
+READ serves them from one snapshot, while under Postgres' READ COMMITTED the postings of
+a company take the exclusive lock as well and run one after the other.
+"""
+
+import hashlib
+
+import frappe
+from frappe.utils import flt, now
+
+UPSERT_CHUNK_SIZE = 500
+
+
+def get_summary_name(*key) -> str:
+	return hashlib.sha1("|".join(str(part) for part in key).encode()).hexdigest()[:20]
+
+
+def upsert_increments(doctype: str, rows: list[dict], increment_fields: list[str]) -> None:
+	"""Insert `rows` (each with a `name`), or add their `increment_fields` to the rows that exist."""
+	rows = _merge_by_name(rows, increment_fields)
+	if not rows:
+		return
+
+	timestamp = now()
+	user = frappe.session.user
+	data_fields = [field for field in rows[0] if field != "name"]
+	fields = ["name", "owner", "modified_by", "creation", "modified", "docstatus", "idx", *data_fields]
+
+	postgres = frappe.db.db_type == "postgres"
+	quote = '"' if postgres else "`"
+	table = f"{quote}tab{doctype}{quote}"
+	columns = ", ".join(f"{quote}{field}{quote}" for field in fields)
+	placeholder = "(" + ", ".join(["%s"] * len(fields)) + ")"
+
+	if postgres:
+		updates = [f'"{field}" = {table}."{field}" + excluded."{field}"' for field in increment_fields]
+		conflict = "on conflict (name) do update set " + ", ".join(
+			[*updates, '"modified" = excluded."modified"']
+		)
+	else:
+		updates = [f"`{field}` = `{field}` + values(`{field}`)" for field in increment_fields]
+		conflict = "on duplicate key update " + ", ".join([*updates, "`modified` = values(`modified`)"])
+
+	for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+		chunk = rows[start : start + UPSERT_CHUNK_SIZE]
+		params = []
+		for row in chunk:
+			params.extend([row["name"], user, user, timestamp, timestamp, 0, 0])
+			params.extend(row[field] for field in data_fields)
+
+		frappe.db.sql(
+			f"insert into {table} ({columns}) values {', '.join([placeholder] * len(chunk))} {conflict}",
+			tuple(params),
+		)
+
+
+def _merge_by_name(rows, increment_fields):
+	# One statement may not touch the same row twice (Postgres refuses it)
+	merged: dict[str, dict] = {}
+	for row in rows:
+		existing = merged.get(row["name"])
+		if existing is None:
+			merged[row["name"]] = dict(row)
+			continue
+		for field in increment_fields:
+			existing[field] = flt(existing[field]) + flt(row[field])
+	return list(merged.values())
+
+
+def refresh_before_commit(refresh, *key) -> None:
+	"""Call `refresh(*key)` once just before the current transaction commits, however often it is asked."""
+	pending = getattr(frappe.local, "lebanese_summary_refreshes", None)
+	if pending is None:
+		pending = frappe.local.lebanese_summary_refreshes = {}
+		frappe.db.before_commit.add(flush_summary_refreshes)
+		frappe.db.after_rollback.add(_drop_pending_refreshes)
+	pending[(refresh, *key)] = None
+
+
+def lock_company(company: str, exclusive: bool = False) -> None:
+	"""Lock the company row until the transaction ends: shared for postings, exclusive for rebuilds.
+
+	On Postgres every statement sees the latest commits, so a posting committed between the ledger
+	and the summary read of another would be counted twice; postings lock exclusively there.
+	"""
+	postgres = frappe.db.db_type == "postgres"
+	mode = "for update" if exclusive or postgres else "lock in share mode"
+	table = '"tabCompany"' if postgres else "`tabCompany`"
+	frappe.db.sql(f"select name from {table} where name = %s {mode}", (company,))
+
+
+def flush_summary_refreshes() -> None:
+	"""Run the pending refreshes now; they otherwise run just before the transaction commits."""
+	pending = getattr(frappe.local, "lebanese_summary_refreshes", None)
+	frappe.local.lebanese_summary_refreshes = None
+	for refresh, *key in pending or ():
+		refresh(*key)
+
+
+def _drop_pending_refreshes():
+	frappe.local.lebanese_summary_refreshes = None
@@ -0,0 +1,185 @@
+import json
+import os
+from pathlib import Path
+
+import frappe
+from frappe.utils import cstr
+
+TAX_DATA_CACHE_KEY = "lebanese_tax_template_data"
+
+TEMPLATE_DOCTYPES = {
+	"sales_tax_templates": "Sales Taxes and Charges Template",
+	"purchase_tax_templates": "Purchase Taxes and Charges Template",
+}
+
+TAX_ROW_DEFAULTS = {
+	"charge_type": "On Net Total",
+	"included_in_print_rate": 0,
+	"included_in_paid_amount": 0,
+}
+
+
+def get_tax_template_definitions(chart_of_accounts: str | None = None, country: str = "Lebanon") -> dict:
+	"""Return the template definitions from `labonon_tax_data.json` for a chart.
+
+	Chart specific entries win over the `*` wildcard entry.
+	"""
+	charts = (_get_cached_tax_data().get(country) or {}).get("chart_of_accounts") or {}
+	return charts.get(chart_of_accounts or "") or charts.get("*") or {}
+
+
+def create_lebanese_tax_templates(company: str, cost_center: str | None = None) -> list[str]:
+	"""Create every missing Sales/Purchase Taxes and Charges Template for a Lebanese company.
+
+	All referenced account numbers are resolved in a single query and the
+	templates are inserted in one pass with a single commit at the end.
+	"""
+	if not company:
+		return []
+
+	company_row = frappe.db.get_value(
+		"Company", company, ["country", "chart_of_accounts", "default_currency"], as_dict=True
+	)
+	if not company_row:
+		return []
+
+	definitions = get_tax_template_definitions(
+		company_row.chart_of_accounts, company_row.country or "Lebanon"
+	)
+	pending = _get_missing_templates(company, definitions)
+	if not pending:
+		return []
+
+	account_numbers = {
+		cstr(tax.get("account_number")).strip()
+		for _doctype, template in pending
+		for tax in template.get("taxes") or []
+	}
+	accounts = _get_accounts_by_number(company, account_numbers)
+
+	if not cost_center:
+		from erpnext_lebanese.default_accounts import _get_primary_cost_center
+
+		cost_center = _get_primary_cost_center(company)
+
+	if not cost_center:
+		frappe.log_error(
+			f"Cost center not found for company {company}. Cannot create tax templates.",
+			"Lebanese Tax Template Creation",
+		)
+		return []
+
+	created = []
+	for doctype, template in pending:
+		taxes = _build_tax_rows(company, template, accounts, cost_center, company_row.default_currency)
+		if taxes is None:
+			continue
+
+		try:
+			doc = frappe.get_doc(
+				{
+					"doctype": doctype,
+					"title": template["title"],
+					"company": company,
+					"is_default": template.get("is_default", 0),
+					"taxes": taxes,
+				}
+			)
+			doc.flags.ignore_permissions = True
+			doc.flags.ignore_mandatory = True
+			doc.insert()
+			created.append(doc.name)
+		except Exception:
+			frappe.log_error(
+				f"Error creating {doctype} '{template['title']}' for company {company}\n{frappe.get_traceback()}",
+				"Lebanese Tax Template Creation",
+			)
+
+	if created:
+		frappe.db.commit()
+
+	return created
+
+
+def _get_missing_templates(company: str, definitions: dict) -> list[tuple[str, dict]]:
+	pending = []
+
+	for key, doctype in TEMPLATE_DOCTYPES.items():
+		templates = [t for t in definitions.get(key) or [] if t.get("title")]
+		if not templates:
+			continue
+
+		existing = set(
+			frappe.get_all(
+				doctype,
+				filters={"company": company, "title": ["in", [t["title"] for t in templates]]},
+				pluck="title",
+			)
+		)
+		pending.extend((doctype, t) for t in templates if t["title"] not in existing)
+
+	return pending
+
+
+def _get_accounts_by_number(company: str, account_numbers: set[str]) -> dict[str, frappe._dict]:
+	account_numbers.discard("")
+	if not account_numbers:
+		return {}
+
+	rows = frappe.get_all(
+		"Account",
+		filters={"company": company, "account_number": ["in", list(account_numbers)]},
+		fields=["name", "account_number", "account_currency"],
+	)
+	return {row.account_number: row for row in rows}
+
+
+def _build_tax_rows(
+	company: str, template: dict, accounts: dict, cost_center: str, company_currency: str | None
+) -> list[dict] | None:
+	rows = []
+
+	for tax in template.get("taxes") or []:
+		account_number = cstr(tax.get("account_number")).strip()
+		account = accounts.get(account_number)
+		if not account:
+			frappe.log_error(
+				f"Account {account_number} not found for company {company}. "
+				f"Cannot create tax template '{template['title']}'.",
+				"Lebanese Tax Template Creation",
+			)
+			return None
+
+		row = {**TAX_ROW_DEFAULTS, **tax}
+		row.pop("account_number", None)
+		row.update(
+			{
+				"account_head": account.name,
+				"cost_center": cost_center,
+				"account_currency": account.account_currency or company_currency or "LBP",
+			}
+		)
+		rows.append(row)
+
+	return rows
+
+
+def _get_cached_tax_data() -> dict:
+	"""Return the parsed tax data, reloaded whenever the JSON file changes on disk."""
+	data_path = _get_tax_data_path()
+	version = str(os.path.getmtime(data_path))
+
+	cache = frappe.cache()
+	cached = cache.get_value(TAX_DATA_CACHE_KEY)
+	if cached and cached.get("version") == version:
+		return cached["data"]
+
+	with data_path.open(encoding="utf-8") as handle:
+		data = json.load(handle)
+
+	cache.set_value(TAX_DATA_CACHE_KEY, {"version": version, "data": data})
+	return data
+
+
+def _get_tax_data_path() -> Path:
+	return Path(frappe.get_app_path("erpnext_lebanese")).resolve() / "data" / "labonon_tax_data.json"
@@ -0,0 +1,152 @@
+"""
+Set-wise teardown of Lebanese companies.
+
+`frappe.delete_doc("Company", ...)` cascades document by document over hundreds
+of accounts, templates, cost centers and warehouses. This module removes every
+row owned by a Lebanese company with one DELETE per table and closes the
+nested-set gaps left behind with one UPDATE per tree.
+"""
+
+import frappe
+from frappe import _
+
+from erpnext_lebanese.account_search import INDEX_VERSION_KEY
+from erpnext_lebanese.period_balances import ANCESTORS_CACHE_KEY
+from erpnext_lebanese.vat_summary import VAT_ACCOUNTS_CACHE_KEY
+
+# Parent doctypes owned by a company, with the child tables to clear first
+COMPANY_PARENT_DOCTYPES = {
+	"Sales Taxes and Charges Template": ["Sales Taxes and Charges"],
+	"Purchase Taxes and Charges Template": ["Purchase Taxes and Charges"],
+	"Item Tax Template": ["Item Tax Template Detail"],
+	"Budget": ["Budget Account"],
+	"Lebanese Provisioning Log": ["Lebanese Provisioning Step"],
+	"Lebanese VAT Summary": [],
+	"Lebanese Period Balance": [],
+}
+
+# Child rows that reference the company directly
+COMPANY_CHILD_DOCTYPES = ["Party Account", "Mode of Payment Account", "Item Default", "Fiscal Year Company"]
+
+# Tree doctypes whose company rows are removed as whole subtrees
+NESTED_SET_DOCTYPES = ["Account", "Cost Center", "Warehouse", "Department"]
+
+LEDGER_DOCTYPES = ["GL Entry", "Stock Ledger Entry"]
+
+
+def delete_lebanese_company(company: str, commit: bool = True) -> dict[str, int]:
+	"""Delete a Lebanese company and everything it owns, returning deleted row counts per doctype.
+
+	Companies with posted GL or stock ledger entries are refused.
+	"""
+	company_row = frappe.db.get_value(
+		"Company", company, ["name", "country", "chart_of_accounts"], as_dict=True
+	)
+	if not company_row:
+		return {}
+
+	if not is_lebanese_company(company_row):
+		frappe.throw(_("{0} is not a Lebanese company").format(company))
+
+	if frappe.db.exists("Company", {"parent_company": company}):
+		frappe.throw(_("Cannot tear down {0}: it has subsidiary companies").format(company))
+
+	for doctype in LEDGER_DOCTYPES:
+		if frappe.db.exists(doctype, {"company": company}):
+			frappe.throw(_("Cannot tear down {0}: it has {1} records").format(company, _(doctype)))
+
+	deleted: dict[str, int] = {}
+
+	for parent_doctype, child_doctypes in COMPANY_PARENT_DOCTYPES.items():
+		if not frappe.db.table_exists(parent_doctype):
+			continue
+
+		parent = frappe.qb.DocType(parent_doctype)
+		owned = frappe.qb.from_(parent).select(parent.name).where(parent.company == company)
+		for child_doctype in child_doctypes:
+			child = frappe.qb.DocType(child_doctype)
+			frappe.qb.from_(child).delete().where(
+				(child.parenttype == parent_doctype) & child.parent.isin(owned)
+			).run()
+
+		deleted[parent_doctype] = _delete_rows(parent_doctype, {"company": company})
+
+	for doctype in COMPANY_CHILD_DOCTYPES:
+		if frappe.db.table_exists(doctype):
+			deleted[doctype] = _delete_rows(doctype, {"company": company})
+
+	for doctype in NESTED_SET_DOCTYPES:
+		deleted[doctype] = delete_nested_set_rows(doctype, {"company": company})
+
+	frappe.defaults.clear_default("company", value=company)
+	# As Company.on_trash does, so the site default does not point at a deleted company
+	if frappe.db.get_single_value("Global Defaults", "default_company") == company:
+		frappe.db.set_single_value("Global Defaults", "default_company", None)
+	deleted["Company"] = delete_nested_set_rows("Company", {"name": company})
+	frappe.clear_document_cache("Company", company)
+	_clear_company_caches(company)
+
+	if commit:
+		frappe.db.commit()
+
+	return deleted
+
+
+def is_lebanese_company(company_row) -> bool:
+	chart = (company_row.get("chart_of_accounts") or "").lower()
+	return company_row.get("country") == "Lebanon" and "lebanese" in chart
+
+
+def delete_nested_set_rows(doctype: str, filters: dict) -> int:
+	"""Delete whole subtrees matching `filters` and close the lft/rgt gap in one UPDATE."""
+	bounds = frappe.get_all(doctype, filters=filters, fields=["lft", "rgt"], as_list=True)
+	if not bounds:
+		return 0
+
+	frappe.db.delete(doctype, filters)
+	positions = sorted(int(value) for row in bounds for value in row if value)
+	_close_nested_set_gaps(doctype, positions)
+	return len(bounds)
+
+
+def _close_nested_set_gaps(doctype: str, positions: list[int]) -> None:
+	"""Shift every remaining lft/rgt down by the number of freed positions below it."""
+	if not positions:
+		return
+
+	# Collapse freed positions into contiguous runs: [(run_end, freed_up_to_run_end), ...]
+	runs: list[tuple[int, int]] = []
+	freed = 0
+	run_end = None
+	for position in positions:
+		if run_end is not None and position != run_end + 1:
+			runs.append((run_end, freed))
+		freed += 1
+		run_end = position
+	runs.append((run_end, freed))
+
+	def shift(column: str) -> str:
+		cases = " ".join(f"when `{column}` > {end} then {count}" for end, count in reversed(runs))
+		return f"`{column}` - (case {cases} else 0 end)"
+
+	frappe.db.sql(
+		f"""update `tab{doctype}`
+		set `lft` = {shift("lft")}, `rgt` = {shift("rgt")}
+		where `rgt` > %s""",
+		(positions[0],),
+	)
+
+
+def _clear_company_caches(company: str) -> None:
+	"""The set-wise deletes skip Account doc events, so drop the caches those would have cleared."""
+	cache = frappe.cache()
+	cache.hset(INDEX_VERSION_KEY, company, frappe.generate_hash(length=10))
+	cache.hdel(VAT_ACCOUNTS_CACHE_KEY, company)
+	cache.hdel(ANCESTORS_CACHE_KEY, company)
+
+
+def _delete_rows(doctype: str, filters: dict) -> int:
+	count = frappe.db.count(doctype, filters)
+	if count:
+		frappe.db.delete(doctype, filters)
+	return count
@@ -0,0 +1,64 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import random_string
+
+from erpnext_lebanese.account_corrections import ACCOUNT_CORRECTIONS, apply_account_corrections
+from erpnext_lebanese.teardown import delete_lebanese_company
+
+
+class TestLebaneseAccountCorrections(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		suffix = random_string(5).upper()
+		cls.company = frappe.get_doc(
+			{
+				"doctype": "Company",
+				"company_name": f"Correction Test Co {suffix}",
+				"abbr": f"CT{suffix}"[:5],
+				"country": "Lebanon",
+				"default_currency": "LBP",
+			}
+		).insert()
+
+	@classmethod
+	def tearDownClass(cls):
+		delete_lebanese_company(cls.company.name)
+		super().tearDownClass()
+
+	def _subtree(self, account_number):
+		lft, rgt = frappe.db.get_value(
+			"Account", {"company": self.company.name, "account_number": account_number}, ["lft", "rgt"]
+		)
+		return frappe.get_all(
+			"Account",
+			filters={"company": self.company.name, "lft": (">=", lft), "rgt": ("<=", rgt)},
+			fields=["name", "root_type", "report_type"],
+		)
+
+	def test_dry_run_reports_what_apply_changes(self):
+		# Undo the correction made at company creation, as charts imported before it were
+		accounts = self._subtree("401")
+		frappe.db.set_value(
+			"Account",
+			{"name": ("in", [row.name for row in accounts])},
+			{"root_type": "Asset", "report_type": "Profit and Loss"},
+		)
+
+		companies = [self.company.name]
+		dry_run = apply_account_corrections(companies=companies, dry_run=True, commit=False)
+		self.assertEqual({row.root_type for row in self._subtree("401")}, {"Asset"})
+
+		applied = apply_account_corrections(companies=companies, commit=False)
+		self.assertEqual(dry_run, applied)
+		self.assertEqual(len(applied[self.company.name]), 2 * len(accounts))
+
+		expected = ACCOUNT_CORRECTIONS["401"]
+		for row in self._subtree("401"):
+			self.assertEqual(
+				(row.root_type, row.report_type), (expected["root_type"], expected["report_type"])
+			)
+
+		self.assertEqual(
+			apply_account_corrections(companies=companies, dry_run=True), {self.company.name: []}
+		)
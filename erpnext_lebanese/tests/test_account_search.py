@@ -0,0 +1,45 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import random_string
+
+from erpnext_lebanese.account_search import INDEX_VERSION_KEY, search_accounts
+from erpnext_lebanese.teardown import delete_lebanese_company
+
+
+class TestLebaneseAccountSearch(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		suffix = random_string(5).upper()
+		cls.company = frappe.get_doc(
+			{
+				"doctype": "Company",
+				"company_name": f"Search Test Co {suffix}",
+				"abbr": f"SE{suffix}"[:5],
+				"country": "Lebanon",
+				"default_currency": "LBP",
+			}
+		).insert()
+
+	@classmethod
+	def tearDownClass(cls):
+		delete_lebanese_company(cls.company.name)
+		super().tearDownClass()
+
+	def test_rename_invalidates_index(self):
+		account = frappe.get_all(
+			"Account",
+			filters={"company": self.company.name, "is_group": 0},
+			fields=["name", "account_name"],
+			limit=1,
+		)[0]
+		search_accounts(self.company.name, account.account_name)
+		version = frappe.cache().hget(INDEX_VERSION_KEY, self.company.name)
+
+		new_name = f"{account.name} Renamed"
+		# after_rename handlers receive (doc, method, old, new, merge)
+		frappe.rename_doc("Account", account.name, new_name, force=True)
+
+		self.assertNotEqual(frappe.cache().hget(INDEX_VERSION_KEY, self.company.name), version)
+		matches = search_accounts(self.company.name, account.account_name, limit=100)
+		self.assertIn(new_name, [match["value"] for match in matches])
@@ -0,0 +1,43 @@
+from frappe.tests.utils import FrappeTestCase
+
+from erpnext_lebanese.chart_validator import assert_valid_chart, get_chart_sources, validate_chart
+
+
+class TestLebaneseChartValidator(FrappeTestCase):
+	def test_shipped_charts_are_valid(self):
+		for chart in get_chart_sources().values():
+			assert_valid_chart(chart)
+			assert_valid_chart(chart, checks=["missing_translation"], strict=True)
+
+	def test_reports_each_check(self):
+		chart = {
+			"tree": {
+				"Assets": {
+					"root_type": "Asset",
+					"account_number": "4",
+					"arabic_name": "الموجودات",
+					"french_name": "Actifs",
+					"Suppliers": {
+						"root_type": "Liability",
+						"account_number": "40",
+						"arabic_name": "الموردون",
+						"french_name": "Fournisseurs",
+					},
+					"Partners": {"account_number": "45", "arabic_name": "الشركاء"},
+					"Misplaced": {"account_number": "51", "arabic_name": "-", "french_name": "-"},
+					"Duplicate": {"account_number": "40", "arabic_name": "-", "french_name": "-"},
+				}
+			}
+		}
+
+		checks = {(issue["check"], issue["account_number"]) for issue in validate_chart(chart)}
+		self.assertEqual(
+			checks,
+			{
+				("root_type_conflict", "40"),
+				("missing_translation", "45"),
+				("number_prefix", "51"),
+				("duplicate_number", "40"),
+			},
+		)
+		self.assertRaises(AssertionError, assert_valid_chart, chart)
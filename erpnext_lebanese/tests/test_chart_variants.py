@@ -0,0 +1,36 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from erpnext_lebanese.api import LABEL_INDEX_CACHE_KEY, get_account_label_index
+from erpnext_lebanese.chart_variants import (
+	BASE_CHART_NAME,
+	get_chart_for_company_type,
+	get_chart_store,
+	get_lebanese_chart,
+)
+
+HOLDING_CHART = "Lebanese Holding & Off-Shore Chart of Accounts"
+
+
+class TestLebaneseChartVariants(FrappeTestCase):
+	def test_company_type_selects_variant(self):
+		self.assertEqual(get_chart_for_company_type("Holding & Off-Shore"), HOLDING_CHART)
+		self.assertEqual(get_chart_for_company_type(None), BASE_CHART_NAME)
+
+	def test_labels_are_kept_per_chart(self):
+		self.assertIn("2511", get_account_label_index(HOLDING_CHART))
+		self.assertNotIn("2511", get_account_label_index(BASE_CHART_NAME))
+
+	def test_labels_of_an_older_chart_version_are_rebuilt(self):
+		frappe.cache().hset(LABEL_INDEX_CACHE_KEY, HOLDING_CHART, {"version": (), "labels": {"stale": {}}})
+
+		labels = get_account_label_index(HOLDING_CHART)
+		self.assertNotIn("stale", labels)
+		self.assertIn("2511", labels)
+
+	def test_returned_charts_do_not_share_store_nodes(self):
+		chart = get_lebanese_chart(BASE_CHART_NAME)
+		chart["tree"].clear()
+
+		self.assertTrue(get_chart_store()["charts"][BASE_CHART_NAME]["tree"])
+		self.assertTrue(get_lebanese_chart(HOLDING_CHART)["tree"])
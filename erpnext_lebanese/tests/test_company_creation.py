@@ -7,6 +7,7 @@ from frappe.utils import random_string
 from erpnext_lebanese.overrides.setup_wizard_override import (
 	setup_company as wizard_setup_company,
 )
+from erpnext_lebanese.teardown import delete_lebanese_company
 
 LEBANESE_CHART = "Lebanese Standard Chart of Accounts"
 
@@ -17,8 +18,7 @@ class TestLebaneseCompanyCreation(FrappeTestCase):
 
 	def tearDown(self):
 		for company in self.created_companies:
-			if frappe.db.exists("Company", company):
-				frappe.delete_doc("Company", company, force=1, ignore_permissions=True)
+			delete_lebanese_company(company, commit=False)
 		frappe.db.commit()
 
 	def _unique_company(self, prefix):
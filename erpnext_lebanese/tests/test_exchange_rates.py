@@ -0,0 +1,71 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate
+
+from erpnext_lebanese.exchange_rates import (
+	RATE_SERIES_KEY,
+	RATE_VERSION_KEY,
+	_get_series_key,
+	get_rate,
+	get_rates,
+)
+
+RATE_TYPE = "Market"
+
+
+class TestLebaneseExchangeRates(FrappeTestCase):
+	def setUp(self):
+		self.addCleanup(self.delete_rates)
+		self.add_rate("2105-01-01", 89500)
+		self.add_rate("2105-02-01", 90000)
+
+	def add_rate(self, date, exchange_rate):
+		frappe.get_doc(
+			{
+				"doctype": "Lebanese Exchange Rate",
+				"rate_type": RATE_TYPE,
+				"from_currency": "USD",
+				"to_currency": "LBP",
+				"date": date,
+				"exchange_rate": exchange_rate,
+			}
+		).insert()
+		# Series are invalidated after commit
+		frappe.db.commit()
+
+	def delete_rates(self):
+		for name in frappe.get_all(
+			"Lebanese Exchange Rate",
+			filters={"rate_type": RATE_TYPE, "date": (">=", "2105-01-01")},
+			pluck="name",
+		):
+			frappe.delete_doc("Lebanese Exchange Rate", name)
+		frappe.db.commit()
+
+	def test_rate_in_effect(self):
+		self.assertIsNone(get_rate(RATE_TYPE, "2104-12-31"))
+		self.assertEqual(get_rate(RATE_TYPE, "2105-01-31"), 89500)
+		self.assertEqual(get_rate(RATE_TYPE, "2105-02-01"), 90000)
+		self.assertAlmostEqual(get_rate(RATE_TYPE, "2105-01-31", "LBP", "USD"), 1 / 89500)
+
+		rates = get_rates(RATE_TYPE, "2104-12-31", "2105-02-02")
+		self.assertIsNone(rates["2104-12-31"])
+		self.assertEqual(rates["2105-01-31"], 89500)
+		self.assertEqual(rates["2105-02-02"], 90000)
+
+	def test_saving_a_rate_reloads_the_series(self):
+		self.assertEqual(get_rate(RATE_TYPE, "2105-03-01"), 90000)
+
+		self.add_rate("2105-03-01", 95000)
+		self.assertEqual(get_rate(RATE_TYPE, "2105-03-01"), 95000)
+
+	def test_series_loaded_before_an_invalidation_is_not_served(self):
+		series_key = _get_series_key(RATE_TYPE, "USD", "LBP")
+		version = frappe.cache().hget(RATE_VERSION_KEY, series_key)
+
+		self.add_rate("2105-03-01", 95000)
+		# A reader that loaded the series under the old version writes it back after the invalidation
+		stale = ([getdate("2105-01-01")], [1.0])
+		frappe.cache().hset(RATE_SERIES_KEY, series_key, {"version": version, "series": stale})
+
+		self.assertEqual(get_rate(RATE_TYPE, "2105-03-01"), 95000)
@@ -0,0 +1,75 @@
+import frappe
+from frappe.query_builder.functions import Count, Sum
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import random_string
+
+from erpnext_lebanese.gl_generator import delete_synthetic_gl_entries, generate_gl_entries
+from erpnext_lebanese.teardown import delete_lebanese_company
+
+SEED = 7
+ENTRIES = 400
+
+
+class TestLebaneseGLGenerator(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		suffix = random_string(5).upper()
+		cls.company = frappe.get_doc(
+			{
+				"doctype": "Company",
+				"company_name": f"GL Generator Co {suffix}",
+				"abbr": f"GG{suffix}"[:5],
+				"country": "Lebanon",
+				"default_currency": "LBP",
+			}
+		).insert()
+		frappe.db.commit()
+
+	@classmethod
+	def tearDownClass(cls):
+		delete_synthetic_gl_entries(cls.company.name)
+		delete_lebanese_company(cls.company.name)
+		super().tearDownClass()
+
+	def setUp(self):
+		delete_synthetic_gl_entries(self.company.name)
+
+	def get_ledger(self):
+		return frappe.get_all(
+			"GL Entry",
+			filters={"company": self.company.name},
+			fields=["name", "posting_date", "account", "party", "debit", "credit"],
+			order_by="name",
+			as_list=True,
+		)
+
+	def test_same_seed_gives_same_ledger(self):
+		generate_gl_entries(self.company.name, entries=ENTRIES, seed=SEED)
+		ledger = self.get_ledger()
+		self.assertTrue(ledger)
+
+		delete_synthetic_gl_entries(self.company.name, seed=SEED)
+		generate_gl_entries(self.company.name, entries=ENTRIES, seed=SEED)
+		self.assertEqual(self.get_ledger(), ledger)
+
+	def test_every_voucher_balances(self):
+		generate_gl_entries(self.company.name, entries=ENTRIES, seed=SEED + 1)
+
+		gle = frappe.qb.DocType("GL Entry")
+		vouchers = (
+			frappe.qb.from_(gle)
+			.select(
+				gle.voucher_no,
+				Sum(gle.debit - gle.credit).as_("difference"),
+				Count(gle.account).distinct().as_("accounts"),
+			)
+			.where(gle.company == self.company.name)
+			.groupby(gle.voucher_no)
+		).run(as_dict=True)
+
+		self.assertTrue(vouchers)
+		for voucher in vouchers:
+			self.assertEqual(voucher.difference, 0, voucher.voucher_no)
+			# Debit and credit lines never hit the same account
+			self.assertEqual(voucher.accounts, 2, voucher.voucher_no)
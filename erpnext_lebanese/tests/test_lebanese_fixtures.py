@@ -0,0 +1,60 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from erpnext_lebanese.lebanese_fixtures import (
+	LEBANON_MINIMAL_PROFILE,
+	TREES,
+	UOMS,
+	_insert_tree,
+	install_fixture_profile,
+)
+
+FRESH_TREE = [
+	("All Item Groups", "", 1),
+	("Products", "All Item Groups", 1),
+	("Phones", "Products", 0),
+	("Laptops", "Products", 0),
+	("Services", "All Item Groups", 0),
+]
+
+
+class TestLebaneseFixtures(FrappeTestCase):
+	def test_minimal_profile(self):
+		install_fixture_profile(LEBANON_MINIMAL_PROFILE, "Lebanon")
+
+		self.assertTrue(all(frappe.db.exists("UOM", uom) for uom, _whole in UOMS))
+		for doctype, (_name_field, parent_field, nodes) in TREES.items():
+			for name, parent, _is_group in nodes:
+				self.assertEqual(frappe.db.get_value(doctype, name, parent_field) or "", parent, name)
+
+		price_lists = frappe.get_all(
+			"Price List",
+			filters={"name": ("like", "Standard %")},
+			fields=["name", "buying", "selling", "currency"],
+		)
+		flags = {row.name: (row.buying, row.selling) for row in price_lists}
+		self.assertEqual(flags["Standard Buying"], (1, 0))
+		self.assertEqual(flags["Standard Selling"], (0, 1))
+
+	def test_fresh_tree_gets_nested_set_bounds(self):
+		# Empty the tree inside a savepoint to take the fresh-site bulk insert path
+		frappe.db.savepoint("fresh_item_groups")
+		self.addCleanup(frappe.db.rollback, save_point="fresh_item_groups")
+		frappe.db.delete("Item Group")
+
+		_insert_tree("Item Group", "item_group_name", "parent_item_group", FRESH_TREE)
+
+		rows = frappe.get_all("Item Group", fields=["name", "parent_item_group", "lft", "rgt"])
+		groups = {row.name: row for row in rows}
+		self.assertEqual(set(groups), {name for name, _parent, _is_group in FRESH_TREE})
+
+		positions = sorted(value for row in rows for value in (row.lft, row.rgt))
+		self.assertEqual(positions, list(range(1, 2 * len(FRESH_TREE) + 1)))
+		self.assertEqual((groups["All Item Groups"].lft, groups["All Item Groups"].rgt), (1, 10))
+		for group in groups.values():
+			parent = groups.get(group.parent_item_group)
+			if parent:
+				self.assertTrue(parent.lft < group.lft < group.rgt < parent.rgt, group.name)
+
+	def test_unknown_profile(self):
+		self.assertRaises(frappe.ValidationError, install_fixture_profile, "everything", "Lebanon")
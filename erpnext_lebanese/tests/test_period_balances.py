@@ -0,0 +1,143 @@
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import random_string
+
+from erpnext_lebanese.period_balances import (
+	BALANCE_DOCTYPE,
+	get_account_ancestors,
+	get_period_balances,
+	rebuild_period_balances,
+	update_period_balance,
+)
+from erpnext_lebanese.summary_tables import flush_summary_refreshes
+from erpnext_lebanese.teardown import delete_lebanese_company
+from erpnext_lebanese.tests.utils import make_gl_entry
+
+FISCAL_YEAR = "Lebanese Balances 2103"
+
+
+class TestLebanesePeriodBalances(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		suffix = random_string(5).upper()
+		cls.company = frappe.get_doc(
+			{
+				"doctype": "Company",
+				"company_name": f"Period Balance Co {suffix}",
+				"abbr": f"PB{suffix}"[:5],
+				"country": "Lebanon",
+				"default_currency": "LBP",
+			}
+		).insert()
+		if not frappe.db.exists("Fiscal Year", FISCAL_YEAR):
+			frappe.get_doc(
+				{
+					"doctype": "Fiscal Year",
+					"year": FISCAL_YEAR,
+					"year_start_date": "2103-01-01",
+					"year_end_date": "2103-12-31",
+				}
+			).insert()
+
+		cls.income = cls._get_leaf("Income")
+		cls.asset = cls._get_leaf("Asset")
+
+	@classmethod
+	def _get_leaf(cls, root_type):
+		return frappe.get_all(
+			"Account",
+			filters={"company": cls.company.name, "is_group": 0, "root_type": root_type},
+			fields=["name", "parent_account"],
+			limit=1,
+		)[0]
+
+	@classmethod
+	def tearDownClass(cls):
+		frappe.db.delete("GL Entry", {"company": cls.company.name})
+		frappe.delete_doc("Fiscal Year", FISCAL_YEAR, force=True)
+		delete_lebanese_company(cls.company.name)
+		super().tearDownClass()
+
+	def setUp(self):
+		frappe.db.delete("GL Entry", {"company": self.company.name})
+		frappe.db.delete(BALANCE_DOCTYPE, {"company": self.company.name})
+
+	def post(self, posting_date, amount, voucher_no=None, asset=None):
+		"""Post a sale of `amount`: debit the asset, credit the income account."""
+		extra = {"voucher_no": voucher_no} if voucher_no else {}
+		entries = [
+			make_gl_entry(self.company.name, asset or self.asset.name, posting_date, debit=amount, **extra),
+			make_gl_entry(self.company.name, self.income.name, posting_date, credit=amount, **extra),
+		]
+		for entry in entries:
+			update_period_balance(entry)
+		flush_summary_refreshes()
+		return entries[0].voucher_no
+
+	def get_balances(self, from_date="2103-03-01", to_date="2103-03-31"):
+		return get_period_balances(self.company.name, from_date, to_date)
+
+	def test_postings_roll_up_to_ancestors(self):
+		self.post("2103-03-15", 100)
+		balances = self.get_balances()
+
+		for account in get_account_ancestors(self.company.name)[self.asset.name]:
+			self.assertEqual(balances[account].debit, 100)
+			self.assertEqual(balances[account].closing, 100)
+		self.assertEqual(balances[self.income.parent_account].credit, 100)
+
+	def test_reposted_entries_are_counted_once(self):
+		voucher_no = self.post("2103-03-15", 100)
+
+		# Reposting deletes the voucher's GL Entries with raw SQL and posts them again
+		frappe.db.delete("GL Entry", {"voucher_no": voucher_no})
+		self.post("2103-03-15", 100, voucher_no=voucher_no)
+
+		balances = self.get_balances()
+		self.assertEqual(balances[self.asset.name].debit, 100)
+		self.assertEqual(balances[self.asset.parent_account].debit, 100)
+
+	def test_rebuild_matches_ledger(self):
+		self.post("2103-03-15", 100)
+		before = self.get_balances()
+		frappe.db.delete(
+			BALANCE_DOCTYPE, {"company": self.company.name, "account": self.asset.parent_account}
+		)
+
+		rebuild_period_balances(self.company.name, commit=False)
+		self.assertEqual(self.get_balances(), before)
+
+	def test_profit_and_loss_opening_resets_at_year_start(self):
+		self.post("2102-06-30", 100)
+		self.post("2103-03-31", 50)
+		balances = self.get_balances("2103-04-01", "2103-04-30")
+
+		# Balance sheet accounts carry every year; P&L accounts restart at the fiscal year
+		self.assertEqual(balances[self.asset.name].opening, 150)
+		self.assertEqual(balances[self.income.name].opening, -50)
+		self.assertEqual(balances[self.income.name].closing, -50)
+
+	def test_rename_rebuilds_balances(self):
+		self.post("2103-03-15", 100)
+
+		enqueue = patch("frappe.enqueue").start()
+		self.addCleanup(patch.stopall)
+		renamed = frappe.rename_doc("Account", self.asset.name, f"{self.asset.name} Renamed", force=True)
+		self.addCleanup(frappe.rename_doc, "Account", renamed, self.asset.name, force=True)
+
+		self.assertTrue(
+			any(
+				call.args[0] is rebuild_period_balances and call.kwargs["company"] == self.company.name
+				for call in enqueue.call_args_list
+			)
+		)
+		rebuild_period_balances(self.company.name, commit=False)
+
+		# The renamed account's month is not taken as new on its next posting
+		self.post("2103-03-20", 50, asset=renamed)
+		balances = self.get_balances()
+		self.assertEqual(balances[renamed].debit, 150)
+		self.assertEqual(balances[self.asset.parent_account].debit, 150)
@@ -0,0 +1,64 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import random_string
+
+from erpnext_lebanese.provisioning import LOG_DOCTYPE, ProvisioningTimeline, QueryCounter
+
+
+class TestLebaneseProvisioning(FrappeTestCase):
+	def setUp(self):
+		self.company = f"Timeline Test Co {random_string(5).upper()}"
+
+	def tearDown(self):
+		frappe.db.rollback()
+		for name in frappe.get_all(LOG_DOCTYPE, filters={"company": self.company}, pluck="name"):
+			frappe.delete_doc(LOG_DOCTYPE, name, force=True, ignore_permissions=True)
+		frappe.db.commit()
+
+	def test_nested_counters(self):
+		with QueryCounter() as outer:
+			frappe.db.sql("select 1")
+			with QueryCounter() as inner:
+				frappe.db.sql("select 2")
+			frappe.db.sql("select 3")
+
+		self.assertEqual(inner.count, 1)
+		self.assertEqual(outer.count, 3)
+		self.assertNotIn("sql", vars(frappe.db))
+
+	def test_counter_restores_sql_on_exception(self):
+		with self.assertRaises(ValueError):
+			with QueryCounter():
+				with QueryCounter():
+					raise ValueError("boom")
+
+		self.assertNotIn("sql", vars(frappe.db))
+
+	def test_failed_run_log_survives_rollback(self):
+		timeline = ProvisioningTimeline(self.company)
+		with self.assertRaises(ValueError):
+			with timeline.step("Chart Import"):
+				frappe.db.sql("select 1")
+				raise ValueError("boom")
+
+		timeline.save(error="boom")
+		frappe.db.rollback()
+
+		log = frappe.get_last_doc(LOG_DOCTYPE, filters={"company": self.company})
+		self.assertEqual(log.status, "Failed")
+		self.assertEqual(log.error, "boom")
+		self.assertEqual([(step.step, step.status) for step in log.steps], [("Chart Import", "Failed")])
+
+	def test_nested_steps_are_counted_once(self):
+		timeline = ProvisioningTimeline(self.company)
+		with timeline.step("Setting up company"):
+			frappe.db.sql("select 1")
+			with timeline.step("Chart Import"):
+				frappe.db.sql("select 2")
+
+		summary = timeline.as_dict()
+		steps = {step["step"]: step for step in summary["steps"]}
+		self.assertEqual(steps["Chart Import"]["parent_step"], "Setting up company")
+		self.assertEqual(steps["Chart Import"]["depth"], 1)
+		self.assertEqual(steps["Setting up company"]["queries"], 2)
+		self.assertEqual(summary["total_queries"], 2)
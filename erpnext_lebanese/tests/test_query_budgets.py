@@ -0,0 +1,96 @@
+import math
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import random_string
+
+from erpnext_lebanese.api import get_account_label_index
+from erpnext_lebanese.default_accounts import _get_primary_cost_center
+from erpnext_lebanese.overrides.company_override import set_lebanese_default_accounts
+from erpnext_lebanese.overrides.treeview_override import get_children
+from erpnext_lebanese.tax_templates import TEMPLATE_DOCTYPES, create_lebanese_tax_templates
+from erpnext_lebanese.teardown import delete_lebanese_company
+from erpnext_lebanese.tests.utils import query_budget
+
+# Baselines as (queries, seconds). A block fails once it goes above its baseline times the
+# tolerance, so a doubling is always caught; re-measure and update them when provisioning changes
+BUDGETS = {
+	"company_creation": (7500, 40),
+	"default_account_mapping": (60, 2),
+	"tax_templates": (60, 2),
+	"label_fetch": (2, 0.5),
+	"tree_expansion": (2, 1),
+}
+QUERY_TOLERANCE = 1.3
+TIME_TOLERANCE = 1.5
+
+
+def budget(name):
+	queries, seconds = BUDGETS[name]
+	return math.ceil(queries * QUERY_TOLERANCE), seconds * TIME_TOLERANCE
+
+
+class TestLebaneseQueryBudgets(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		cls.company = _make_company("Budget Test Co").insert().name
+
+	@classmethod
+	def tearDownClass(cls):
+		delete_lebanese_company(cls.company)
+		super().tearDownClass()
+
+	def test_company_creation(self):
+		company = _make_company("Budget Creation Co")
+		try:
+			with query_budget(self, *budget("company_creation"), label="Company creation"):
+				company.insert()
+		finally:
+			delete_lebanese_company(company.name)
+
+	def test_default_account_mapping(self):
+		with query_budget(self, *budget("default_account_mapping"), label="Default account mapping"):
+			set_lebanese_default_accounts(self.company)
+
+	def test_tax_template_creation(self):
+		for doctype in TEMPLATE_DOCTYPES.values():
+			for name in frappe.get_all(doctype, filters={"company": self.company}, pluck="name"):
+				frappe.delete_doc(doctype, name, force=True)
+		cost_center = _get_primary_cost_center(self.company)
+
+		with query_budget(self, *budget("tax_templates"), label="Tax template creation"):
+			created = create_lebanese_tax_templates(self.company, cost_center)
+
+		self.assertTrue(created)
+
+	def test_label_fetch(self):
+		# Warm the label index and the prepared query shapes
+		get_account_label_index(frappe.get_cached_value("Company", self.company, "chart_of_accounts"))
+		get_children("Account", self.company, self.company, is_root=True, language="ar")
+
+		with query_budget(self, *budget("label_fetch"), label="Label fetch"):
+			roots = get_children("Account", self.company, self.company, is_root=True, language="ar")
+
+		self.assertTrue(all(root.get("label") for root in roots))
+
+	def test_tree_expansion(self):
+		root = get_children("Account", self.company, self.company, is_root=True)[0]
+
+		with query_budget(self, *budget("tree_expansion"), label="Tree expansion"):
+			subtree = get_children("Account", root.value, self.company, depth="all", language="en")
+
+		self.assertTrue(subtree)
+
+
+def _make_company(prefix):
+	suffix = random_string(5).upper()
+	return frappe.get_doc(
+		{
+			"doctype": "Company",
+			"company_name": f"{prefix} {suffix}",
+			"abbr": f"{prefix[:2]}{suffix}".upper()[:5],
+			"country": "Lebanon",
+			"default_currency": "LBP",
+		}
+	)
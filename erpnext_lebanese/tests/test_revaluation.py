@@ -0,0 +1,185 @@
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate, random_string
+
+from erpnext_lebanese.revaluation import (
+	GAIN_LOSS_ACCOUNTS,
+	_get_gain_loss_account,
+	get_open_balances,
+	revalue_company,
+	revalue_lebanese_companies,
+)
+from erpnext_lebanese.teardown import delete_lebanese_company
+from erpnext_lebanese.tests.utils import make_gl_entry
+
+RATE_TYPE = "Platform"
+POSTING_DATE = getdate("2106-01-31")
+FISCAL_YEAR = "Lebanese Revaluation 2106"
+
+
+class TestLebaneseRevaluation(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		suffix = random_string(5).upper()
+		cls.company = frappe.get_doc(
+			{
+				"doctype": "Company",
+				"company_name": f"Revaluation Co {suffix}",
+				"abbr": f"RV{suffix}"[:5],
+				"country": "Lebanon",
+				"default_currency": "LBP",
+			}
+		).insert()
+		company = cls.company.name
+
+		if not frappe.db.exists("Fiscal Year", FISCAL_YEAR):
+			frappe.get_doc(
+				{
+					"doctype": "Fiscal Year",
+					"year": FISCAL_YEAR,
+					"year_start_date": "2106-01-01",
+					"year_end_date": "2106-12-31",
+				}
+			).insert()
+		frappe.get_doc(
+			{
+				"doctype": "Lebanese Exchange Rate",
+				"rate_type": RATE_TYPE,
+				"from_currency": "USD",
+				"to_currency": "LBP",
+				"date": "2106-01-01",
+				"exchange_rate": 90000,
+			}
+		).insert()
+
+		receivable_group = frappe.db.get_value(
+			"Account", {"company": company, "account_type": "Receivable", "is_group": 0}, "parent_account"
+		)
+		cls.account = (
+			frappe.get_doc(
+				{
+					"doctype": "Account",
+					"account_name": "USD Customers",
+					"parent_account": receivable_group,
+					"company": company,
+					"account_currency": "USD",
+					"account_type": "Receivable",
+				}
+			)
+			.insert()
+			.name
+		)
+		cls.open_customer, cls.settled_customer = (
+			cls._make_customer(f"Revaluation {kind} {suffix}") for kind in ("Open", "Settled")
+		)
+		cls.unrealized, cls.realized = (
+			_get_gain_loss_account(company, *GAIN_LOSS_ACCOUNTS[kind]) for kind in ("unrealized", "realized")
+		)
+
+		# 100 USD still open, booked at 89,000
+		cls._post("2106-01-10", cls.open_customer, debit=8_900_000, usd=100)
+		# 100 USD invoiced at 89,000 and paid at 89,500: settled in USD, 50,000 LBP residue
+		cls._post("2106-01-10", cls.settled_customer, debit=8_900_000, usd=100)
+		cls._post("2106-01-20", cls.settled_customer, credit=8_950_000, usd=-100)
+		# Without a party the balance cannot be revalued per party
+		cls._post("2106-01-10", None, debit=8_900_000, usd=100)
+		frappe.db.commit()
+
+	@classmethod
+	def _make_customer(cls, name):
+		customer = frappe.get_doc({"doctype": "Customer", "customer_name": name})
+		customer.flags.ignore_mandatory = True
+		return customer.insert().name
+
+	@classmethod
+	def _post(cls, posting_date, customer, debit=0, credit=0, usd=0):
+		make_gl_entry(
+			cls.company.name,
+			cls.account,
+			posting_date,
+			debit=debit,
+			credit=credit,
+			debit_in_account_currency=max(usd, 0),
+			credit_in_account_currency=max(-usd, 0),
+			account_currency="USD",
+			party_type="Customer" if customer else None,
+			party=customer,
+		)
+
+	@classmethod
+	def tearDownClass(cls):
+		frappe.db.rollback()
+		company = cls.company.name
+		for name in frappe.get_all("Journal Entry", filters={"company": company}, pluck="name"):
+			frappe.db.delete("Journal Entry Account", {"parent": name})
+			frappe.db.delete("Journal Entry", {"name": name})
+		frappe.db.delete("GL Entry", {"company": company})
+		frappe.db.delete("Lebanese Exchange Rate", {"rate_type": RATE_TYPE, "date": "2106-01-01"})
+		frappe.db.delete("Customer", {"name": ("in", [cls.open_customer, cls.settled_customer])})
+		frappe.delete_doc("Fiscal Year", FISCAL_YEAR, force=True)
+		delete_lebanese_company(company)
+		super().tearDownClass()
+
+	def setUp(self):
+		frappe.db.savepoint("revaluation")
+		self.addCleanup(frappe.db.rollback, save_point="revaluation")
+
+	def revalue(self, **kwargs):
+		return revalue_company(self.company.name, POSTING_DATE, RATE_TYPE, **kwargs)
+
+	def get_rows(self, journal_entry):
+		rows = frappe.get_doc("Journal Entry", journal_entry).accounts
+		return {(row.account, row.party or None): (row.debit, row.credit) for row in rows}
+
+	def test_open_balances_skip_rows_without_party(self):
+		balances = {row.party: row for row in get_open_balances(self.company.name, POSTING_DATE, 90000)}
+
+		self.assertEqual(set(balances), {self.open_customer, self.settled_customer})
+		# 100 USD now worth 9,000,000 LBP against 8,900,000 booked
+		self.assertEqual(balances[self.open_customer].difference, 100_000)
+		self.assertEqual(balances[self.settled_customer].difference, 50_000)
+
+	def test_gain_is_split_between_unrealized_and_realized(self):
+		summary = self.revalue()
+		rows = self.get_rows(summary["journal_entry"])
+
+		self.assertEqual(summary["difference"], 150_000)
+		# A gain debits the receivable and credits the gain/loss accounts
+		self.assertEqual(rows[(self.account, self.open_customer)], (100_000, 0))
+		self.assertEqual(rows[(self.account, self.settled_customer)], (50_000, 0))
+		self.assertEqual(rows[(self.unrealized, None)], (0, 100_000))
+		self.assertEqual(rows[(self.realized, None)], (0, 50_000))
+
+	def test_draft_is_replaced_and_submitted_run_skipped(self):
+		draft = self.revalue()["journal_entry"]
+		replaced = self.revalue(submit=True)["journal_entry"]
+
+		self.assertNotEqual(replaced, draft)
+		self.assertFalse(frappe.db.exists("Journal Entry", draft))
+
+		summary = self.revalue(submit=True)
+		self.assertEqual(summary["skipped"], 1)
+		self.assertEqual(summary["journal_entry"], replaced)
+
+	def test_reversal_covers_unrealized_rows_only(self):
+		summary = self.revalue(submit=True)
+		reversal = frappe.get_doc("Journal Entry", summary["reversal"])
+
+		self.assertEqual(getdate(reversal.posting_date), getdate("2106-02-01"))
+		self.assertEqual(reversal.docstatus, 1)
+		self.assertEqual(
+			self.get_rows(reversal.name),
+			{(self.account, self.open_customer): (0, 100_000), (self.unrealized, None): (100_000, 0)},
+		)
+
+	def test_failing_company_is_isolated(self):
+		companies = ["Missing Revaluation Co", self.company.name]
+		with patch("erpnext_lebanese.revaluation.get_lebanese_companies", return_value=companies):
+			failed, revalued = revalue_lebanese_companies(POSTING_DATE, RATE_TYPE)
+
+		self.assertEqual(failed["company"], "Missing Revaluation Co")
+		self.assertIn("error", failed)
+		self.assertTrue(frappe.db.exists("Journal Entry", revalued["journal_entry"]))
@@ -0,0 +1,103 @@
+import os
+import tempfile
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import random_string
+
+from erpnext_lebanese.site_snapshot import _get_rekey, capture_site_snapshot, restore_site_snapshot
+from erpnext_lebanese.teardown import delete_lebanese_company
+
+
+class TestLebaneseSiteSnapshot(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		suffix = random_string(5).upper()
+		cls.company = frappe.get_doc(
+			{
+				"doctype": "Company",
+				"company_name": f"Snapshot Template Co {suffix}",
+				"abbr": f"ST{suffix}"[:5],
+				"country": "Lebanon",
+				"default_currency": "LBP",
+			}
+		).insert()
+
+	@classmethod
+	def tearDownClass(cls):
+		delete_lebanese_company(cls.company.name)
+		super().tearDownClass()
+
+	def setUp(self):
+		self.path = os.path.join(tempfile.mkdtemp(), "snapshot.json.gz")
+		# Every test reshapes the site's companies; undo it afterwards
+		frappe.db.savepoint("site_snapshot")
+		self.addCleanup(frappe.db.rollback, save_point="site_snapshot")
+
+	def _keep_only_template_company(self):
+		frappe.db.delete("Company", {"name": ("!=", self.company.name)})
+
+	def test_rekey(self):
+		rekey = _get_rekey("Template Co", "TC", "Client Co", "CC")
+
+		self.assertEqual(rekey("company", "Template Co"), "Client Co")
+		self.assertEqual(rekey("abbr", "TC"), "CC")
+		self.assertEqual(rekey("name", "4111 - Customers - TC"), "4111 - Customers - CC")
+		self.assertEqual(rekey("parent_account", "41 - Customers - TC"), "41 - Customers - CC")
+		# Only the abbr field matches the bare abbreviation, other values are left alone
+		self.assertEqual(rekey("account_name", "TC"), "TC")
+		self.assertEqual(rekey("lft", 12), 12)
+
+	def test_rekey_without_changes(self):
+		rekey = _get_rekey("Template Co", "TC", None, None)
+		self.assertEqual(rekey("name", "4111 - Customers - TC"), "4111 - Customers - TC")
+
+	def test_capture_and_restore(self):
+		template = self.company
+		accounts = frappe.db.count("Account", {"company": template.name})
+		cost_centers = frappe.db.count("Cost Center", {"company": template.name})
+
+		self._keep_only_template_company()
+		capture_site_snapshot(self.path)
+		delete_lebanese_company(template.name, commit=False)
+
+		restored = restore_site_snapshot(self.path, company="Restored Co", abbr="RCO", commit=False)
+
+		self.assertIn("Account", restored)
+		self.assertEqual(frappe.db.get_value("Company", "Restored Co", "abbr"), "RCO")
+		self.assertFalse(frappe.db.exists("Account", {"company": template.name}))
+		self.assertEqual(frappe.db.count("Account", {"company": "Restored Co"}), accounts)
+		self.assertEqual(frappe.db.count("Cost Center", {"company": "Restored Co"}), cost_centers)
+
+		for doctype, parent_field in (("Account", "parent_account"), ("Cost Center", "parent_cost_center")):
+			positions = sorted(
+				value for row in frappe.get_all(doctype, fields=["lft", "rgt"], as_list=True) for value in row
+			)
+			self.assertEqual(positions, list(range(1, len(positions) + 1)), doctype)
+
+			rows = frappe.get_all(
+				doctype, filters={"company": "Restored Co"}, fields=["name", parent_field, "lft", "rgt"]
+			)
+			nodes = {row.name: row for row in rows}
+			for node in nodes.values():
+				self.assertTrue(node.name.endswith(" - RCO"), node.name)
+				parent = nodes.get(node[parent_field])
+				if parent:
+					self.assertTrue(parent.lft < node.lft < node.rgt < parent.rgt, node.name)
+
+	def test_refuses_sites_with_several_or_existing_companies(self):
+		frappe.get_doc(
+			{
+				"doctype": "Company",
+				"name": "Snapshot Extra Co",
+				"company_name": "Snapshot Extra Co",
+				"abbr": "SXC",
+				"default_currency": "LBP",
+			}
+		).db_insert()
+		self.assertRaises(frappe.ValidationError, capture_site_snapshot, self.path)
+
+		self._keep_only_template_company()
+		capture_site_snapshot(self.path)
+		self.assertRaises(frappe.ValidationError, restore_site_snapshot, self.path)
@@ -0,0 +1,78 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import random_string
+
+from erpnext_lebanese.period_balances import ANCESTORS_CACHE_KEY, get_account_ancestors
+from erpnext_lebanese.teardown import delete_lebanese_company
+from erpnext_lebanese.vat_summary import VAT_ACCOUNTS_CACHE_KEY, get_vat_accounts
+
+
+class TestLebaneseTeardown(FrappeTestCase):
+	def setUp(self):
+		self.companies = []
+
+	def tearDown(self):
+		for company in self.companies:
+			delete_lebanese_company(company, commit=False)
+		frappe.db.commit()
+
+	def _create_company(self, prefix):
+		suffix = random_string(5).upper()
+		company = frappe.get_doc(
+			{
+				"doctype": "Company",
+				"company_name": f"{prefix} {suffix}",
+				"abbr": f"{prefix[:2]}{suffix}".upper()[:5],
+				"country": "Lebanon",
+				"default_currency": "LBP",
+			}
+		).insert()
+		self.companies.append(company.name)
+		return company.name
+
+	def test_account_tree_stays_contiguous(self):
+		# The removed company sits below the kept one, so the kept tree has to shift down
+		removed = self._create_company("Teardown Removed Co")
+		kept = self._create_company("Teardown Kept Co")
+
+		delete_lebanese_company(removed)
+		self.companies.remove(removed)
+
+		self.assertFalse(frappe.db.exists("Account", {"company": removed}))
+		positions = sorted(
+			value for row in frappe.get_all("Account", fields=["lft", "rgt"], as_list=True) for value in row
+		)
+		self.assertEqual(positions, list(range(1, len(positions) + 1)))
+
+		rows = frappe.get_all(
+			"Account", filters={"company": kept}, fields=["name", "parent_account", "lft", "rgt"]
+		)
+		accounts = {row.name: row for row in rows}
+		for account in accounts.values():
+			self.assertLess(account.lft, account.rgt)
+			parent = accounts.get(account.parent_account)
+			if parent:
+				self.assertTrue(parent.lft < account.lft and account.rgt < parent.rgt, account.name)
+
+	def test_company_caches_are_cleared(self):
+		company = self._create_company("Teardown Cache Co")
+		get_vat_accounts(company)
+		get_account_ancestors(company)
+
+		delete_lebanese_company(company)
+		self.companies.remove(company)
+
+		self.assertIsNone(frappe.cache().hget(VAT_ACCOUNTS_CACHE_KEY, company))
+		self.assertIsNone(frappe.cache().hget(ANCESTORS_CACHE_KEY, company))
+
+	def test_global_default_company_is_reset(self):
+		previous = frappe.db.get_single_value("Global Defaults", "default_company")
+		self.addCleanup(frappe.db.set_single_value, "Global Defaults", "default_company", previous)
+
+		company = self._create_company("Teardown Default Co")
+		frappe.db.set_single_value("Global Defaults", "default_company", company)
+
+		delete_lebanese_company(company, commit=False)
+		self.companies.remove(company)
+
+		self.assertFalse(frappe.db.get_single_value("Global Defaults", "default_company"))
@@ -0,0 +1,70 @@
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import random_string
+
+from erpnext_lebanese.overrides.treeview_override import _get_range_balances, get_account_balances
+from erpnext_lebanese.teardown import delete_lebanese_company
+from erpnext_lebanese.tests.utils import make_gl_entry
+
+FY_START = "2101-01-01"
+
+
+class TestLebaneseTreeBalances(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		suffix = random_string(5).upper()
+		cls.company = frappe.get_doc(
+			{
+				"doctype": "Company",
+				"company_name": f"Tree Balance Co {suffix}",
+				"abbr": f"TB{suffix}"[:5],
+				"country": "Lebanon",
+				"default_currency": "LBP",
+			}
+		).insert()
+
+		cls.income = cls._get_leaf("Income")
+		cls.asset = cls._get_leaf("Asset")
+
+		# One sale in the previous fiscal year and one in the current one
+		for posting_date, amount in (("2100-06-30", 100), ("2101-03-31", 50)):
+			make_gl_entry(cls.company.name, cls.asset.name, posting_date, debit=amount)
+			make_gl_entry(cls.company.name, cls.income.name, posting_date, credit=amount)
+
+	@classmethod
+	def _get_leaf(cls, root_type):
+		return frappe.get_all(
+			"Account",
+			filters={"company": cls.company.name, "is_group": 0, "root_type": root_type},
+			fields=["name", "parent_account"],
+			limit=1,
+		)[0]
+
+	@classmethod
+	def tearDownClass(cls):
+		frappe.db.delete("GL Entry", {"company": cls.company.name})
+		delete_lebanese_company(cls.company.name)
+		super().tearDownClass()
+
+	def test_group_balances_roll_up_with_year_start_rule(self):
+		accounts = [self.income.parent_account, self.asset.parent_account, self.income.name]
+		balances = _get_range_balances(accounts, self.company.name, "2101-12-31", FY_START)
+
+		# Balance sheet accounts carry every year; P&L accounts restart at the fiscal year
+		self.assertEqual(balances[self.asset.parent_account].balance, 150)
+		self.assertEqual(balances[self.income.parent_account].balance, -50)
+		self.assertEqual(balances[self.income.name].balance, -50)
+
+		without_year_start = _get_range_balances(accounts, self.company.name, "2101-12-31", None)
+		self.assertEqual(without_year_start[self.income.name].balance, -150)
+
+	def test_missing_conversion_rate_is_flagged(self):
+		accounts = [{"value": self.asset.parent_account}]
+		with patch("erpnext.setup.utils.get_exchange_rate", return_value=0):
+			(account,) = get_account_balances(accounts, self.company.name, currency="USD", date="2101-12-31")
+
+		self.assertIsNone(account["converted_balance"])
+		self.assertTrue(account["conversion_rate_missing"])
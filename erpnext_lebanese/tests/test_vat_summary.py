@@ -0,0 +1,87 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate, random_string
+
+from erpnext_lebanese.summary_tables import flush_summary_refreshes, get_summary_name
+from erpnext_lebanese.teardown import delete_lebanese_company
+from erpnext_lebanese.tests.utils import make_gl_entry
+from erpnext_lebanese.vat_summary import (
+	SUMMARY_DOCTYPE,
+	get_vat_accounts,
+	rebuild_vat_summary,
+	update_vat_summary,
+)
+
+PERIOD = getdate("2102-05-01")
+
+
+class TestLebaneseVATSummary(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		suffix = random_string(5).upper()
+		cls.company = frappe.get_doc(
+			{
+				"doctype": "Company",
+				"company_name": f"VAT Summary Co {suffix}",
+				"abbr": f"VS{suffix}"[:5],
+				"country": "Lebanon",
+				"default_currency": "LBP",
+			}
+		).insert()
+
+		accounts = {column: account for account, (column, sign) in get_vat_accounts(cls.company.name).items()}
+		cls.output_account = accounts["output_vat"]
+		cls.input_account = accounts["input_vat"]
+
+	@classmethod
+	def tearDownClass(cls):
+		frappe.db.delete("GL Entry", {"company": cls.company.name})
+		delete_lebanese_company(cls.company.name)
+		super().tearDownClass()
+
+	def setUp(self):
+		frappe.db.delete("GL Entry", {"company": self.company.name})
+		frappe.db.delete(SUMMARY_DOCTYPE, {"company": self.company.name})
+
+	def post(self, account, **amounts):
+		entry = make_gl_entry(self.company.name, account, "2102-05-10", **amounts)
+		update_vat_summary(entry)
+		return entry
+
+	def get_summary(self):
+		return frappe.db.get_value(
+			SUMMARY_DOCTYPE,
+			get_summary_name(self.company.name, PERIOD),
+			["output_vat", "input_vat", "net_vat"],
+			as_dict=True,
+		)
+
+	def test_postings_update_their_month(self):
+		self.post(self.output_account, credit=100)
+		self.post(self.input_account, debit=30)
+		flush_summary_refreshes()
+
+		summary = self.get_summary()
+		self.assertEqual((summary.output_vat, summary.input_vat, summary.net_vat), (100, 30, 70))
+
+	def test_reposted_entries_are_counted_once(self):
+		entry = self.post(self.output_account, credit=100)
+		flush_summary_refreshes()
+
+		# Reposting deletes the voucher's GL Entries with raw SQL and posts them again
+		frappe.db.delete("GL Entry", {"voucher_no": entry.voucher_no})
+		self.post(self.output_account, credit=100, voucher_no=entry.voucher_no)
+		flush_summary_refreshes()
+
+		self.assertEqual(self.get_summary().output_vat, 100)
+
+	def test_rebuild_matches_ledger(self):
+		self.post(self.output_account, credit=100)
+		self.post(self.input_account, debit=30)
+		flush_summary_refreshes()
+		frappe.db.set_value(SUMMARY_DOCTYPE, get_summary_name(self.company.name, PERIOD), "output_vat", 999)
+
+		self.assertEqual(rebuild_vat_summary(self.company.name, commit=False), 1)
+		summary = self.get_summary()
+		self.assertEqual((summary.output_vat, summary.input_vat, summary.net_vat), (100, 30, 70))
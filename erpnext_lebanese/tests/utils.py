@@ -0,0 +1,50 @@
+import time
+from contextlib import contextmanager
+
+import frappe
+
+from erpnext_lebanese.provisioning import QueryCounter
+
+
+@contextmanager
+def query_budget(test_case, max_queries: int, max_seconds: float | None = None, label: str = "block"):
+	"""Fail `test_case` when the block issues more than `max_queries` SQL queries or runs too long."""
+	counter = QueryCounter()
+	start = time.perf_counter()
+
+	with counter:
+		yield counter
+
+	elapsed = time.perf_counter() - start
+	test_case.assertLessEqual(
+		counter.count,
+		max_queries,
+		f"{label} issued {counter.count} queries, budget is {max_queries}",
+	)
+	if max_seconds is not None:
+		test_case.assertLessEqual(
+			elapsed, max_seconds, f"{label} took {elapsed:.2f}s, budget is {max_seconds}s"
+		)
+
+
+def make_gl_entry(company: str, account: str, posting_date, debit: float = 0, credit: float = 0, **kwargs):
+	"""Insert a submitted GL Entry row directly, without a voucher or ledger validations."""
+	doc = frappe.get_doc(
+		{
+			"doctype": "GL Entry",
+			"company": company,
+			"account": account,
+			"posting_date": posting_date,
+			"debit": debit,
+			"credit": credit,
+			"debit_in_account_currency": debit,
+			"credit_in_account_currency": credit,
+			"voucher_type": "Journal Entry",
+			"voucher_no": f"TEST-GL-{frappe.generate_hash(length=8)}",
+			"is_cancelled": 0,
+			"docstatus": 1,
+			**kwargs,
+		}
+	)
+	doc.db_insert()
+	return doc
@@ -1,5 +1,6 @@
 import frappe
 
+@frappe.whitelist()
 def get_company_types():
     """Get Lebanese company types"""
     return [
@@ -0,0 +1,163 @@
+"""
+Materialized monthly VAT summary for Lebanese companies.
+
+`Lebanese VAT Summary` holds one row per company and month with output VAT
+(collected on revenues, 4427) and input VAT (on purchases and charges, 4426.6),
+the accounts the Lebanese tax templates post to. A transaction that submits GL
+Entries on those accounts adds the net change of each month it touched with one
+upsert before it commits (see summary_tables), so cancellations and reposted
+vouchers keep the month equal to the ledger. The Lebanese VAT Return report
+reads the summary, and `rebuild_vat_summary` recomputes it from GL Entry.
+"""
+
+import frappe
+from frappe.query_builder import DocType
+from frappe.query_builder.functions import Extract, Sum
+from frappe.utils import flt, get_first_day, get_last_day, getdate
+
+from erpnext_lebanese.summary_tables import (
+	get_summary_name,
+	lock_company,
+	refresh_before_commit,
+	upsert_increments,
+)
+
+SUMMARY_DOCTYPE = "Lebanese VAT Summary"
+
+# Account number -> summary column, and the sign turning debit - credit into the VAT amount
+VAT_ACCOUNTS = {
+	"4427": ("output_vat", -1),
+	"4426.6": ("input_vat", 1),
+}
+
+VAT_ACCOUNTS_CACHE_KEY = "lebanese_vat_accounts"
+
+
+def update_vat_summary(doc, method=None):
+	"""GL Entry on_submit: bring the entry's month up to date before the transaction commits."""
+	if doc.account in get_vat_accounts(doc.company):
+		refresh_before_commit(refresh_vat_period, doc.company, get_first_day(getdate(doc.posting_date)))
+
+
+def refresh_vat_period(company: str, period) -> None:
+	"""Add the difference between the month's VAT in GL Entry and in the summary to the summary."""
+	# Before both reads, see lock_company
+	lock_company(company)
+	ledger = _get_ledger_vat(company, period, get_last_day(period)).get(period) or {}
+	current = (
+		frappe.db.get_value(
+			SUMMARY_DOCTYPE, get_summary_name(company, period), ["output_vat", "input_vat"], as_dict=True
+		)
+		or {}
+	)
+
+	change = {
+		column: flt(ledger.get(column)) - flt(current.get(column)) for column in ("output_vat", "input_vat")
+	}
+	if any(flt(value, 9) for value in change.values()):
+		_upsert(company, period, change)
+
+
+def get_vat_accounts(company: str) -> dict[str, tuple[str, int]]:
+	"""Return {account name: (column, sign)} for the company's VAT accounts and their descendants."""
+	accounts = frappe.cache().hget(VAT_ACCOUNTS_CACHE_KEY, company)
+	if accounts is None:
+		accounts = _load_vat_accounts(company)
+		frappe.cache().hset(VAT_ACCOUNTS_CACHE_KEY, company, accounts)
+	return accounts
+
+
+def clear_vat_accounts_cache(doc, method=None, *args, **kwargs):
+	"""Account doc event: VAT account names are looked up again on the next GL Entry."""
+	if doc.company:
+		frappe.cache().hdel(VAT_ACCOUNTS_CACHE_KEY, doc.company)
+
+
+def rebuild_vat_summary(company: str | None = None, commit: bool = True) -> int:
+	"""Recompute the summary of `company` (or every company) from GL Entry; returns rows written."""
+	companies = [company] if company else frappe.get_all("Company", pluck="name")
+	written = 0
+
+	for company_name in companies:
+		# Postings of this company wait until the rebuilt summary is committed
+		lock_company(company_name, exclusive=True)
+		frappe.db.delete(SUMMARY_DOCTYPE, {"company": company_name})
+
+		periods = _get_ledger_vat(company_name)
+		for period, totals in periods.items():
+			_upsert(company_name, period, totals)
+		written += len(periods)
+
+		if commit:
+			frappe.db.commit()
+
+	return written
+
+
+def _get_ledger_vat(company, from_date=None, to_date=None):
+	"""Return {period: {output_vat, input_vat}} from GL Entry, optionally for a date range."""
+	vat_accounts = get_vat_accounts(company)
+	if not vat_accounts:
+		return {}
+
+	gle = DocType("GL Entry")
+	year = Extract("year", gle.posting_date)
+	month = Extract("month", gle.posting_date)
+	query = (
+		frappe.qb.from_(gle)
+		.select(gle.account, year.as_("year"), month.as_("month"), Sum(gle.debit - gle.credit).as_("balance"))
+		.where(gle.company == company)
+		.where(gle.is_cancelled == 0)
+		.where(gle.account.isin(list(vat_accounts)))
+		.groupby(gle.account, year, month)
+	)
+	if from_date:
+		query = query.where(gle.posting_date[from_date:to_date])
+
+	periods: dict = {}
+	for row in query.run(as_dict=True):
+		column, sign = vat_accounts[row.account]
+		period = getdate(f"{int(row.year)}-{int(row.month):02d}-01")
+		totals = periods.setdefault(period, {"output_vat": 0.0, "input_vat": 0.0})
+		totals[column] += sign * flt(row.balance)
+	return periods
+
+
+def _load_vat_accounts(company):
+	account = DocType("Account")
+	vat_root = DocType("Account").as_("vat_root")
+
+	rows = (
+		frappe.qb.from_(account)
+		.join(vat_root)
+		.on(
+			(account.company == vat_root.company)
+			& (account.lft >= vat_root.lft)
+			& (account.rgt <= vat_root.rgt)
+		)
+		.select(account.name, vat_root.account_number)
+		.where(vat_root.company == company)
+		.where(vat_root.account_number.isin(list(VAT_ACCOUNTS)))
+	).run(as_dict=True)
+
+	return {row.name: VAT_ACCOUNTS[row.account_number] for row in rows}
+
+
+def _upsert(company, period, amounts):
+	"""Add `amounts` to the company's row for `period`, creating it if needed, in one statement."""
+	output_vat = flt(amounts.get("output_vat"))
+	input_vat = flt(amounts.get("input_vat"))
+	upsert_increments(
+		SUMMARY_DOCTYPE,
+		[
+			{
+				"name": get_summary_name(company, period),
+				"company": company,
+				"period": period,
+				"output_vat": output_vat,
+				"input_vat": input_vat,
+				"net_vat": output_vat - input_vat,
+			}
+		],
+		["output_vat", "input_vat", "net_vat"],
+	)